@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import atexit
 import sys
 from pathlib import Path
 
 import renderer.cli as cli
 from defs.config import config
+from defs.symbol_index import SymbolIndex
 from renderer.annotations import DrawingManager, DrawingTool
 from renderer.breadth_render import BreadthRenderer
 from renderer.candle_render import CandlestickRenderer
@@ -13,7 +15,7 @@ from renderer.dtypes import TF_MAP, AppPaths, RenderContext
 from renderer.indicators import IndicatorPipeline
 from renderer.loader import EODFileLoader
 from renderer.navigation import NavigationList
-from renderer.persistence import SessionStore
+from renderer.persistence import DrawingStore, SessionStore
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -70,6 +72,12 @@ def run_chart(cmd, paths: AppPaths) -> int:
     else:
         context = build_breadth_context(cmd, paths)
 
+    if context.plugin_runner and context.plugin_runner.profiler:
+        # Interactive mode exits from the quit shortcut
+        atexit.register(
+            report_plugin_profile, context.plugin_runner.profiler, paths.plugin_profile
+        )
+
     if cmd.save:
         save_all(cmd, paths, sym_list, context)
         return 0
@@ -105,6 +113,7 @@ def build_stock_context(cmd, paths: AppPaths) -> RenderContext:
         period=cli.compute_max_period(cmd),
         index_name="nifty 500",
         end_date=cmd.date,
+        symbols=SymbolIndex.load(paths.data_path),
     )
 
     if cmd.rs or cmd.mansfield_rs:
@@ -121,22 +130,29 @@ def build_stock_context(cmd, paths: AppPaths) -> RenderContext:
     plugin_runner = None
 
     if cmd.plugins:
+        from renderer.plugins.profiler import PluginProfiler
         from renderer.plugins.runner import PluginRunner
 
         plugin_runner = PluginRunner(
             cmd.plugins,
             panel_layout=panel_layout,
+            profiler=PluginProfiler() if cmd.profile_plugins else None,
+            skip_over_budget=cmd.save,
         )
 
-    drawing_manager = DrawingManager(timeframe=cmd.timeframe)
-
     session_store = SessionStore(
         paths.config_path,
-        paths.drawings,
+        DrawingStore(paths.drawings_db, legacy_path=paths.drawings),
         paths.selections,
         timeframe=cmd.timeframe,
     )
 
+    # Drawings are loaded per symbol on first access. In batch mode, each
+    # worker process reads only the symbols it renders.
+    drawing_manager = DrawingManager(
+        timeframe=cmd.timeframe, loader=session_store.load_drawings
+    )
+
     return RenderContext(
         loader=loader,
         renderer=CandlestickRenderer(panel_layout),
@@ -180,11 +196,6 @@ def build_breadth_context(cmd, paths: AppPaths) -> RenderContext:
 def save_all(cmd, paths: AppPaths, sym_list, context: RenderContext) -> None:
     from renderer.batch import BatchRender
 
-    if context.drawing_manager is not None and paths.drawings.is_file():
-        drawings = cli.load_json(paths.drawings)
-
-        context.drawing_manager.from_dict(drawings[cmd.timeframe])
-
     batch = BatchRender(
         cmd=cmd,
         context=context,
@@ -220,6 +231,16 @@ def run_interactive(cmd, sym_list, context: RenderContext) -> None:
     coordinator.run()
 
 
+def report_plugin_profile(profiler, path: Path) -> None:
+    profiler.stop()
+
+    print("\nPlugin profile:")
+    print(profiler.format_table())
+
+    profiler.write_json(path)
+    print(f"\nSaved plugin profile to {path}")
+
+
 def resume_index(cmd, symbol_count: int) -> int:
     if cmd.source.mode != "stock":
         return 0
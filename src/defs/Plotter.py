@@ -25,6 +25,7 @@ from defs.utils import (
     relativeStrength,
     writeJson,
 )
+from renderer.util import bar_labels
 
 HELP = """                                           ## Help ##
 
@@ -60,29 +61,35 @@ def processPlot(df, plot_args):
     mpl.plot(df, **plot_args)
 
 
-def format_coords(x, _):
-    s = " " * 5
+def coords_formatter(df: pd.DataFrame):
+    """Return a format_coord callback over status bar text built once per chart."""
+    fields = [
+        ("Open", "O", ""),
+        ("High", "H", ""),
+        ("Low", "L", ""),
+        ("Close", "C", ""),
+        ("Volume", "V", ",.0f"),
+    ]
 
-    if df is None:
-        return
-
-    if not x or round(x) >= df.shape[0]:
-        return ""
+    if "M_RS" in df.columns:
+        fields.append(("M_RS", "MRS", ""))
+    elif "RS" in df.columns:
+        fields.append(("RS", "RS", ""))
 
-    dt = df.index[round(x)]
+    labels = bar_labels(df, fields)
 
-    dt_str = f"{dt:%d %b %Y}".upper()
+    def format_coords(x, _):
+        if x is None:
+            return ""
 
-    open, high, low, close, vol = df.loc[dt, ["Open", "High", "Low", "Close", "Volume"]]
+        i = round(x)
 
-    _str = f"{dt_str}{s}O: {open}{s}H: {high}{s}L: {low}{s}C: {close}{s}V: {vol:,.0f}"
+        if i < 0 or i >= len(labels):
+            return ""
 
-    if "M_RS" in df.columns:
-        _str += f"{s}MRS: {df.loc[dt, 'M_RS']}"
-    elif "RS" in df.columns:
-        _str += f"{s}RS: {df.loc[dt, 'RS']}"
+        return labels[i]
 
-    return _str
+    return format_coords
 
 
 class Plotter:
@@ -239,6 +246,8 @@ class Plotter:
 
         fig, axs = mpl.plot(df, **self.plot_args)
 
+        format_coords = coords_formatter(df)
+
         # A workaround using ConciseDateFormatter and AutoDateLocator
         # with mplfinance
         # See github issue https://github.com/matplotlib/mplfinance/issues/643
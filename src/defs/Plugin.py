@@ -8,8 +8,25 @@ class Plugin:
         self.plugins = []
 
     def register(self, plugins: Dict, parser: ArgumentParser):
-        for plugin in plugins.values():
-            instance = import_module(f"plugin.{plugin['name']}")
+        for key, plugin in plugins.items():
+            module_name = f"plugin.{plugin['name']}"
+
+            try:
+                instance = import_module(module_name)
+            except ModuleNotFoundError as exc:
+                if exc.name != module_name:
+                    raise
+
+                raise ImportError(
+                    f"Could not load plugin '{key}' from module '{module_name}'"
+                ) from exc
+
+            for hook in ("load", "main"):
+                if not callable(getattr(instance, hook, None)):
+                    raise ImportError(
+                        f"Plugin '{key}': module '{module_name}' has no {hook} function"
+                    )
+
             instance.load(parser)
             self.plugins.append(instance)
 
@@ -20,6 +20,7 @@ class Config:
     # ---------- AMIBROKER ----------
     AMIBROKER: bool = False
     AMI_UPDATE_DAYS: int = 365
+    AMI_DOWNLOAD_WORKERS: int = 4
 
     # ---------- DELIVERY ----------
     DLV_L1: float = 1
@@ -37,6 +38,9 @@ class Config:
     PLOT_SIZE: tuple[int, int] | None = None  # (width, height) in inches
     MAGNET_MODE: bool = True
 
+    # Memory budget for indicator results of visited charts
+    PLOT_MEMO_MB: int = 256
+
     PLOT_PLUGINS: dict[str, dict] = field(default_factory=dict)
     CHART_PLUGINS: dict[str, dict] = field(default_factory=dict)
 
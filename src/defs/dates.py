@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta
+from typing import Optional
 
 try:
     from zoneinfo import ZoneInfo
@@ -10,6 +11,8 @@ except ImportError:
 
 import tzlocal
 
+from .trading_calendar import TradingCalendar
+
 logger = logging.getLogger(__name__)
 
 tz_IN = ZoneInfo("Asia/Kolkata")
@@ -19,7 +22,9 @@ tz_local = tzlocal.get_localzone()
 class Dates:
     """A class for date related functions in EOD2"""
 
-    def __init__(self, lastUpdate: str):
+    def __init__(self, lastUpdate: str, calendar: Optional[TradingCalendar] = None):
+        self.calendar = calendar
+
         today = datetime.now(tz_IN)
 
         self.today = datetime.combine(today, datetime.min.time())
@@ -33,10 +38,17 @@ class Dates:
     def nextDate(self):
         """Set the next trading date and return True.
         If its a future date, return False
+
+        With a calendar, non-trading days in years with a saved holiday
+        list are skipped.
         """
         curTime = datetime.now(tz_IN)
         self.dt = self.dt + timedelta(1)
 
+        if self.calendar is not None:
+            dt = self.dt.date()
+            self.dt += self.calendar.next_trading_day(dt).item() - dt
+
         if self.dt > curTime:
             logger.info("All Up To Date")
             return False
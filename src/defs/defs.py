@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import importlib.util
+import io
 import itertools
 import json
 import logging
 import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
 from types import ModuleType
@@ -16,7 +19,20 @@ from typing import Dict, List, Optional, Tuple, Type, Union
 import dateutil
 
 from .dates import Dates
+from .download_cache import DownloadCache
+from .manifest import Manifest
+from .report_archive import ReportArchive
+from .run_stats import RunStats
+from .symbol_store import SymbolStore
 from .symbol_tracker import SymbolTracker
+from .trading_calendar import TradingCalendar
+from .utils import (
+    EQUITY_SERIES,
+    INDEX_COLUMNS,
+    STOCK_COLUMNS,
+    RateLimiter,
+    adjust_ohlc,
+)
 
 try:
     from zoneinfo import ZoneInfo
@@ -169,6 +185,7 @@ def retry(max_retries=10, base_wait=2, max_wait=10):
                     return func(*args, **kwargs)
                 except (TimeoutError, ConnectionError) as e:
                     logger.info(f"Attempt {retries + 1} failed: {e}")
+                    stats.count("retries")
 
                     # Calculate the wait time using exponential backoff
                     wait = min(base_wait * (2**retries), max_wait)
@@ -269,6 +286,26 @@ def getHolidayList(nse: NSE):
     return data
 
 
+def migrateCalendarMeta() -> bool:
+    """Move holidays and special sessions previously kept in meta.json to
+    the trading calendar. Returns True if meta was changed.
+    """
+    if "holidays" not in meta and "special_sessions" not in meta:
+        return False
+
+    if "holidays" in meta:
+        if not calendar.has_year(meta["year"]):
+            calendar.set_holidays(meta["year"], meta["holidays"])
+
+        del meta["holidays"], meta["year"]
+
+    for iso_date in meta.pop("special_sessions", []):
+        calendar.add_special_session(datetime.fromisoformat(iso_date).date())
+
+    calendar.save()
+    return True
+
+
 def checkForHolidays(nse: NSE, dates_cls: Dates):
     """Returns True if current date is a holiday.
     Exits the script if today is a holiday
@@ -276,37 +313,30 @@ def checkForHolidays(nse: NSE, dates_cls: Dates):
     global hasLatestHolidays
 
     # the current date for which data is being synced
-    curDt = dates_cls.dt.strftime("%d-%b-%Y")
-
-    if dates_cls.dt.replace(tzinfo=None) in tuple(
-        datetime.fromisoformat(x) for x in meta.get("special_sessions", [])
-    ):
-        return False
+    dt = dates_cls.dt.date()
 
-    # no holiday list or year has changed or today is a holiday
-    if (
-        "holidays" not in meta
-        or meta["year"] != dates_cls.dt.year
-        or (curDt in meta["holidays"] and not hasLatestHolidays)
+    # Holiday list for the year not saved yet or today is a holiday.
+    # Only the current year's list is published.
+    if dt.year == dates_cls.today.year and (
+        not calendar.has_year(dt.year)
+        or (calendar.holiday(dt) is not None and not hasLatestHolidays)
     ):
-        if dates_cls.dt.year == dates_cls.today.year:
-            meta["holidays"] = getHolidayList(nse)
-            meta["year"] = dates_cls.dt.year
-            hasLatestHolidays = True
+        calendar.set_holidays(dt.year, getHolidayList(nse))
+        calendar.save()
+        hasLatestHolidays = True
 
-    isMuhurat = curDt in meta["holidays"] and "Laxmi Pujan" in meta["holidays"][curDt]
-
-    if isMuhurat:
+    if calendar.is_trading_day(dt):
         return False
 
-    if dates_cls.dt.weekday() == 6:
-        return True
+    description = calendar.holiday(dt)
 
-    if curDt in meta["holidays"]:
-        logger.info(f"{curDt} Market Holiday: {meta['holidays'][curDt]}")
+    if description is not None:
+        logger.info(f"{dt:%d-%b-%Y} Market Holiday: {description}")
         return True
 
-    return False
+    # Without a holiday list for the year, Saturdays are checked for
+    # special sessions by downloading the report
+    return calendar.has_year(dt.year) or dt.weekday() == 6
 
 
 @retry()
@@ -362,7 +392,7 @@ def updatePendingDeliveryData(nse: NSE, date: str):
     dt = dt.replace(tzinfo=None)
 
     try:
-        FILE = nse.deliveryBhavcopy(dt)
+        FILE = downloads.fetch("delivery", dt, lambda: nse.deliveryBhavcopy(dt))
     except (RuntimeError, Exception):
         if daysSinceFailure == 5:
             logger.warning(
@@ -376,13 +406,7 @@ def updatePendingDeliveryData(nse: NSE, date: str):
     try:
         df = pd.read_csv(FILE, index_col="SYMBOL")
 
-        # save the csv file to the below folder.
-        DLV_FOLDER = DIR / "nseDelivery" / str(dt.year)
-
-        if not DLV_FOLDER.is_dir():
-            DLV_FOLDER.mkdir(parents=True)
-
-        df.to_csv(DLV_FOLDER / FILE.name)
+        ReportArchive(DIR / "nseDelivery").add_file(dt, FILE)
 
         # filter the pd.DataFrame for stocks series EQ, BE and BZ
         # https://www.nseindia.com/market-data/legend-of-series
@@ -420,6 +444,7 @@ def updatePendingDeliveryData(nse: NSE, date: str):
             dailyDf.loc[dt, "QTY_PER_TRADE"] = avgTrdCnt
             dailyDf.loc[dt, "DLV_QTY"] = dq
             dailyDf.to_csv(DAILY_FILE)
+            manifest.invalidate(DAILY_FILE.name)
 
         if hook and hasattr(hook, "updatePendingDeliveryData"):
             hook.updatePendingDeliveryData(df, dt)
@@ -428,11 +453,10 @@ def updatePendingDeliveryData(nse: NSE, date: str):
             f"Error updating delivery report dated {dt:%d %b %Y} - {error_context}",
             exc_info=e,
         )
-        FILE.unlink()
         return False
 
     meta["DLV_PENDING_DATES"].remove(date)
-    FILE.unlink()
+    downloads.discard("delivery", dt)
     logger.info(f"Updating delivery report dated {dt:%d %b %Y}: ✓ Done")
     return True
 
@@ -445,9 +469,12 @@ def isAmiBrokerFolderUpdated():
 def updateAmiBrokerRecords(nse: NSE):
     """Downloads and updates the amibroker files upto the number of days
     set in Config.AMI_UPDATE_DAYS
+
+    Archived bhavcopies are reused. Others are downloaded concurrently,
+    with up to Config.AMI_DOWNLOAD_WORKERS downloads at a time.
     """
     lastUpdate = datetime.fromisoformat(meta["lastUpdate"]) + timedelta(1)
-    dt = lastUpdate - timedelta(config.AMI_UPDATE_DAYS)
+    start = lastUpdate - timedelta(config.AMI_UPDATE_DAYS)
     totalDays = config.AMI_UPDATE_DAYS
 
     logger.info(
@@ -456,50 +483,64 @@ def updateAmiBrokerRecords(nse: NSE):
 
     logger.info("This is a one time process. It will take a few minutes.")
 
-    while dt < lastUpdate:
-        dt += timedelta(1)
+    archive = ReportArchive(DIR / "nseBhav")
 
-        if dt.weekday() > 4:
-            continue
+    # Reports of the same month share one zip file, which is replaced on
+    # each write. Reads are locked too, as an open file cannot be replaced
+    # on Windows.
+    archive_lock = threading.Lock()
 
-        bhavFolder = DIR / "nseBhav" / str(dt.year)
+    # The NSE client throttle is not thread safe. Spacing the downloads
+    # at its rate of 3 requests per second keeps its checks apart.
+    limiter = RateLimiter(3)
 
-        if not bhavFolder.is_dir():
-            bhavFolder.mkdir(parents=True)
+    def convert(dt: datetime):
+        with archive_lock:
+            name = archive.find(dt)
+            data = None if name is None else archive.read(dt)
 
-        bhavFile = bhavFolder / f"BhavCopy_NSE_CM_0_0_0_{dt:%Y%m%d}_F_0000.csv"
+        if name is None:
+            limiter.wait()
 
-        if not bhavFile.exists():
             try:
                 bhavFile = nse.equityBhavcopy(dt)
-                bhavFile = bhavFile.rename(bhavFolder / bhavFile.name)
             except (RuntimeError, FileNotFoundError):
-                continue
+                return
+
+            with archive_lock:
+                archive.add_file(dt, bhavFile)
+
+            name = bhavFile.name
+            df = pd.read_csv(bhavFile)
+            bhavFile.unlink()
+        else:
+            df = pd.read_csv(io.BytesIO(data))
+
+        toAmiBrokerFormat(df[df["SctySrs"].isin(EQUITY_SERIES)], name)
+
+    days = [start + timedelta(i) for i in range(1, totalDays + 1)]
+    days = [dt for dt in days if dt.weekday() < 5]
+
+    with ThreadPoolExecutor(max_workers=config.AMI_DOWNLOAD_WORKERS) as executor:
+        futures = [executor.submit(convert, dt) for dt in days]
+
+        for i, future in enumerate(as_completed(futures), start=1):
+            try:
+                future.result()
             except Exception as e:
+                for f in futures:
+                    f.cancel()
+
                 logger.warning(f"{e} - Please try again.")
                 exit(1)
 
-        toAmiBrokerFormat(bhavFile)
-
-        daysComplete = totalDays - (lastUpdate - dt).days
-        pctComplete = int(daysComplete / totalDays * 100)
-        print(f"{pctComplete} %", end="\r", flush=True)
+            print(f"{int(i / len(futures) * 100)} %", end="\r", flush=True)
 
     logger.info("Amibroker file updated")
 
 
-def toAmiBrokerFormat(file: Path):
-    """Converts and saves bhavcopy into amibroker format"""
-    df = pd.read_csv(file, parse_dates=["TradDt"])
-
-    df = df[
-        (df["SctySrs"] == "EQ")
-        | (df["SctySrs"] == "BE")
-        | (df["SctySrs"] == "BZ")
-        | (df["SctySrs"] == "SM")
-        | (df["SctySrs"] == "ST")
-    ]
-
+def toAmiBrokerFormat(df: pd.DataFrame, name: str):
+    """Saves a bhavcopy, filtered for equity series, into amibroker format"""
     df = df.loc[
         :,
         [
@@ -525,7 +566,7 @@ def toAmiBrokerFormat(file: Path):
         "ISIN",
     ]
 
-    df.to_csv(AMIBROKER_FOLDER / file.name, index=False)
+    df.to_csv(AMIBROKER_FOLDER / name, index=False)
 
 
 def updateNseEOD(bhavFile: Path, deliveryFile: Optional[Path]):
@@ -536,13 +577,7 @@ def updateNseEOD(bhavFile: Path, deliveryFile: Optional[Path]):
 
     df = pd.read_csv(bhavFile, index_col="ISIN")
 
-    BHAV_FOLDER = DIR / "nseBhav" / str(dates.dt.year)
-
-    # Create it if not exists
-    if not BHAV_FOLDER.is_dir():
-        BHAV_FOLDER.mkdir(parents=True)
-
-    df.to_csv(BHAV_FOLDER / bhavFile.name)
+    ReportArchive(DIR / "nseBhav").add_file(dates.dt, bhavFile)
 
     # filter the pd.DataFrame for stocks series EQ, BE and BZ
     # https://www.nseindia.com/market-data/legend-of-series
@@ -556,18 +591,12 @@ def updateNseEOD(bhavFile: Path, deliveryFile: Optional[Path]):
 
     if config.AMIBROKER:
         logger.info("Converting to AmiBroker format")
-        toAmiBrokerFormat(bhavFile)
+        toAmiBrokerFormat(df.reset_index(), bhavFile.name)
 
     if deliveryFile:
         dlvDf = pd.read_csv(deliveryFile, index_col="SYMBOL")
 
-        # save the csv file to the below folder.
-        DLV_FOLDER = DIR / "nseDelivery" / str(dates.dt.year)
-
-        if not DLV_FOLDER.is_dir():
-            DLV_FOLDER.mkdir(parents=True)
-
-        dlvDf.to_csv(DLV_FOLDER / deliveryFile.name)
+        ReportArchive(DIR / "nseDelivery").add_file(dates.dt, deliveryFile)
 
         # filter the pd.DataFrame for stocks series EQ, BE and BZ
         # https://www.nseindia.com/market-data/legend-of-series
@@ -581,6 +610,9 @@ def updateNseEOD(bhavFile: Path, deliveryFile: Optional[Path]):
     else:
         dlvDf = None
 
+    # Rows passed to hook.on_eod_batch
+    batch = []
+
     # iterate over each row as a tuple
     for t in df.itertuples():
         # ignore rights issue
@@ -611,25 +643,28 @@ def updateNseEOD(bhavFile: Path, deliveryFile: Optional[Path]):
         # When a symbol name changes its ISIN remains the same
         # This allows for tracking changes in symbol names and
         # updating file names accordingly
-        if t.Index not in isin.index:
+        current = isin.get(t.Index)
+
+        if current is None:
             isinUpdated = True
-            isin.at[t.Index, "SYMBOL"] = t.TckrSymb
+            isin[t.Index] = t.TckrSymb
 
         # if symbol name does not match the symbol name under its ISIN
         # we rename the files in daily and delivery folder
-        if t.TckrSymb != isin.at[t.Index, "SYMBOL"]:
+        elif t.TckrSymb != current:
             isinUpdated = True
-            old = isin.at[t.Index, "SYMBOL"].lower()
+            old = current.lower()
 
             new = t.TckrSymb.lower()
 
-            isin.at[t.Index, "SYMBOL"] = t.TckrSymb
+            isin[t.Index] = t.TckrSymb
 
             SYM_FILE = DAILY_FOLDER / f"{new}{prefix}.csv"
             OLD_FILE = DAILY_FOLDER / f"{old}{prefix}.csv"
 
             try:
                 OLD_FILE.rename(SYM_FILE)
+                stats.count("files_renamed")
             except FileNotFoundError:
                 logger.warning(f"Renaming daily/{old}.csv to {new}.csv. No such file.")
 
@@ -649,12 +684,66 @@ def updateNseEOD(bhavFile: Path, deliveryFile: Optional[Path]):
             dq,
         )
 
+        batch.append(
+            (
+                SYM_FILE.stem,
+                t.OpnPric,
+                t.HghPric,
+                t.LwPric,
+                t.ClsPric,
+                t.TtlTradgVol,
+                t.SctySrs,
+                trdCnt,
+                dq,
+            )
+        )
+
     if isinUpdated:
-        isin.to_csv(ISIN_FILE)
+        writeIsinMap(ISIN_FILE, isin)
+
+    if hook and hasattr(hook, "on_eod_batch"):
+        hook.on_eod_batch(dates.dt, eodBatchFrame(batch))
 
     logger.info("EOD sync complete")
 
 
+def eodBatchFrame(batch: List[tuple]) -> pd.DataFrame:
+    """Return the rows written by updateNseEOD as a DataFrame indexed by
+    file name, with the same columns as the daily files
+    """
+    df = pd.DataFrame(
+        batch,
+        columns=[
+            "Symbol",
+            "Open",
+            "High",
+            "Low",
+            "Close",
+            "Volume",
+            "Series",
+            "TOTAL_TRADES",
+            "DLV_QTY",
+        ],
+    ).set_index("Symbol")
+
+    # Delivery columns are empty strings without a delivery report
+    for col in ("TOTAL_TRADES", "DLV_QTY"):
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    df["QTY_PER_TRADE"] = (df["Volume"] / df["TOTAL_TRADES"]).round(2)
+    return df[STOCK_COLUMNS]
+
+
+def loadIsinMap(file: Path) -> Dict[str, str]:
+    """Load isin.csv as a dict of ISIN to symbol"""
+    return pd.read_csv(file, index_col="ISIN")["SYMBOL"].to_dict()
+
+
+def writeIsinMap(file: Path, isinMap: Dict[str, str]):
+    """Write a dict of ISIN to symbol to isin.csv"""
+    pd.Series(isinMap, name="SYMBOL").rename_axis("ISIN").to_csv(file)
+
+
 def updateNseSymbol(symFile: Path, series, open, high, low, close, volume, trdCnt, dq):
     """Appends EOD stock data to end of file"""
     text = b""
@@ -665,6 +754,7 @@ def updateNseSymbol(symFile: Path, series, open, high, low, close, volume, trdCn
         if "_sme" not in symFile.name and sme_file.exists():
             logger.info(f"{symFile.stem.upper()} switched from SME to EQ")
             sme_file.rename(symFile)
+            stats.count("files_renamed")
         else:
             text += headerText
 
@@ -678,6 +768,9 @@ def updateNseSymbol(symFile: Path, series, open, high, low, close, volume, trdCn
     with symFile.open("ab") as f:
         f.write(text)
 
+    stats.count("symbols_appended")
+    stats.count("bytes_written", len(text))
+
     if hook and hasattr(hook, "updateNseSymbol"):
         hook.updateNseSymbol(
             dates.dt,
@@ -700,7 +793,6 @@ def check_special_sessions(nse: NSE) -> bool:
 
     if last_update_str is None:
         last_update = (dates.dt - timedelta(5)).replace(tzinfo=None)
-        meta["special_sessions"] = []
     else:
         last_update = datetime.fromisoformat(last_update_str)
 
@@ -715,22 +807,16 @@ def check_special_sessions(nse: NSE) -> bool:
         subject = circular["sub"].lower()
 
         if "trading holiday" in subject and "on account of" in subject:
-            # If holidays not in meta, it will be auto updated later
-            # Dont create a holiday object here
-            if "holidays" in meta:
-                try:
-                    dt = dateutil.parser.parse(subject, fuzzy=True)
-                except dateutil.parser.ParserError:
-                    logger.warning(
-                        f"Unable to parse date from circular dated {circular['cirDisplayDate']}: {circular['sub']}"
-                    )
-                    continue
-
-                dt_key = dt.strftime("%d-%b-%Y")
+            try:
+                dt = dateutil.parser.parse(subject, fuzzy=True)
+            except dateutil.parser.ParserError:
+                logger.warning(
+                    f"Unable to parse date from circular dated {circular['cirDisplayDate']}: {circular['sub']}"
+                )
+                continue
 
-                if dt_key not in meta["holidays"]:
-                    meta["holidays"][dt_key] = subject
-                    logger.warning(f"Circular: {subject}")
+            if calendar.add_holiday(dt.date(), subject):
+                logger.warning(f"Circular: {subject}")
             continue
 
         if "live trading session" not in subject:
@@ -744,15 +830,13 @@ def check_special_sessions(nse: NSE) -> bool:
             )
             continue
 
-        iso_date = dt.isoformat()
-
-        if iso_date not in meta["special_sessions"]:
-            meta["special_sessions"].append(iso_date)
+        calendar.add_special_session(dt.date())
 
         # Set to warning level for test period to log to error.log file
         logger.warning(f"Circular: {subject}")
         updated = True
 
+    calendar.save()
     meta["special_sessions_last_update"] = dates.today.date().isoformat()
     return updated
 
@@ -823,9 +907,7 @@ def makeAdjustment(
         df = df.loc[:dt].copy()
         idx = df.index.get_loc(df.index[-1])
 
-    for col in ("Open", "High", "Low", "Close"):
-        # nearest 0.05 = round(nu / 0.05) * 0.05
-        df.loc[:, col] = ((df[col] / adjustmentFactor / 0.05).round() * 0.05).round(2)
+    adjust_ohlc(df, adjustmentFactor)
 
     df = pd.concat([df, last])
 
@@ -852,6 +934,9 @@ def updateIndice(sym, open, high, low, close, volume, pe):
     with file.open("ab") as f:
         f.write(text)
 
+    stats.count("indices_appended")
+    stats.count("bytes_written", len(text))
+
     if hook and hasattr(hook, "updateIndice"):
         hook.updateIndice(dates.dt, sym, open, high, low, close, volume)
 
@@ -860,14 +945,9 @@ def updateIndexEOD(file: Path):
     """Iterates over each symbol in NSE indices reports and
     update EOD data to respective csv file
     """
-    folder = DIR / "nseIndices" / str(dates.dt.year)
-
-    if not folder.is_dir():
-        folder.mkdir(parents=True)
-
     df = pd.read_csv(file, index_col="Index Name")
 
-    df.to_csv(folder / file.name)
+    ReportArchive(DIR / "nseIndices").add_file(dates.dt, file)
 
     cols = [
         "Open Index Value",
@@ -887,6 +967,17 @@ def updateIndexEOD(file: Path):
 
         updateIndice(sym, open, high, low, close, volume, pe)
 
+    if hook and hasattr(hook, "on_index_batch"):
+        # Same columns and symbol names as hook.updateIndice
+        batchDf = df[cols].astype(float)
+        batchDf.columns = INDEX_COLUMNS[: len(cols)]
+        batchDf.index = pd.Index(
+            [sym.replace("/", "-").replace(":", "-") for sym in df.index],
+            name="Symbol",
+        )
+
+        hook.on_index_batch(dates.dt, batchDf)
+
     pe = float(df.at["Nifty 50", "P/E"])
 
     if pe >= 25 or pe <= 20:
@@ -1023,15 +1114,34 @@ def adjustNseStocks():
                 )
 
             df.to_csv(file)
+            manifest.invalidate(file.name)
+            stats.count("adjustments")
 
         df_commits.clear()
 
+        if post_commits:
+            recordAdjustments(post_commits)
+
         if hook and hasattr(hook, "makeAdjustment") and post_commits:
             hook.makeAdjustment(dates.dt, post_commits)
 
         post_commits.clear()
 
 
+def recordAdjustments(adjustments: List[Tuple[str, float]]):
+    """Append adjustments made on the current date to adjustments.csv,
+    so they can be replayed by a rebuild. Symbols are stored as daily file
+    names, as used by makeAdjustment.
+    """
+    text = "" if ADJUSTMENTS_FILE.is_file() else "Date,Symbol,Factor\n"
+
+    for sym, adjustmentFactor in adjustments:
+        text += f"{dates.pandasDt},{sym.lower()},{adjustmentFactor}\n"
+
+    with ADJUSTMENTS_FILE.open("a") as f:
+        f.write(text)
+
+
 def getLastDate(file):
     """Get the last updated date for a stock csv file"""
     # source: https://stackoverflow.com/a/68413780
@@ -1104,14 +1214,6 @@ def rollback(folder: Path):
         hook.on_error()
 
 
-def cleanup(filesLst):
-    """Remove files downloaded from nse"""
-    for file in filesLst:
-        if file is None:
-            continue
-        file.unlink(missing_ok=True)
-
-
 def cleanOutDated():
     """Delete CSV files not updated in the last 365 days"""
     logger.info("Cleaning up files")
@@ -1144,6 +1246,12 @@ if __name__ != "__main__":
     META_FILE = DIR / "eod2_data" / "meta.json"
     SPECIAL_SESSIONS_FILE = DIR / "eod2_data/special_sessions.txt"
     ISIN_SYMBOL_MAP_FILE = DIR / "eod2_data/isin_symbol_map.json"
+    ISIN_SYMBOL_DB_FILE = DIR / "eod2_data/isin_symbol_map.db"
+    MANIFEST_FILE = DIR / "eod2_data/manifest.json"
+    CALENDAR_FOLDER = DIR / "eod2_data/calendar"
+    DOWNLOAD_CACHE_FOLDER = DIR / "eod2_data/downloads"
+    ADJUSTMENTS_FILE = DIR / "eod2_data/adjustments.csv"
+    RUN_LOG_FILE = DIR / "eod2_data/run_log.jsonl"
 
     hasLatestHolidays = False
 
@@ -1190,9 +1298,26 @@ if __name__ != "__main__":
             # hook is a Class
             hook = hook()
 
-    isin = pd.read_csv(ISIN_FILE, index_col="ISIN")
+    # ISIN to current symbol
+    isin = loadIsinMap(ISIN_FILE)
+
+    # Holidays kept in meta.json by earlier versions are moved here by init.py
+    calendar = TradingCalendar(CALENDAR_FOLDER)
 
     # initiate the dates class from utils.py
-    dates = Dates(meta["lastUpdate"])
+    dates = Dates(meta["lastUpdate"], calendar=calendar)
+
+    # Loaded on first use. Changes are saved per ISIN after each synced date
+    # and exported to isin_symbol_map.json at the end of the sync.
+    tracker = SymbolTracker(
+        store=SymbolStore(ISIN_SYMBOL_DB_FILE, legacy_path=ISIN_SYMBOL_MAP_FILE)
+    )
+
+    # NSE reports are kept until their date is synced
+    downloads = DownloadCache(DOWNLOAD_CACHE_FOLDER)
+
+    # Rolling checksums of the daily folder. Updated after each synced date.
+    manifest = Manifest(MANIFEST_FILE)
 
-    tracker = SymbolTracker(data_file=ISIN_SYMBOL_MAP_FILE)
+    # Stage timings and counters. Appended to RUN_LOG_FILE by init.py
+    stats = RunStats()
@@ -1,7 +1,16 @@
 from __future__ import annotations
 
+import hashlib
+import io
+import json
+import os
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 """
@@ -13,8 +22,16 @@ It checks for:
 - Duplicate entries in files
 - Incorrect column dataTypes.
 - NAN values in OHLCV rows
+- OHLC consistency. Low <= Open, Close <= High
+- Dates not in ascending order
+- Close price jumps larger than --jump, which may be a missed split or bonus
+  adjustment
 
-By default only a maximum of 5 errors are printed. Edit the ERROR_THRESHOLD variable to print more error. Once error is corrected must rerun to verify.
+Files are checked in parallel. The size, modification time and hash of each
+file is cached in eod2_data/integrity_cache.json along with its results, so
+unchanged files are not checked again. Use --full to check every file.
+
+All errors are reported. Use --json to print a machine-readable report.
 
 EOD2 takes extreme care to ensure data integrity but it is possible due to bugs or accidental user inputs.
 
@@ -24,126 +41,371 @@ https://github.com/BennyThadikaran/eod2/issues
 Your reporting helps make EOD2 rock solid and stable.
 """
 
-ERROR_THRESHOLD = 5
-
-DIR = Path(__file__).parents[1]
-
-duplicatesList = []
-typeMismatchList = []
-indexMismatchList = []
-exceptionsList = []
-colMismatchList = []
-hasNansList = []
-
-
-def getErrorCount():
-    return max(
-        len(duplicatesList),
-        len(typeMismatchList),
-        len(indexMismatchList),
-        len(exceptionsList),
-        len(colMismatchList),
-        len(hasNansList),
-    )
+# Bump when checks change, to invalidate cached results
+CHECKS_VERSION = 1
 
+# Maximum dates listed in text output per issue
+MAX_DATES_SHOWN = 5
 
-def printResult():
-    if getErrorCount() == 0:
-        print("No errors\n")
-        return
+DIR = Path(__file__).parents[1]
 
-    if len(duplicatesList):
-        print("\nDuplicate entries")
-        print("\n".join(duplicatesList))
+CHECK_TITLES = dict(
+    read_error="File or Pandas exceptions",
+    empty="Empty files",
+    index_type="Pandas Index mismatch",
+    column_count="Column mismatch",
+    dtype="Datatype mismatch",
+    nan="Column with NaN values",
+    duplicates="Duplicate entries",
+    unsorted="Dates not in ascending order",
+    ohlc="OHLC inconsistency",
+    jump="Suspicious price jumps",
+)
 
-    if len(typeMismatchList):
-        print("\nDatatype mismatch")
-        print("\n".join(typeMismatchList))
 
-    if len(indexMismatchList):
-        print("\nPandas Index mismatch")
-        print("\n".join(indexMismatchList))
+def file_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
-    if len(exceptionsList):
-        print("\nFile or Pandas exceptions")
-        print("\n".join(exceptionsList))
 
-    if len(colMismatchList):
-        print("\nColumn mismatch")
-        print("\n".join(colMismatchList))
+def issue(check: str, message: str, dates: Optional[List[str]] = None) -> Dict:
+    result: Dict[str, Any] = dict(check=check, message=message)
 
-    if len(hasNansList):
-        print("\nColumn with NaN values")
-        print("\n".join(hasNansList))
+    if dates:
+        result["dates"] = dates
 
+    return result
 
-daily = DIR / "eod2_data" / "daily"
 
-dtypeMismatchText = "{}: Column type Mismatch in {}. Expected float64 or int64. Got {}"
-columnMismatchText = "{}: Column Length Mismatch. Expect {} got {}"
-indexMismatchText = "{}: Pandas Index type Mismatch. Expect datetime64[ns] got {}"
-hasNansText = "{}: Column {} has NAN values"
+def date_list(index: pd.Index) -> List[str]:
+    return [f"{dt:%Y-%m-%d}" for dt in index]
 
-for file in daily.iterdir():
-    # Only indices have spaces in file names - bit of a cheat
-    is_index_file = " " in file.name
 
-    try:
-        df = pd.read_csv(file, index_col="Date", parse_dates=True)
-    except Exception as e:
-        # Catch pandas or file parsing errors
-        exceptionsList.append(f"{file.name.upper()}: {e!r}")
-        continue
+def check_frame(df: pd.DataFrame, is_index_file: bool, jump: float) -> List[Dict]:
+    """Run all checks on a daily DataFrame."""
+    issues = []
 
-    # File is empty or only has column headings
     if df.shape[0] < 1:
-        print(f"daily/{file.name} is empty.")
-        continue
+        return [issue("empty", "File is empty")]
 
     # Catch Type errors in Datetime index
     if df.index.dtype != "datetime64[ns]":
-        txt = indexMismatchText.format(file.name.upper().ljust(15), df.index.dtype)
+        issues.append(
+            issue(
+                "index_type",
+                f"Pandas Index type Mismatch. Expect datetime64[ns] got {df.index.dtype}",
+            )
+        )
 
-        indexMismatchList.append(txt)
+        # Remaining checks need a datetime index
+        return issues
 
-    columns = df.columns
-    colLength = len(columns)
     expected_col_length = 10 if is_index_file else 9
 
-    # Catch column length errors
-    if colLength != expected_col_length:
-        txt = columnMismatchText.format(
-            file.name.upper().ljust(15), expected_col_length, colLength
+    if len(df.columns) != expected_col_length:
+        issues.append(
+            issue(
+                "column_count",
+                f"Column Length Mismatch. Expect {expected_col_length} got {len(df.columns)}",
+            )
         )
 
-        colMismatchList.append(txt)
-
-    # Catch column dataType mismatch
     for col in df.columns:
         if col == "Series":
             continue
 
         if df[col].dtype not in ("float64", "int64"):
-            txt = dtypeMismatchText.format(
-                file.name.upper().ljust(15), col, df[col].dtype
+            issues.append(
+                issue(
+                    "dtype",
+                    f"Column type Mismatch in {col}. Expected float64 or int64. Got {df[col].dtype}",
+                )
             )
 
-            typeMismatchList.append(txt)
+    ohlc = [c for c in ("Open", "High", "Low", "Close") if c in df.columns]
 
-    for col in ("Open", "High", "Low", "Close", "Volume"):
-        if df[col].hasnans:
-            # Only indices have spaces in file names - bit of a cheat
-            # For indices we only check the Close values for Nan
-            if is_index_file and col != "Close":
-                continue
+    for col in ohlc + (["Volume"] if "Volume" in df.columns else []):
+        # For indices we only check the Close values for Nan
+        if is_index_file and col != "Close":
+            continue
+
+        nans = df.index[df[col].isna().to_numpy()]
 
-            hasNansList.append(hasNansText.format(file.name.upper().ljust(15), col))
+        if len(nans):
+            issues.append(issue("nan", f"Column {col} has NAN values", date_list(nans)))
 
-    # Catch duplicate entries in file
     if df.index.has_duplicates:
-        duplicatesList.append(file.name.upper())
+        dup = df.index[df.index.duplicated()]
+        issues.append(issue("duplicates", "Duplicate entries", date_list(dup)))
+
+    if not df.index.is_monotonic_increasing:
+        values = df.index.to_numpy()
+        out_of_order = df.index[1:][values[1:] < values[:-1]]
+
+        issues.append(
+            issue("unsorted", "Dates not in ascending order", date_list(out_of_order))
+        )
+
+    if len(ohlc) == 4 and all(df[c].dtype.kind in "if" for c in ohlc):
+        o, h, l, c = (df[col].to_numpy(dtype=np.float64) for col in ohlc)
+
+        with np.errstate(invalid="ignore"):
+            # Rows with NaN or zero prices are reported by other checks
+            # or are index rows without OHLC values
+            valid = (o > 0) & (h > 0) & (l > 0) & (c > 0)
+
+            bad = valid & ((l > np.minimum(o, c)) | (h < np.maximum(o, c)) | (l > h))
+
+        if bad.any():
+            issues.append(
+                issue(
+                    "ohlc",
+                    "Low > Open/Close or High < Open/Close",
+                    date_list(df.index[bad]),
+                )
+            )
+
+    if "Close" in df.columns and df["Close"].dtype.kind in "if":
+        close = df["Close"].to_numpy(dtype=np.float64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change = np.abs(close[1:] / close[:-1] - 1)
+
+        jumps = df.index[1:][change > jump]
+
+        if len(jumps):
+            issues.append(
+                issue(
+                    "jump",
+                    f"Close changed more than {jump:.0%} from the previous day",
+                    date_list(jumps),
+                )
+            )
+
+    return issues
+
+
+def check_file(path: Path, jump: float) -> Dict:
+    """Check a single file. Runs in a worker process."""
+    # Only indices have spaces in file names - bit of a cheat
+    is_index_file = " " in path.name
+    stat = path.stat()
+
+    try:
+        data = path.read_bytes()
+    except OSError as e:
+        return dict(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            hash=None,
+            issues=[issue("read_error", repr(e))],
+        )
+
+    try:
+        df = pd.read_csv(io.BytesIO(data), index_col="Date", parse_dates=True)
+    except Exception as e:
+        # Catch pandas or file parsing errors
+        issues = [issue("read_error", repr(e))]
+    else:
+        issues = check_frame(df, is_index_file, jump)
+
+    return dict(
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        hash=file_hash(data),
+        issues=issues,
+    )
+
+
+def load_cache(path: Path, jump: float) -> Dict[str, Dict]:
+    if not path.is_file():
+        return {}
+
+    try:
+        cache = json.loads(path.read_bytes())
+    except ValueError:
+        return {}
+
+    if cache.get("version") != CHECKS_VERSION or cache.get("jump") != jump:
+        return {}
+
+    return cache.get("files", {})
+
+
+def is_unchanged(path: Path, stat: os.stat_result, cached: Dict) -> bool:
+    """
+    Return True if a file matches its cached size and modification time, or
+    if only its modification time changed and its content hash matches.
+    """
+    if cached["size"] != stat.st_size:
+        return False
+
+    if cached["mtime_ns"] == stat.st_mtime_ns:
+        return True
+
+    if cached["hash"] is None or cached["hash"] != file_hash(path.read_bytes()):
+        return False
+
+    cached["mtime_ns"] = stat.st_mtime_ns
+    return True
+
+
+def run(
+    folder: Path,
+    cache_path: Optional[Path],
+    jump: float,
+    jobs: Optional[int] = None,
+    full: bool = False,
+) -> Dict[str, Any]:
+    """
+    Check all CSV files in folder, skipping files unchanged since the last run.
+
+    Args:
+        folder: Folder with CSV files
+        cache_path: Cache of file size, modification time, hash and issues.
+            None to disable caching.
+        jump: Report Close changes above this fraction
+        jobs: Number of worker processes. Default: CPU count
+        full: Check all files, but still update the cache
+
+    Returns:
+        Report with per file issues and counts of files checked and skipped.
+    """
+    cache = {}
+
+    if cache_path is not None and not full:
+        cache = load_cache(cache_path, jump)
+
+    results: Dict[str, Dict] = {}
+    pending: List[Path] = []
+
+    with os.scandir(folder) as it:
+        for entry in it:
+            if not entry.name.endswith(".csv"):
+                continue
+
+            path = Path(entry.path)
+            cached = cache.get(entry.name)
+
+            if cached is not None and is_unchanged(path, entry.stat(), cached):
+                results[entry.name] = cached
+            else:
+                pending.append(path)
+
+    checked = 0
+
+    if pending:
+        if jobs == 1 or len(pending) < 50:
+            checked_results = (check_file(p, jump) for p in pending)
+
+            for path, result in zip(pending, checked_results):
+                results[path.name] = result
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                checked_results = executor.map(
+                    check_file, pending, [jump] * len(pending), chunksize=32
+                )
+
+                for path, result in zip(pending, checked_results):
+                    results[path.name] = result
+
+        checked = len(pending)
+
+    if cache_path is not None:
+        cache_path.write_text(
+            json.dumps(dict(version=CHECKS_VERSION, jump=jump, files=results))
+        )
+
+    errors = {
+        name: result["issues"]
+        for name, result in sorted(results.items())
+        if result["issues"]
+    }
+
+    return dict(
+        files=len(results),
+        checked=checked,
+        skipped=len(results) - checked,
+        error_count=sum(len(v) for v in errors.values()),
+        errors=errors,
+    )
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"{report['files']} files. {report['checked']} checked, "
+        f"{report['skipped']} unchanged since last run."
+    )
+
+    if report["error_count"] == 0:
+        print("No errors\n")
+        return
+
+    grouped: Dict[str, List[str]] = {}
+
+    for name, issues in report["errors"].items():
+        for item in issues:
+            text = f"{name.upper().ljust(15)}: {item['message']}"
+            dates = item.get("dates", [])
+
+            if dates:
+                text += f" - {', '.join(dates[:MAX_DATES_SHOWN])}"
+
+                if len(dates) > MAX_DATES_SHOWN:
+                    text += f" and {len(dates) - MAX_DATES_SHOWN} more"
+
+            grouped.setdefault(item["check"], []).append(text)
+
+    for check, title in CHECK_TITLES.items():
+        if check in grouped:
+            print(f"\n{title}")
+            print("\n".join(grouped[check]))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = ArgumentParser(
+        prog="diagnostic.py",
+        description="Check data integrity of all csv files in eod2_data/daily",
+    )
+
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    parser.add_argument(
+        "--full", action="store_true", help="Check all files, ignoring the cache"
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes. Default: CPU count",
+    )
+
+    parser.add_argument(
+        "--jump",
+        type=float,
+        default=0.5,
+        help="Report day-over-day Close changes above this fraction. Default: 0.5",
+    )
+
+    args = parser.parse_args(argv)
+
+    report = run(
+        DIR / "eod2_data" / "daily",
+        DIR / "eod2_data" / "integrity_cache.json",
+        jump=args.jump,
+        jobs=args.jobs,
+        full=args.full,
+    )
+
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+
+    return 1 if report["error_count"] else 0
 
-    if getErrorCount() >= ERROR_THRESHOLD:
-        break
 
-printResult()
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def file_hash(file: Path) -> str:
+    return hashlib.blake2b(file.read_bytes(), digest_size=16).hexdigest()
+
+
+class DownloadCache:
+    """
+    Reports downloaded from NSE, kept until the sync of their date is
+    committed.
+
+    Each report is keyed by report type and date, and stored under the hash
+    of its content, keeping its original file name:
+
+        <folder>/<hash>/<file name>
+
+    The size and hash of each report are recorded in <folder>/index.json and
+    checked before a cached report is reused. A failed sync leaves its
+    reports in the cache, so a retry needs no downloads.
+    """
+
+    def __init__(self, folder: Path) -> None:
+        """
+        Args:
+            folder (Path): Cache folder. Created on first download.
+        """
+        self.folder = folder
+        self.index_file = folder / "index.json"
+        self.index: Dict[str, Dict] = {}
+
+        if self.index_file.is_file():
+            try:
+                self.index = json.loads(self.index_file.read_bytes())
+            except ValueError:
+                self.index = {}
+
+    @staticmethod
+    def key(kind: str, dt: datetime) -> str:
+        return f"{kind}/{dt:%Y-%m-%d}"
+
+    def _path(self, entry: Dict) -> Path:
+        return self.folder / entry["hash"] / entry["name"]
+
+    def _save(self) -> None:
+        self.index_file.write_text(json.dumps(self.index, indent=2))
+
+    def get(self, kind: str, dt: datetime) -> Optional[Path]:
+        """
+        Return the cached report or None if not cached.
+
+        A report with a size or hash mismatch is removed from the cache.
+        """
+        key = self.key(kind, dt)
+        entry = self.index.get(key)
+
+        if entry is None:
+            return None
+
+        file = self._path(entry)
+
+        if (
+            file.is_file()
+            and file.stat().st_size == entry["size"]
+            and file_hash(file) == entry["hash"]
+        ):
+            return file
+
+        logger.warning(f"Discarding invalid cached report: {key}")
+        self.discard(kind, dt)
+        return None
+
+    def put(self, kind: str, dt: datetime, file: Path) -> Path:
+        """
+        Move a downloaded report into the cache.
+
+        Returns:
+            Path: Path to the cached report.
+        """
+        entry = dict(name=file.name, size=file.stat().st_size, hash=file_hash(file))
+        dest = self._path(entry)
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(file), str(dest))
+
+        self.index[self.key(kind, dt)] = entry
+        self._save()
+        return dest
+
+    def fetch(self, kind: str, dt: datetime, download: Callable[[], Path]) -> Path:
+        """
+        Return the cached report if valid, else download and cache it.
+
+        Args:
+            kind (str): Report type. For example, `equity`, `delivery`.
+            dt (datetime): Report date.
+            download (Callable[[], Path]): Downloads the report and returns
+                its path. Errors are raised to the caller.
+        """
+        file = self.get(kind, dt)
+
+        if file is None:
+            file = self.put(kind, dt, download())
+
+        return file
+
+    def discard(self, kind: str, dt: datetime) -> None:
+        """Remove a report from the cache, if present."""
+        entry = self.index.pop(self.key(kind, dt), None)
+
+        if entry is None:
+            return
+
+        # Identical content may be cached under another key
+        if not any(e["hash"] == entry["hash"] for e in self.index.values()):
+            shutil.rmtree(self.folder / entry["hash"], ignore_errors=True)
+
+        self._save()
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+"""
+Checksum manifest of the csv files in eod2_data/daily.
+
+Each file has a rolling checksum, folded one line at a time:
+
+    checksum = blake2b(previous checksum + line)
+
+Appending a row to a file only hashes the new bytes, and a full recompute of
+the file gives the same checksum. Files rewritten in place (adjustments,
+delivery updates) or renamed are hashed in full.
+
+The manifest is saved to eod2_data/manifest.json after each sync.
+
+Usage:
+    # Compare the daily folder against its manifest
+    python defs/manifest.py verify
+
+    # Compare with another copy of eod2_data using its manifest
+    python defs/manifest.py verify /mnt/box2/eod2_data
+
+    # List files to copy to another copy of eod2_data
+    python defs/manifest.py verify /mnt/box2/eod2_data --changed
+"""
+
+DIR = Path(__file__).parents[1]
+
+DIGEST_SIZE = 16
+
+EMPTY = hashlib.blake2b(b"", digest_size=DIGEST_SIZE).hexdigest()
+
+
+def rolling_checksum(data: bytes, checksum: str = EMPTY) -> str:
+    """
+    Fold each line in data into checksum.
+
+    Args:
+        data (bytes): Whole lines to append.
+        checksum (str): Checksum of the content preceding data.
+
+    Returns:
+        str: The new checksum as a hex string.
+    """
+    digest = bytes.fromhex(checksum)
+
+    for line in data.splitlines(keepends=True):
+        digest = hashlib.blake2b(digest + line, digest_size=DIGEST_SIZE).digest()
+
+    return digest.hex()
+
+
+def last_line(data: bytes) -> str:
+    """Return the last line of data, used to detect rewritten files."""
+    lines = data.splitlines(keepends=True)
+    return lines[-1].decode() if lines else ""
+
+
+class Manifest:
+    """
+    Rolling checksums of all csv files in a folder.
+
+    Each entry records the file size, modification time, checksum and last
+    line. On `update`, a file that only grew since the last update, and
+    whose recorded last line is unchanged, is rolled forward from the
+    appended bytes. Any other change is hashed in full.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Args:
+            path (Path): Path to the manifest JSON file. It need not exist.
+        """
+        self.path = path
+        self.files: Dict[str, Dict] = {}
+        self._rewritten: Set[str] = set()
+
+        if path.is_file():
+            try:
+                self.files = json.loads(path.read_bytes())["files"]
+            except (ValueError, KeyError):
+                self.files = {}
+
+    def invalidate(self, name: str) -> None:
+        """
+        Mark a file as rewritten in place, so the next `update` hashes it in
+        full.
+        """
+        self._rewritten.add(name)
+
+    def update(self, folder: Path) -> int:
+        """
+        Bring the manifest up to date with the csv files in folder.
+
+        Returns:
+            int: Number of files hashed in full.
+        """
+        seen = set()
+        full = 0
+
+        with os.scandir(folder) as it:
+            for entry in it:
+                if not entry.name.endswith(".csv"):
+                    continue
+
+                seen.add(entry.name)
+                stat = entry.stat()
+                record = self.files.get(entry.name)
+
+                if (
+                    record is not None
+                    and entry.name not in self._rewritten
+                    and record["size"] == stat.st_size
+                    and record["mtime_ns"] == stat.st_mtime_ns
+                ):
+                    continue
+
+                record = self._roll(Path(entry.path), stat.st_size, record)
+
+                if record is None:
+                    record = self._hash(Path(entry.path))
+                    full += 1
+
+                record["mtime_ns"] = stat.st_mtime_ns
+                self.files[entry.name] = record
+
+        for name in self.files.keys() - seen:
+            del self.files[name]
+
+        self._rewritten.clear()
+        return full
+
+    def _roll(self, path: Path, size: int, record: Optional[Dict]) -> Optional[Dict]:
+        """
+        Roll the checksum forward over bytes appended since the last update.
+
+        Returns None if the file was not simply appended to.
+        """
+        if (
+            record is None
+            or path.name in self._rewritten
+            or size <= record["size"]
+            or not record["tail"].endswith("\n")
+        ):
+            return None
+
+        tail = record["tail"].encode()
+
+        with path.open("rb") as f:
+            f.seek(record["size"] - len(tail))
+
+            if f.read(len(tail)) != tail:
+                return None
+
+            data = f.read()
+
+        return dict(
+            size=size,
+            checksum=rolling_checksum(data, record["checksum"]),
+            tail=last_line(data),
+        )
+
+    @staticmethod
+    def _hash(path: Path) -> Dict:
+        data = path.read_bytes()
+
+        return dict(
+            size=len(data), checksum=rolling_checksum(data), tail=last_line(data)
+        )
+
+    def save(self) -> None:
+        self.path.write_text(json.dumps(dict(files=self.files)))
+
+    def verify(self, folder: Path) -> Dict[str, List[str]]:
+        """
+        Hash every file in folder in full and compare with the manifest.
+
+        Returns:
+            Dict[str, List[str]]: File names that are `changed`, `missing`
+            from folder or `extra` files not in the manifest.
+        """
+        names = {n for n in os.listdir(folder) if n.endswith(".csv")}
+        changed = []
+
+        for name in sorted(names & self.files.keys()):
+            record = self.files[name]
+            path = folder / name
+
+            if (
+                path.stat().st_size != record["size"]
+                or rolling_checksum(path.read_bytes()) != record["checksum"]
+            ):
+                changed.append(name)
+
+        return dict(
+            changed=changed,
+            missing=sorted(self.files.keys() - names),
+            extra=sorted(names - self.files.keys()),
+        )
+
+    def diff(self, other: Manifest) -> Dict[str, List[str]]:
+        """
+        Compare checksums with another manifest.
+
+        Returns:
+            Dict[str, List[str]]: File names that are `changed`, `missing`
+            from other or `extra` files only in other.
+        """
+        return dict(
+            changed=sorted(
+                name
+                for name in self.files.keys() & other.files.keys()
+                if self.files[name]["checksum"] != other.files[name]["checksum"]
+            ),
+            missing=sorted(self.files.keys() - other.files.keys()),
+            extra=sorted(other.files.keys() - self.files.keys()),
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = ArgumentParser(
+        prog="manifest.py",
+        description="Compare eod2_data/daily with its checksum manifest or another copy of eod2_data",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    verify = subparsers.add_parser(
+        "verify",
+        help="Verify the daily folder against its manifest, or compare with another copy",
+    )
+
+    verify.add_argument(
+        "other",
+        nargs="?",
+        type=Path,
+        help="Another eod2_data folder. Its manifest is updated before comparing",
+    )
+
+    verify.add_argument(
+        "--changed",
+        action="store_true",
+        help="Print only the files to copy to OTHER, one per line",
+    )
+
+    subparsers.add_parser("update", help="Update the manifest of the daily folder")
+
+    args = parser.parse_args(argv)
+
+    data_dir = DIR / "eod2_data"
+    manifest = Manifest(data_dir / "manifest.json")
+
+    if args.command == "update":
+        manifest.update(data_dir / "daily")
+        manifest.save()
+        print(f"{len(manifest.files)} files in manifest")
+        return 0
+
+    if args.other is None:
+        result = manifest.verify(data_dir / "daily")
+    else:
+        manifest.update(data_dir / "daily")
+
+        other = Manifest(args.other / "manifest.json")
+        other.update(args.other / "daily")
+        result = manifest.diff(other)
+
+        if args.changed:
+            print("\n".join(result["changed"] + result["missing"]))
+            return 0
+
+    for key, names in result.items():
+        if names:
+            print(f"{key.capitalize()} ({len(names)}):")
+            print("\n".join(f"  {name}" for name in names))
+
+    if not any(result.values()):
+        print("No differences")
+        return 0
+
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
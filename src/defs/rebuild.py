@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import itertools
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .report_archive import ReportArchive
+from .utils import (
+    EQUITY_SERIES,
+    INDEX_COLUMNS,
+    SME_SERIES,
+    STOCK_COLUMNS,
+    adjust_ohlc,
+)
+
+"""
+Rebuild eod2_data/daily from the reports archived in nseBhav, nseDelivery
+and nseIndices, without network access.
+
+Reports are parsed in parallel using the same rules as `updateNseEOD` and
+`updateIndexEOD`. Symbol renames and SME to EQ switches are then replayed in
+date order, and the split and bonus adjustments recorded in
+eod2_data/adjustments.csv are applied. Each file is written once.
+
+Adjustments are only recorded from the version adding this module onwards.
+Earlier splits and bonuses are not applied to the rebuilt data.
+"""
+
+logger = logging.getLogger(__name__)
+
+# Bhavcopy columns before the UDIFF format of July 2024
+LEGACY_BHAV_COLUMNS = dict(
+    SYMBOL="TckrSymb",
+    SERIES="SctySrs",
+    OPEN="OpnPric",
+    HIGH="HghPric",
+    LOW="LwPric",
+    CLOSE="ClsPric",
+    TOTTRDQTY="TtlTradgVol",
+)
+
+INDEX_COLS = [
+    "Open Index Value",
+    "High Index Value",
+    "Low Index Value",
+    "Closing Index Value",
+    "Volume",
+    "P/E",
+]
+
+
+def load_bhav(
+    dt: datetime,
+    bhavFile: Union[Path, IO[bytes]],
+    deliveryFile: Union[Path, IO[bytes], None],
+):
+    """
+    Parse a bhavcopy and delivery report as `updateNseEOD` does.
+
+    Returns:
+        pd.DataFrame: One row per stock with ISIN, TckrSymb and the daily
+        file columns.
+    """
+    df = pd.read_csv(bhavFile)
+    df = df.rename(columns=LEGACY_BHAV_COLUMNS)
+
+    df = df.loc[df["SctySrs"].isin(EQUITY_SERIES) & ~df["TckrSymb"].str.contains("-RE")]
+
+    missing = df["ISIN"].isna()
+
+    if missing.any():
+        logger.warning(
+            f"{dt:%d %b %Y}: Skipping symbols without ISIN: {', '.join(df.loc[missing, 'TckrSymb'])}"
+        )
+        df = df.loc[~missing]
+
+    out = pd.DataFrame(
+        dict(
+            ISIN=df["ISIN"].to_numpy(),
+            TckrSymb=df["TckrSymb"].to_numpy(),
+            Open=df["OpnPric"].to_numpy(),
+            High=df["HghPric"].to_numpy(),
+            Low=df["LwPric"].to_numpy(),
+            Close=df["ClsPric"].to_numpy(),
+            Volume=df["TtlTradgVol"].to_numpy(),
+            Series=df["SctySrs"].to_numpy(),
+        )
+    )
+
+    if deliveryFile is None:
+        # Appended as empty fields without a delivery report
+        out["TOTAL_TRADES"] = out["QTY_PER_TRADE"] = out["DLV_QTY"] = ""
+    else:
+        dlvDf = pd.read_csv(deliveryFile, index_col="SYMBOL")
+        dlvDf = dlvDf[dlvDf[" SERIES"].str.strip().isin(EQUITY_SERIES)]
+        dlvDf = dlvDf[~dlvDf.index.duplicated()]
+
+        trdCnt = dlvDf[" NO_OF_TRADES"].reindex(out["TckrSymb"]).to_numpy()
+        dq = pd.to_numeric(
+            dlvDf[" DELIV_QTY"].reindex(out["TckrSymb"]), errors="coerce"
+        ).to_numpy()
+
+        # BE and BZ series stocks are all delivery trades,
+        # so we use the volume
+        all_delivery = (
+            out["Series"].isin(("BE", "BZ")) & out["TckrSymb"].isin(dlvDf.index)
+        ).to_numpy()
+
+        # Integers as in the appended rows. Symbols missing from the
+        # delivery report are written as nan.
+        out["TOTAL_TRADES"] = pd.array(trdCnt, dtype="Int64")
+        out["DLV_QTY"] = pd.array(
+            np.where(all_delivery, out["Volume"], dq), dtype="Int64"
+        )
+        out["QTY_PER_TRADE"] = (out["Volume"] / trdCnt).round(2)
+
+    out["Date"] = dt
+    return out
+
+
+def load_indices(dt: datetime, file: Union[Path, IO[bytes]]) -> pd.DataFrame:
+    """
+    Parse an indices report as `updateIndexEOD` does.
+
+    Returns:
+        pd.DataFrame: One row per index with the file name stem in `name`
+    """
+    df = pd.read_csv(file, index_col="Index Name")
+
+    out = pd.DataFrame(
+        {
+            col: pd.to_numeric(df[src], errors="coerce").to_numpy(dtype=float)
+            for col, src in zip(INDEX_COLUMNS, INDEX_COLS)
+        }
+    )
+
+    # Stock columns are appended as empty fields
+    for col in INDEX_COLUMNS[len(INDEX_COLS) :]:
+        out[col] = ""
+
+    out["name"] = [sym.replace("/", "-").replace(":", "-").lower() for sym in df.index]
+    out["Date"] = dt
+    return out
+
+
+def _load(args: Tuple[str, datetime, Path]) -> pd.DataFrame:
+    kind, dt, archive_dir = args
+
+    if kind == "indices":
+        return load_indices(dt, ReportArchive(archive_dir / "nseIndices").open(dt))
+
+    return load_bhav(
+        dt,
+        ReportArchive(archive_dir / "nseBhav").open(dt),
+        ReportArchive(archive_dir / "nseDelivery").open(dt),
+    )
+
+
+def load_adjustments(file: Path) -> Dict[datetime, List[Tuple[str, float]]]:
+    """Load the split and bonus adjustments recorded by `adjustNseStocks`"""
+    if not file.is_file():
+        return {}
+
+    df = pd.read_csv(file, parse_dates=["Date"]).drop_duplicates()
+
+    adjustments: Dict[datetime, List[Tuple[str, float]]] = {}
+
+    # Match daily file names. Early versions recorded the NSE symbol as is.
+    for t in df.itertuples(index=False):
+        adjustments.setdefault(t.Date.to_pydatetime(), []).append(
+            (t.Symbol.lower(), t.Factor)
+        )
+
+    return adjustments
+
+
+def assign_files(
+    frames: List[pd.DataFrame],
+    adjustments: Dict[datetime, List[Tuple[str, float]]],
+) -> Tuple[Dict[int, str], Dict[int, List[Tuple[datetime, float]]]]:
+    """
+    Replay symbol renames and SME to EQ switches in date order, as
+    `updateNseEOD` and `updateNseSymbol` do with files.
+
+    Adds a `file` column of file ids to each frame.
+
+    Returns:
+        The file name of each file id still present at the end, and the
+        adjustments of each file id.
+    """
+    isin: Dict[str, str] = {}
+    files: Dict[str, int] = {}
+    new_id = itertools.count()
+    file_adjustments: Dict[int, List[Tuple[datetime, float]]] = {}
+
+    for df in frames:
+        ids = np.empty(len(df), dtype=np.int64)
+
+        for i, (isin_code, sym, series) in enumerate(
+            zip(df["ISIN"], df["TckrSymb"], df["Series"])
+        ):
+            prefix = "_sme" if series in SME_SERIES else ""
+            name = f"{sym.lower()}{prefix}"
+            current = isin.get(isin_code)
+
+            if current is None:
+                isin[isin_code] = sym
+            elif sym != current:
+                isin[isin_code] = sym
+                old = f"{current.lower()}{prefix}"
+
+                if old in files:
+                    files[name] = files.pop(old)
+
+            if name not in files:
+                sme = f"{name}_sme"
+
+                if not prefix and sme in files:
+                    files[name] = files.pop(sme)
+                else:
+                    files[name] = next(new_id)
+
+            ids[i] = files[name]
+
+        df["file"] = ids
+
+        if len(df):
+            dt = df["Date"].iat[0].to_pydatetime()
+
+            for sym, factor in adjustments.get(dt, []):
+                if sym in files:
+                    file_adjustments.setdefault(files[sym], []).append((dt, factor))
+
+    return {file_id: name for name, file_id in files.items()}, file_adjustments
+
+
+def _write(args: Tuple[Path, pd.DataFrame, List[str]]) -> None:
+    file, df, columns = args
+
+    # Missing values are written as the live append writes them
+    df.to_csv(file, columns=columns, date_format="%Y-%m-%d", na_rep="nan")
+
+
+def _map(func: Callable, items: List, jobs: Optional[int], chunksize: int) -> List:
+    if jobs == 1:
+        return [func(item) for item in items]
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
+
+
+def rebuild(
+    archive_dir: Path,
+    out_folder: Path,
+    adjustments_file: Path,
+    jobs: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Rebuild the daily folder from archived reports.
+
+    Args:
+        archive_dir: Folder with nseBhav, nseDelivery and nseIndices
+        out_folder: Folder to write the daily files to. Must be empty or
+            not exist.
+        adjustments_file: eod2_data/adjustments.csv
+        jobs: Number of worker processes. Default: CPU count
+
+    Returns:
+        Counts of dates and files written.
+    """
+    if out_folder.is_dir() and any(out_folder.iterdir()):
+        raise FileExistsError(f"{out_folder} is not empty")
+
+    out_folder.mkdir(parents=True, exist_ok=True)
+
+    bhav = ReportArchive(archive_dir / "nseBhav").dates()
+    indices = ReportArchive(archive_dir / "nseIndices").dates()
+
+    tasks = [("equity", dt, archive_dir) for dt in sorted(bhav)]
+    tasks.extend(("indices", dt, archive_dir) for dt in sorted(indices))
+
+    logger.info(f"Loading {len(bhav)} bhavcopy and {len(indices)} indices reports")
+
+    frames = _map(_load, tasks, jobs, chunksize=16)
+
+    stock_frames = frames[: len(bhav)]
+    index_frames = frames[len(bhav) :]
+
+    names, file_adjustments = assign_files(
+        stock_frames, load_adjustments(adjustments_file)
+    )
+
+    writes: List[Tuple[Path, pd.DataFrame, List[str]]] = []
+
+    if stock_frames:
+        stocks = pd.concat(stock_frames, ignore_index=True)
+
+        for file_id, df in stocks.groupby("file", sort=False):
+            if file_id not in names:
+                # File was replaced by a rename
+                continue
+
+            df = df.set_index("Date").sort_index(kind="stable")
+
+            for dt, factor in file_adjustments.get(file_id, []):
+                before = df.loc[df.index < dt].copy()
+                adjust_ohlc(before, factor)
+                df = pd.concat([before, df.loc[df.index >= dt]])
+
+            writes.append((out_folder / f"{names[file_id]}.csv", df, STOCK_COLUMNS))
+
+    if index_frames:
+        index_df = pd.concat(index_frames, ignore_index=True)
+
+        for name, df in index_df.groupby("name", sort=False):
+            df = df.set_index("Date").sort_index(kind="stable")
+            writes.append((out_folder / f"{name}.csv", df, INDEX_COLUMNS))
+
+    logger.info(f"Writing {len(writes)} files to {out_folder}")
+
+    _map(_write, writes, jobs, chunksize=32)
+
+    return dict(
+        dates=len(bhav),
+        files=len(writes),
+        adjustments=sum(len(v) for v in file_adjustments.values()),
+    )
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import io
+import os
+import re
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+REPORT_DATE_PATTERNS = (
+    (re.compile(r"BhavCopy_NSE_CM_0_0_0_(\d{8})_F"), "%Y%m%d"),
+    (re.compile(r"cm(\d{2}[A-Za-z]{3}\d{4})bhav"), "%d%b%Y"),
+    (re.compile(r"sec_bhavdata_full_(\d{8})"), "%d%m%Y"),
+    (re.compile(r"ind_close_all_(\d{8})"), "%d%m%Y"),
+)
+
+
+def report_date(name: str) -> Optional[datetime]:
+    """Return the date of an NSE report from its file name"""
+    for pattern, fmt in REPORT_DATE_PATTERNS:
+        match = pattern.search(name)
+
+        if match:
+            return datetime.strptime(match.group(1), fmt)
+
+    return None
+
+
+class ReportArchive:
+    """
+    Archive of one NSE report type, such as nseBhav, packed into one
+    compressed zip file per month:
+
+        <folder>/<year>/<year>-<month>.zip
+
+    Each report is stored as `<YYYY-MM-DD>/<file name>`. The zip central
+    directory serves as the index, so a single report is read without
+    decompressing the rest of the month.
+
+    Uncompressed CSV files in the year folders, written by earlier versions,
+    remain readable until packed with `pack`.
+    """
+
+    def __init__(self, folder: Path) -> None:
+        """
+        Args:
+            folder (Path): Archive folder. For example, src/nseBhav
+        """
+        self.folder = folder
+
+    def _zip_path(self, dt: datetime) -> Path:
+        return self.folder / str(dt.year) / f"{dt:%Y-%m}.zip"
+
+    def _member(self, dt: datetime, zf: zipfile.ZipFile) -> Optional[str]:
+        prefix = f"{dt:%Y-%m-%d}/"
+
+        for name in zf.namelist():
+            if name.startswith(prefix):
+                return name
+
+        return None
+
+    def _loose_file(self, dt: datetime) -> Optional[Path]:
+        year_folder = self.folder / str(dt.year)
+
+        if not year_folder.is_dir():
+            return None
+
+        for file in year_folder.glob("*.csv"):
+            file_dt = report_date(file.name)
+
+            if file_dt is not None and file_dt.date() == dt.date():
+                return file
+
+        return None
+
+    def add(self, dt: datetime, name: str, data: bytes) -> None:
+        """Add a report, replacing any report already stored for the date."""
+        self._add_month(self._zip_path(dt), {dt: (name, data)})
+
+    def _add_month(
+        self, path: Path, reports: Dict[datetime, Tuple[str, bytes]]
+    ) -> None:
+        """
+        Add reports of one month to its zip.
+
+        New dates are appended in place. If a date is already stored, the
+        zip is rewritten to a temporary file and then replaced, as zip
+        members cannot be removed. An interrupted rewrite leaves the
+        previous zip intact.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        members = {dt: f"{dt:%Y-%m-%d}/{name}" for dt, (name, _) in reports.items()}
+        prefixes = {member.split("/", 1)[0] + "/" for member in members.values()}
+        replaced = set()
+
+        if path.is_file():
+            with zipfile.ZipFile(path) as zf:
+                replaced = {
+                    member
+                    for member in zf.namelist()
+                    if member.split("/", 1)[0] + "/" in prefixes
+                }
+
+        if not replaced:
+            with zipfile.ZipFile(
+                path, "a", zipfile.ZIP_DEFLATED, compresslevel=9
+            ) as zf:
+                for dt, (_, data) in reports.items():
+                    zf.writestr(members[dt], data)
+
+            return
+
+        tmp = path.with_suffix(".tmp")
+
+        with zipfile.ZipFile(path) as src, zipfile.ZipFile(
+            tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=9
+        ) as dst:
+            for info in src.infolist():
+                if info.filename not in replaced:
+                    dst.writestr(info, src.read(info), compresslevel=9)
+
+            for dt, (_, data) in reports.items():
+                dst.writestr(members[dt], data)
+
+        os.replace(tmp, path)
+
+    def add_file(self, dt: datetime, file: Path) -> None:
+        """Add a report file under its own name"""
+        self.add(dt, file.name, file.read_bytes())
+
+    def find(self, dt: datetime) -> Optional[str]:
+        """Return the file name of the report for a date or None"""
+        path = self._zip_path(dt)
+
+        if path.is_file():
+            with zipfile.ZipFile(path) as zf:
+                member = self._member(dt, zf)
+
+            if member is not None:
+                return member.split("/", 1)[1]
+
+        file = self._loose_file(dt)
+        return None if file is None else file.name
+
+    def read(self, dt: datetime) -> Optional[bytes]:
+        """Return the report for a date or None"""
+        path = self._zip_path(dt)
+
+        if path.is_file():
+            with zipfile.ZipFile(path) as zf:
+                member = self._member(dt, zf)
+
+                if member is not None:
+                    return zf.read(member)
+
+        file = self._loose_file(dt)
+        return None if file is None else file.read_bytes()
+
+    def open(self, dt: datetime) -> Optional[IO[bytes]]:
+        """Return the report for a date as a binary file object or None"""
+        data = self.read(dt)
+        return None if data is None else io.BytesIO(data)
+
+    def read_csv(self, dt: datetime, **kwargs) -> Optional[pd.DataFrame]:
+        """Return the report for a date as a DataFrame or None"""
+        file = self.open(dt)
+        return None if file is None else pd.read_csv(file, **kwargs)
+
+    def dates(self) -> Dict[datetime, Tuple[Optional[Path], str]]:
+        """
+        Map each archived report date to its month zip and file name. The
+        zip is None for uncompressed files.
+        """
+        reports: Dict[datetime, Tuple[Optional[Path], str]] = {}
+
+        if not self.folder.is_dir():
+            return reports
+
+        for file in self.folder.glob("*/*.csv"):
+            dt = report_date(file.name)
+
+            if dt is not None:
+                reports[dt] = (None, file.name)
+
+        for path in self.folder.glob("*/*.zip"):
+            with zipfile.ZipFile(path) as zf:
+                for member in zf.namelist():
+                    day, name = member.split("/", 1)
+                    reports[datetime.fromisoformat(day)] = (path, name)
+
+        return reports
+
+    def pack(self) -> int:
+        """
+        Move uncompressed CSV files in the year folders into the month zips.
+
+        Returns:
+            int: Number of files packed.
+        """
+        months: Dict[Path, List[Tuple[datetime, Path]]] = {}
+
+        for file in sorted(self.folder.glob("*/*.csv")):
+            dt = report_date(file.name)
+
+            if dt is not None:
+                months.setdefault(self._zip_path(dt), []).append((dt, file))
+
+        count = 0
+
+        # One write per month zip
+        for path, files in months.items():
+            self._add_month(path, {dt: (f.name, f.read_bytes()) for dt, f in files})
+
+            for _, file in files:
+                file.unlink()
+
+            count += len(files)
+
+        return count
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+"""
+Stage timings, counters and peak memory of each init.py run, appended as
+one JSON line per run to eod2_data/run_log.jsonl.
+
+Use `init.py --stats` to summarise the last runs.
+"""
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Return the peak resident memory of this process in MB or None if
+    unavailable
+    """
+    if resource is None:
+        return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    if sys.platform == "darwin":
+        rss /= 1024
+
+    return round(rss / 1024, 1)
+
+
+class RunStats:
+    """
+    Timings and counters of one init.py run.
+
+    Stages are timed with `stage` and may be tagged with the date being
+    synced. Counters are incremented with `count`.
+    """
+
+    def __init__(self) -> None:
+        self.started = datetime.now()
+        self.status = "error"
+        self.stages: List[dict] = []
+        self.counters: Counter = Counter()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str, dt: Optional[datetime] = None) -> Iterator[None]:
+        """Time the enclosed block, including when it exits early"""
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.stages.append(
+                dict(
+                    stage=name,
+                    date=None if dt is None else f"{dt:%Y-%m-%d}",
+                    seconds=round(time.perf_counter() - start, 4),
+                )
+            )
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def record(self) -> dict:
+        """Return the run as a JSON serializable dict"""
+        return dict(
+            started=self.started.isoformat(timespec="seconds"),
+            status=self.status,
+            seconds=round(time.perf_counter() - self._start, 4),
+            dates=sorted({s["date"] for s in self.stages if s["date"]}),
+            peak_rss_mb=peak_rss_mb(),
+            stages=self.stages,
+            counters=dict(self.counters),
+        )
+
+    def save(self, file: Path) -> None:
+        """Append the run to a JSONL run log"""
+        line = json.dumps(self.record()) + "\n"
+
+        # Keep the record on its own line after an interrupted write
+        if file.is_file() and file.stat().st_size:
+            with file.open("rb") as f:
+                f.seek(-1, os.SEEK_END)
+
+                if f.read(1) != b"\n":
+                    line = "\n" + line
+
+        with file.open("a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def load_runs(file: Path, last: int) -> List[dict]:
+    """Return the last runs in a JSONL run log. Unreadable lines are skipped."""
+    if not file.is_file():
+        return []
+
+    runs = []
+
+    for line in file.read_text(encoding="utf-8").splitlines():
+        try:
+            runs.append(json.loads(line))
+        except json.JSONDecodeError:
+            # Partial line from an interrupted write
+            continue
+
+    return runs[-last:]
+
+
+def summarise(runs: List[dict]) -> str:
+    """
+    Summarise runs as text: one row per run, then the mean and max time per
+    run of each stage and the mean of each counter.
+    """
+    if not runs:
+        return "No runs recorded"
+
+    lines = [
+        f"Last {len(runs)} runs\n",
+        f"{'Started':<20} {'Status':<7} {'Dates':>5} {'Seconds':>9} {'Peak RSS MB':>12}",
+    ]
+
+    stage_times: Dict[str, List[float]] = {}
+    counters: Counter = Counter()
+
+    for run in runs:
+        rss = run.get("peak_rss_mb")
+
+        lines.append(
+            f"{run['started']:<20} {run['status']:<7} {len(run['dates']):>5} "
+            f"{run['seconds']:>9.2f} {'-' if rss is None else rss:>12}"
+        )
+
+        per_run: Counter = Counter()
+
+        for s in run["stages"]:
+            per_run[s["stage"]] += s["seconds"]
+
+        for name, seconds in per_run.items():
+            stage_times.setdefault(name, []).append(seconds)
+
+        counters.update(run["counters"])
+
+    lines.append(f"\n{'Stage':<20} {'Runs':>5} {'Mean s':>9} {'Max s':>9}")
+
+    for name, times in sorted(stage_times.items(), key=lambda x: -sum(x[1])):
+        lines.append(
+            f"{name:<20} {len(times):>5} {sum(times) / len(times):>9.2f} {max(times):>9.2f}"
+        )
+
+    if counters:
+        lines.append(f"\n{'Counter':<20} {'Mean per run':>14}")
+
+        for name, total in sorted(counters.items()):
+            lines.append(f"{name:<20} {total / len(runs):>14.1f}")
+
+    return "\n".join(lines)
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import json
+import os
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .symbol_store import SymbolStore
+
+INDEX_ALIAS: Dict[str, str] = dict(
+    n50="nifty 50",
+    n100="nifty 100",
+    n200="nifty 200",
+    n500="nifty 500",
+    next50="nifty next 50",
+    m50="nifty midcap 50",
+    m100="nifty midcap 100",
+    mselect="nifty midcap select",
+    s100="nifty smallcap 100",
+    s50="nifty smallcap 50",
+    nbank="nifty bank",
+    nfin="nifty financial services",
+    ttlmkt="nifty total market",
+)
+
+SME_SUFFIX = "_sme"
+
+
+def normalize(symbol: str) -> str:
+    """Return the lookup key of a symbol, index name or alias."""
+    key = symbol.strip().lower()
+    return INDEX_ALIAS.get(key, key)
+
+
+class SymbolIndex:
+    """
+    Maps symbols to their CSV files in the daily folder.
+
+    Built from a single directory scan plus `isin.csv` and the symbol
+    history in `isin_symbol_map.db`, and cached to `symbol_index.json` in the
+    eod2_data folder. The cache is rebuilt when the daily folder, or either
+    ISIN file, is newer than it. `init.py` refreshes it after each sync.
+
+    Keys are lowercase. A symbol resolves, in order, by:
+        - Its file name, including index names like 'nifty 50'
+        - Its SME file, `{symbol}_sme.csv`
+        - An index alias from INDEX_ALIAS, like 'n50'
+        - Its ISIN
+        - A former symbol of the same ISIN, after a name change
+    """
+
+    def __init__(
+        self,
+        folder: Path,
+        files: Dict[str, str],
+        isin: Optional[Dict[str, str]] = None,
+        renamed: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Args:
+            folder (Path): The daily folder containing the CSV files.
+            files (Dict[str, str]): Lookup key to CSV file name.
+            isin (Optional[Dict[str, str]]): Lowercase ISIN to current symbol key.
+            renamed (Optional[Dict[str, str]]): Former symbol to current symbol key.
+        """
+        self.folder = folder
+        self.files = files
+        self.isin = isin or {}
+        self.renamed = renamed or {}
+        self._sorted_keys: Optional[List[str]] = None
+
+    @classmethod
+    def build(
+        cls,
+        folder: Path,
+        isin_file: Optional[Path] = None,
+        symbol_db: Optional[Path] = None,
+    ) -> SymbolIndex:
+        """
+        Scan the daily folder and read the ISIN files.
+
+        Args:
+            folder (Path): The daily folder containing the CSV files.
+            isin_file (Optional[Path]): `isin.csv` with ISIN and SYMBOL columns.
+            symbol_db (Optional[Path]): `isin_symbol_map.db` written by
+                SymbolTracker.
+
+        Returns:
+            SymbolIndex: A new index.
+        """
+        files: Dict[str, str] = {}
+        sme: Dict[str, str] = {}
+
+        with os.scandir(folder) as it:
+            for entry in it:
+                stem, ext = os.path.splitext(entry.name)
+
+                if ext != ".csv":
+                    continue
+
+                stem = stem.lower()
+                files[stem] = entry.name
+
+                if stem.endswith(SME_SUFFIX):
+                    sme[stem[: -len(SME_SUFFIX)]] = entry.name
+
+        # Main board files take precedence over SME files
+        for key, name in sme.items():
+            files.setdefault(key, name)
+
+        isin: Dict[str, str] = {}
+
+        if isin_file is not None and isin_file.is_file():
+            isin_df = pd.read_csv(isin_file, usecols=["ISIN", "SYMBOL"], dtype=str)
+
+            for symbol_isin, symbol in zip(isin_df.ISIN, isin_df.SYMBOL):
+                if isinstance(symbol, str) and symbol.lower() in files:
+                    isin[symbol_isin.lower()] = symbol.lower()
+
+        sym2isin: Dict[str, str] = {}
+
+        if symbol_db is not None:
+            legacy_file = symbol_db.with_suffix(".json")
+
+            # The JSON file is newer after a git pull of eod2_data or if
+            # init.py has not yet run since the move to SQLite
+            if legacy_file.is_file() and (
+                not symbol_db.is_file()
+                or legacy_file.stat().st_mtime >= symbol_db.stat().st_mtime
+            ):
+                sym2isin = json.loads(legacy_file.read_bytes())["sym2isin"]
+            elif symbol_db.is_file():
+                sym2isin = SymbolStore(symbol_db).sym2isin()
+
+        renamed: Dict[str, str] = {}
+
+        for symbol, symbol_isin in sym2isin.items():
+            key = symbol.lower()
+            current = isin.get(symbol_isin.lower())
+
+            if key not in files and current is not None and current != key:
+                renamed[key] = current
+
+        return cls(folder, files, isin, renamed)
+
+    @classmethod
+    def load(cls, folder: Path) -> SymbolIndex:
+        """
+        Load the cached index of a daily folder, rebuilding it if stale.
+
+        The ISIN files and cache are expected in the parent eod2_data folder.
+
+        Args:
+            folder (Path): The daily folder containing the CSV files.
+
+        Returns:
+            SymbolIndex: The index.
+        """
+        cache, isin_file, symbol_db = cls._paths(folder)
+
+        try:
+            cache_mtime = cache.stat().st_mtime
+        except FileNotFoundError:
+            cache_mtime = None
+
+        if cache_mtime is not None:
+            sources = [folder, isin_file, symbol_db, symbol_db.with_suffix(".json")]
+
+            if all(not p.exists() or p.stat().st_mtime <= cache_mtime for p in sources):
+                data = json.loads(cache.read_bytes())
+                return cls(folder, data["files"], data["isin"], data["renamed"])
+
+        index = cls.build(folder, isin_file, symbol_db)
+
+        try:
+            index.save(cache)
+        except OSError:
+            # Read only data folder. The index is rebuilt on every load.
+            pass
+
+        return index
+
+    @classmethod
+    def refresh(cls, folder: Path) -> SymbolIndex:
+        """Rebuild and save the index of a daily folder."""
+        cache, isin_file, symbol_db = cls._paths(folder)
+
+        index = cls.build(folder, isin_file, symbol_db)
+        index.save(cache)
+        return index
+
+    @staticmethod
+    def _paths(folder: Path) -> Tuple[Path, Path, Path]:
+        """Return the cache, isin.csv and isin_symbol_map.db paths."""
+        data_dir = folder.parent
+
+        return (
+            data_dir / "symbol_index.json",
+            data_dir / "isin.csv",
+            data_dir / "isin_symbol_map.db",
+        )
+
+    def save(self, file: Path) -> None:
+        """Write the index to a JSON file."""
+        file.write_text(
+            json.dumps(dict(files=self.files, isin=self.isin, renamed=self.renamed))
+        )
+
+    def key(self, symbol: str) -> Optional[str]:
+        """
+        Return the file key of a symbol, index name, alias, ISIN or former
+        symbol, or None if it is not found.
+        """
+        key = normalize(symbol)
+
+        if key in self.files:
+            return key
+
+        return self.isin.get(key) or self.renamed.get(key)
+
+    def resolve(self, symbol: str) -> Optional[Path]:
+        """
+        Return the CSV file of a symbol, or None if it is not found.
+
+        Args:
+            symbol (str): A symbol, index name, alias, ISIN or former symbol.
+
+        Returns:
+            Optional[Path]: Path to the CSV file.
+        """
+        key = self.key(symbol)
+        return None if key is None else self.folder / self.files[key]
+
+    def search(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Return up to `limit` symbols starting with prefix, in sorted order.
+
+        Args:
+            prefix (str): Start of a symbol or index name.
+            limit (int): Maximum number of results.
+
+        Returns:
+            List[str]: Matching lowercase symbols.
+        """
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self.files)
+
+        keys = self._sorted_keys
+        prefix = prefix.strip().lower()
+        result = []
+
+        for i in range(bisect_left(keys, prefix), len(keys)):
+            if len(result) >= limit or not keys[i].startswith(prefix):
+                break
+
+            result.append(keys[i])
+
+        return result
+
+    def suggest(self, symbol: str, limit: int = 5) -> List[str]:
+        """
+        Return symbols sharing the longest possible prefix with symbol.
+
+        Used for 'did you mean' hints on a mistyped symbol.
+        """
+        prefix = normalize(symbol)
+
+        # A single character matches too many unrelated symbols
+        while len(prefix) > 1:
+            result = self.search(prefix, limit)
+
+            if result:
+                return result
+
+            prefix = prefix[:-1]
+
+        return []
+
+    def not_found_message(self, symbol: str) -> str:
+        """Return a 'File not found' message with suggestions if any."""
+        msg = f"File not found: {symbol}"
+        suggestions = self.suggest(symbol)
+
+        if suggestions:
+            msg += f". Did you mean: {', '.join(s.upper() for s in suggestions)}?"
+
+        return msg
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.key(symbol) is not None
+
+    def __len__(self) -> int:
+        return len(self.files)
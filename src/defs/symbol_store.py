@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .symbol_tracker import SymbolHistory, SymbolISINMap
+
+Row = Tuple[str, int, str, str, str, Optional[str]]
+
+
+class SymbolStore:
+    """
+    SQLite storage for SymbolTracker with one row per symbol history entry.
+
+    Saves replace the history of new and renamed ISINs only, and update the
+    last to_date of ISINs that traded again. The cost of a daily sync does
+    not grow with the number of listings ever seen. Each save is a single
+    transaction.
+
+    `isin_symbol_map.json` remains the published format. It is written with
+    `export`, and imported again whenever it changes from the version last
+    imported or exported, for example after a git pull of eod2_data.
+
+    The database is created on first use, not on creation of the store.
+    """
+
+    def __init__(self, db_path: Path, legacy_path: Optional[Path] = None) -> None:
+        """
+        Args:
+            db_path (Path): Path to eod2_data/isin_symbol_map.db
+            legacy_path (Optional[Path]): Path to eod2_data/isin_symbol_map.json
+                to import from and export to.
+        """
+        self.db_path = db_path
+        self.legacy_path = legacy_path
+        self._ready = False
+
+    def _connect(self) -> closing[sqlite3.Connection]:
+        if not self._ready:
+            self._ready = True
+            self._setup()
+
+        return closing(sqlite3.connect(self.db_path))
+
+    def _setup(self) -> None:
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                "isin TEXT NOT NULL, "
+                "seq INTEGER NOT NULL, "
+                "symbol TEXT NOT NULL, "
+                "from_date TEXT NOT NULL, "
+                "to_date TEXT NOT NULL, "
+                "action TEXT, "
+                "PRIMARY KEY (isin, seq))"
+            )
+
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS history_symbol ON history (symbol)"
+            )
+
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+
+            signature = self._legacy_signature()
+
+            if signature is not None and signature != self._get_meta(
+                conn, "legacy_signature"
+            ):
+                self._import_legacy(conn)
+                self._set_meta(conn, "legacy_signature", signature)
+
+            conn.commit()
+
+    def _legacy_signature(self) -> Optional[str]:
+        if self.legacy_path is None or not self.legacy_path.is_file():
+            return None
+
+        stat = self.legacy_path.stat()
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    @staticmethod
+    def _get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def _import_legacy(self, conn: sqlite3.Connection) -> None:
+        """Replace all history with the contents of the JSON file"""
+        assert self.legacy_path is not None
+
+        data = json.loads(self.legacy_path.read_bytes())
+
+        conn.execute("DELETE FROM history")
+
+        conn.executemany(
+            "INSERT INTO history VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    isin,
+                    seq,
+                    entry["symbol"],
+                    entry["from_date"],
+                    entry["to_date"],
+                    entry.get("action"),
+                )
+                for isin, hist in data["isin2hist"].items()
+                for seq, entry in enumerate(hist)
+            ),
+        )
+
+    def export(self, text: str) -> None:
+        """
+        Write the serialized tracker to the JSON file, so it is not imported
+        again on next use.
+
+        Args:
+            text (str): Output of SymbolTracker.to_json
+        """
+        if self.legacy_path is None:
+            raise ValueError("SymbolStore has no JSON file to export to")
+
+        with self._connect() as conn:
+            tmp = self.legacy_path.with_suffix(".tmp")
+            tmp.write_text(text)
+            os.replace(tmp, self.legacy_path)
+
+            self._set_meta(conn, "legacy_signature", self._legacy_signature())
+            conn.commit()
+
+    def load(self) -> SymbolISINMap:
+        """
+        Loads all symbol-ISIN mappings.
+
+        Returns:
+            SymbolISINMap: The mapping data with dates as `date` objects.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT isin, symbol, from_date, to_date, action "
+                "FROM history ORDER BY isin, seq"
+            ).fetchall()
+
+        sym2isin: Dict[str, str] = {}
+        isin2hist: Dict[str, List[SymbolHistory]] = {}
+
+        for isin, symbol, from_date, to_date, action in rows:
+            sym2isin[symbol] = isin
+
+            isin2hist.setdefault(isin, []).append(
+                SymbolHistory(
+                    symbol=symbol,
+                    from_date=date.fromisoformat(from_date),
+                    to_date=date.fromisoformat(to_date),
+                    action=action,
+                )
+            )
+
+        return SymbolISINMap(sym2isin=sym2isin, isin2hist=isin2hist)
+
+    def sym2isin(self) -> Dict[str, str]:
+        """
+        Maps every symbol ever tracked to its ISIN, without loading the
+        history dates.
+        """
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT symbol, isin FROM history"))
+
+    def save(
+        self,
+        isin2hist: Dict[str, List[SymbolHistory]],
+        extended: Optional[Dict[str, List[SymbolHistory]]] = None,
+    ) -> None:
+        """
+        Replaces the history of the given ISINs and updates the last to_date
+        of the extended ISINs in a single transaction.
+
+        Args:
+            isin2hist (Dict[str, List[SymbolHistory]]): Changed ISINs and
+                their full history.
+            extended (Optional[Dict[str, List[SymbolHistory]]]): ISINs whose
+                last entry only has a later to_date, and their full history.
+        """
+        if not isin2hist and not extended:
+            return
+
+        with self._connect() as conn:
+            conn.executemany(
+                "DELETE FROM history WHERE isin = ?", ((isin,) for isin in isin2hist)
+            )
+
+            conn.executemany(
+                "INSERT INTO history VALUES (?, ?, ?, ?, ?, ?)",
+                self._rows(isin2hist),
+            )
+
+            if extended:
+                conn.executemany(
+                    "UPDATE history SET to_date = ? WHERE isin = ? AND seq = ?",
+                    (
+                        (hist[-1]["to_date"].isoformat(), isin, len(hist) - 1)
+                        for isin, hist in extended.items()
+                    ),
+                )
+
+            conn.commit()
+
+    @staticmethod
+    def _rows(isin2hist: Dict[str, List[SymbolHistory]]) -> Iterable[Row]:
+        for isin, hist in isin2hist.items():
+            for seq, entry in enumerate(hist):
+                yield (
+                    isin,
+                    seq,
+                    entry["symbol"],
+                    entry["from_date"].isoformat(),
+                    entry["to_date"].isoformat(),
+                    entry["action"],
+                )
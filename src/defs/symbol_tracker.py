@@ -1,9 +1,25 @@
 from __future__ import annotations
 
 import json
+from bisect import bisect_right
 from datetime import date
 from pathlib import Path
-from typing import Dict, List, Literal, Optional, TypedDict, cast
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Set,
+    TypedDict,
+    cast,
+)
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .symbol_store import SymbolStore
 
 
 class SymbolHistory(TypedDict):
@@ -38,6 +54,24 @@ class SymbolISINMap(TypedDict):
     isin2hist: Dict[str, List[SymbolHistory]]
 
 
+class _IntervalIndex(NamedTuple):
+    """
+    Point-in-time lookup structures built from `isin2hist`.
+
+    Attributes:
+        from_dates (Dict[str, List[date]]): Per ISIN, the from_date of each
+            history entry, in chronological order.
+        starts (np.ndarray): from_date of every history entry, sorted.
+        ends (np.ndarray): to_date of the entries in `starts` order.
+        isins (np.ndarray): ISIN of the entries in `starts` order.
+    """
+
+    from_dates: Dict[str, List[date]]
+    starts: np.ndarray
+    ends: np.ndarray
+    isins: np.ndarray
+
+
 class SymbolTracker:
     """
     Tracks and maintains the relationship between trading symbols and ISINs
@@ -45,22 +79,97 @@ class SymbolTracker:
 
     This class allows updating symbol-ISIN mappings, retrieving the latest
     symbol for a given ISIN or symbol, accessing full history, and
-    serializing/deserializing the data to and from JSON.
+    serializing/deserializing the data to and from JSON or a SymbolStore.
     """
 
-    def __init__(self, data_file: Optional[Path] = None) -> None:
+    def __init__(
+        self,
+        data_file: Optional[Path] = None,
+        store: Optional[SymbolStore] = None,
+    ) -> None:
         """
         Initializes the SymbolTracker.
 
+        Data is loaded on first access, so creating a tracker is free.
+
         Args:
             data_file (Optional[Path]): Path to a JSON file containing previously
-                saved symbol-ISIN mappings. If not provided, an empty dataset
-                is initialized.
+                saved symbol-ISIN mappings.
+            store (Optional[SymbolStore]): SQLite storage to load from and
+                save changes to. Takes precedence over data_file.
+
+        If neither is provided, an empty dataset is initialized.
         """
-        if data_file is None:
-            self.data = SymbolISINMap(sym2isin={}, isin2hist={})
-        else:
-            self.data = self.from_json(data_file)
+        self._data_file = data_file
+        self._store = store
+        self._data: Optional[SymbolISINMap] = None
+
+        # ISINs with a new history entry since the last save
+        self._dirty: Set[str] = set()
+
+        # ISINs whose last entry was only extended to a later to_date
+        self._extended: Set[str] = set()
+
+        # Saved since the last export
+        self._unexported = False
+
+        # Built on the first point-in-time query and discarded on update
+        self._index: Optional[_IntervalIndex] = None
+
+    @property
+    def data(self) -> SymbolISINMap:
+        if self._data is None:
+            if self._store is not None:
+                self._data = self._store.load()
+            elif self._data_file is not None:
+                self._data = self.from_json(self._data_file)
+            else:
+                self._data = SymbolISINMap(sym2isin={}, isin2hist={})
+
+        return self._data
+
+    def save(self) -> None:
+        """
+        Writes the history of ISINs changed since the last save to the store.
+
+        New ISINs and renames rewrite the history of the ISIN. An ISIN that
+        traded again under the same symbol only updates its last to_date.
+
+        Raises:
+            ValueError: If the tracker was created without a store.
+        """
+        if self._store is None:
+            raise ValueError("SymbolTracker has no store to save to")
+
+        if not self._dirty and not self._extended:
+            return
+
+        isin2hist = self.data["isin2hist"]
+
+        self._store.save(
+            {isin: isin2hist[isin] for isin in self._dirty},
+            {isin: isin2hist[isin] for isin in self._extended - self._dirty},
+        )
+        self._dirty.clear()
+        self._extended.clear()
+        self._unexported = True
+
+    def export(self) -> None:
+        """
+        Writes the full history to the JSON file of the store, if saved
+        since the last export.
+
+        Raises:
+            ValueError: If the tracker was created without a store.
+        """
+        if self._store is None:
+            raise ValueError("SymbolTracker has no store to export from")
+
+        if not self._unexported:
+            return
+
+        self._store.export(self.to_json())
+        self._unexported = False
 
     def update(self, symbol: str, isin: str, dt: date):
         """
@@ -83,6 +192,8 @@ class SymbolTracker:
             ValueError: If conflicting mappings or unexpected history states
                 are encountered.
         """
+        self._index = None
+
         if isin in self.data["isin2hist"]:
             if symbol in self.data["sym2isin"]:
                 if self.data["sym2isin"][symbol] == isin:
@@ -90,6 +201,7 @@ class SymbolTracker:
 
                     if last["symbol"] == symbol:
                         last["to_date"] = dt
+                        self._extended.add(isin)
                     else:
                         raise ValueError(
                             f"Expected last entry for {isin} to be {symbol}: got {last['symbol']}"
@@ -100,6 +212,7 @@ class SymbolTracker:
                     )
 
             else:
+                self._dirty.add(isin)
                 self.data["sym2isin"][symbol] = isin
                 self.data["isin2hist"][isin].append(
                     SymbolHistory(
@@ -110,6 +223,7 @@ class SymbolTracker:
                     )
                 )
         else:
+            self._dirty.add(isin)
             self.data["isin2hist"][isin] = [
                 SymbolHistory(symbol=symbol, from_date=dt, to_date=dt, action=None)
             ]
@@ -166,6 +280,141 @@ class SymbolTracker:
             return None
         return self.data["isin2hist"].get(isin)
 
+    def symbol_on(self, isin: str, dt: date) -> Optional[str]:
+        """
+        Retrieves the symbol an ISIN traded as on a given date.
+
+        Args:
+            isin (str): The ISIN to query.
+            dt (date): The date of interest.
+
+        Returns:
+            Optional[str]: The symbol if the ISIN was listed on that date,
+                otherwise None.
+        """
+        entry = self._entry_on(isin, dt)
+        return None if entry is None else entry["symbol"]
+
+    def isin_on(self, symbol: str, dt: date) -> Optional[str]:
+        """
+        Retrieves the ISIN that traded under a symbol on a given date.
+
+        Args:
+            symbol (str): The trading symbol.
+            dt (date): The date of interest.
+
+        Returns:
+            Optional[str]: The ISIN if the symbol was in use on that date,
+                otherwise None.
+        """
+        isin = self.data["sym2isin"].get(symbol)
+
+        if isin is None or self.symbol_on(isin, dt) != symbol:
+            return None
+
+        return isin
+
+    def active_on(self, dt: date) -> List[str]:
+        """
+        Retrieves all ISINs listed on a given date.
+
+        Args:
+            dt (date): The date of interest.
+
+        Returns:
+            List[str]: ISINs whose history covers the date.
+        """
+        index = self._get_index()
+        day = np.datetime64(dt, "D")
+
+        # Entries starting after dt are excluded by a binary search.
+        # The remaining end dates are compared in a single array operation.
+        stop = np.searchsorted(index.starts, day, side="right")
+        mask = index.ends[:stop] >= day
+
+        return index.isins[:stop][mask].tolist()
+
+    def symbols_on(self, dt: date) -> Dict[str, str]:
+        """
+        Maps each ISIN listed on a given date to its symbol on that date.
+
+        Args:
+            dt (date): The date of interest.
+
+        Returns:
+            Dict[str, str]: ISIN to symbol.
+        """
+        result: Dict[str, str] = {}
+
+        for isin in self.active_on(dt):
+            symbol = self.symbol_on(isin, dt)
+
+            if symbol is not None:
+                result[isin] = symbol
+
+        return result
+
+    def current_names(self) -> Dict[str, str]:
+        """
+        Maps every symbol ever tracked to the latest symbol of its ISIN.
+
+        Loaders use this to stitch the history of a renamed company, stored
+        under its former symbols, under its current name.
+
+        Returns:
+            Dict[str, str]: Symbol to latest symbol. Current symbols map
+                to themselves.
+        """
+        return {
+            symbol: self.data["isin2hist"][isin][-1]["symbol"]
+            for symbol, isin in self.data["sym2isin"].items()
+            if self.data["isin2hist"].get(isin)
+        }
+
+    def _entry_on(self, isin: str, dt: date) -> Optional[SymbolHistory]:
+        hist = self.data["isin2hist"].get(isin)
+
+        if not hist:
+            return None
+
+        from_dates = self._get_index().from_dates[isin]
+
+        # Last entry starting on or before dt
+        i = bisect_right(from_dates, dt) - 1
+
+        if i < 0 or hist[i]["to_date"] < dt:
+            return None
+
+        return hist[i]
+
+    def _get_index(self) -> _IntervalIndex:
+        if self._index is not None:
+            return self._index
+
+        from_dates: Dict[str, List[date]] = {}
+        starts: List[date] = []
+        ends: List[date] = []
+        isins: List[str] = []
+
+        for isin, hist in self.data["isin2hist"].items():
+            from_dates[isin] = [entry["from_date"] for entry in hist]
+
+            for entry in hist:
+                starts.append(entry["from_date"])
+                ends.append(entry["to_date"])
+                isins.append(isin)
+
+        order = np.argsort(np.array(starts, dtype="datetime64[D]"), kind="stable")
+
+        self._index = _IntervalIndex(
+            from_dates=from_dates,
+            starts=np.array(starts, dtype="datetime64[D]")[order],
+            ends=np.array(ends, dtype="datetime64[D]")[order],
+            isins=np.array(isins, dtype=object)[order],
+        )
+
+        return self._index
+
     def to_json(self) -> str:
         """
         Serializes the current symbol-ISIN mapping data to a JSON string.
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Set
+
+import numpy as np
+
+
+class _CalendarArrays(NamedTuple):
+    holidays: np.ndarray
+    special_sessions: np.ndarray
+    years: np.ndarray
+
+
+def parse_date(value: str) -> date:
+    """Parse NSE (26-Jan-2024) or ISO format dates."""
+    try:
+        return datetime.strptime(value, "%d-%b-%Y").date()
+    except ValueError:
+        return date.fromisoformat(value[:10])
+
+
+class TradingCalendar:
+    """
+    NSE trading calendar stored as one JSON file per year, in
+    eod2_data/calendar/<year>.json
+
+    Each year has its holidays, special sessions (Muhurat and weekend
+    sessions) and whether the full NSE holiday list for the year has been
+    saved. Holidays and sessions from circulars may be added to any year.
+
+    Weekends are non-trading days, except special sessions. For years
+    without a full holiday list, queries use the holidays known so far.
+    """
+
+    # Monday to Friday
+    WEEKMASK = "1111100"
+
+    def __init__(self, folder: Path) -> None:
+        """
+        Args:
+            folder (Path): Folder with the per year JSON files. It need not
+                exist.
+        """
+        self.folder = folder
+        self.years: Dict[int, Dict] = {}
+        self._dirty: Set[int] = set()
+        self._arrays: Optional[_CalendarArrays] = None
+
+        if folder.is_dir():
+            for file in folder.glob("*.json"):
+                if file.stem.isdigit():
+                    self.years[int(file.stem)] = json.loads(file.read_bytes())
+
+    def _year(self, year: int) -> Dict:
+        if year not in self.years:
+            self.years[year] = dict(complete=False, holidays={}, special_sessions=[])
+
+        self._dirty.add(year)
+        self._arrays = None
+        return self.years[year]
+
+    def has_year(self, year: int) -> bool:
+        """Return True if the full NSE holiday list for year is saved."""
+        return year in self.years and self.years[year]["complete"]
+
+    def set_holidays(self, year: int, holidays: Dict[str, str]) -> None:
+        """
+        Replace the holidays of a year with the NSE holiday list.
+
+        Muhurat trading (Laxmi Pujan) is saved as a special session.
+
+        Args:
+            year (int): Year of the holiday list.
+            holidays (Dict[str, str]): Holiday date to description, as
+                returned by `getHolidayList`.
+        """
+        data = self._year(year)
+        data["complete"] = True
+        data["holidays"] = {}
+
+        for key, description in holidays.items():
+            dt = parse_date(key)
+
+            if "Laxmi Pujan" in description:
+                self.add_special_session(dt)
+            else:
+                self.add_holiday(dt, description)
+
+    def add_holiday(self, dt: date, description: str) -> bool:
+        """Add a holiday. Return True if it was not already known."""
+        holidays = self._year(dt.year)["holidays"]
+
+        if dt.isoformat() in holidays:
+            return False
+
+        holidays[dt.isoformat()] = description
+        return True
+
+    def add_special_session(self, dt: date) -> bool:
+        """Add a special session. Return True if it was not already known."""
+        sessions = self._year(dt.year)["special_sessions"]
+
+        if dt.isoformat() in sessions:
+            return False
+
+        sessions.append(dt.isoformat())
+        sessions.sort()
+        return True
+
+    def holiday(self, dt: date) -> Optional[str]:
+        """Return the holiday description for a date or None."""
+        if dt.year not in self.years:
+            return None
+
+        return self.years[dt.year]["holidays"].get(dt.isoformat())
+
+    def save(self) -> None:
+        """Write the years changed since the last save."""
+        if not self._dirty:
+            return
+
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+        for year in self._dirty:
+            (self.folder / f"{year}.json").write_text(
+                json.dumps(self.years[year], indent=2)
+            )
+
+        self._dirty.clear()
+
+    def _get_arrays(self) -> _CalendarArrays:
+        if self._arrays is None:
+            holidays = []
+            special_sessions = []
+
+            for data in self.years.values():
+                holidays.extend(data["holidays"])
+                special_sessions.extend(data["special_sessions"])
+
+            self._arrays = _CalendarArrays(
+                holidays=np.sort(np.array(holidays, dtype="datetime64[D]")),
+                special_sessions=np.sort(
+                    np.array(special_sessions, dtype="datetime64[D]")
+                ),
+                years=np.array(
+                    [y for y in self.years if self.has_year(y)], dtype=np.int64
+                ),
+            )
+
+        return self._arrays
+
+    def is_trading_day(self, dates) -> np.ndarray:
+        """
+        Check whether each date is a trading day.
+
+        Args:
+            dates: A date or array-like of dates.
+
+        Returns:
+            np.ndarray: Boolean array with the shape of dates.
+        """
+        arrays = self._get_arrays()
+        dates = np.asarray(dates, dtype="datetime64[D]")
+
+        return np.is_busday(
+            dates, weekmask=self.WEEKMASK, holidays=arrays.holidays
+        ) | np.isin(dates, arrays.special_sessions)
+
+    def next_trading_day(self, dates) -> np.ndarray:
+        """
+        Return the first trading day on or after each date.
+
+        The calendar is only followed through years with a full holiday
+        list. A date in any other year is returned as is, and a result that
+        falls in such a year is returned as its first day of the year.
+
+        Args:
+            dates: A date or array-like of dates.
+
+        Returns:
+            np.ndarray: datetime64[D] array with the shape of dates.
+        """
+        arrays = self._get_arrays()
+        dates = np.asarray(dates, dtype="datetime64[D]")
+
+        result = np.busday_offset(
+            dates, 0, roll="forward", weekmask=self.WEEKMASK, holidays=arrays.holidays
+        )
+
+        sessions = arrays.special_sessions
+
+        if sessions.size:
+            idx = np.searchsorted(sessions, dates)
+            session = sessions[np.minimum(idx, sessions.size - 1)]
+            result = np.where(
+                (idx < sessions.size) & (session < result), session, result
+            )
+
+        years = result.astype("datetime64[Y]")
+        known_date = np.isin(
+            dates.astype("datetime64[Y]").astype(np.int64) + 1970, arrays.years
+        )
+        known_result = np.isin(years.astype(np.int64) + 1970, arrays.years)
+
+        result = np.where(known_result, result, years.astype("datetime64[D]"))
+        return np.where(known_date, result, dates)
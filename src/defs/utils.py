@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import bisect
 import inspect
 import json
 import random
 import string
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, List, Literal, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from fast_csv_loader import csv_loader
 
@@ -20,6 +24,46 @@ ohlc_dct = dict(
 )
 
 
+# Stock series synced to the daily folder
+# https://www.nseindia.com/market-data/legend-of-series
+EQUITY_SERIES = ("EQ", "BE", "BZ", "SM", "ST")
+
+SME_SERIES = ("SM", "ST")
+
+# Columns of the daily stock and index files, after the Date index
+STOCK_COLUMNS = [
+    "Open",
+    "High",
+    "Low",
+    "Close",
+    "Volume",
+    "Series",
+    "TOTAL_TRADES",
+    "QTY_PER_TRADE",
+    "DLV_QTY",
+]
+
+INDEX_COLUMNS = [
+    "Open",
+    "High",
+    "Low",
+    "Close",
+    "Volume",
+    "P/E",
+    "Series",
+    "TOTAL_TRADES",
+    "QTY_PER_TRADE",
+    "DLV_QTY",
+]
+
+
+def adjust_ohlc(df: pd.DataFrame, adjustmentFactor: float) -> None:
+    """Adjust OHLC prices in place, rounded to the nearest 0.05"""
+    # nearest 0.05 = round(nu / 0.05) * 0.05
+    for col in ("Open", "High", "Low", "Close"):
+        df.loc[:, col] = ((df[col] / adjustmentFactor / 0.05).round() * 0.05).round(2)
+
+
 class DateEncoder(json.JSONEncoder):
     def default(self, o):
         if isinstance(o, datetime):
@@ -58,6 +102,33 @@ def has_parameters(func: Callable, *param_names: str) -> bool:
         return False
 
 
+class RateLimiter:
+    """
+    Thread safe limit on the rate of calls, spacing them evenly.
+
+    Call `wait` before each rate limited call.
+    """
+
+    def __init__(self, rps: float) -> None:
+        """
+        Args:
+            rps (float): Maximum calls per second
+        """
+        self.interval = 1 / rps
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        """Block until the next call is allowed"""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+
+        if delay > 0:
+            time.sleep(delay)
+
+
 def loadJson(fpath: Path):
     return json.loads(fpath.read_text(encoding="utf-8-sig"))
 
@@ -149,23 +220,22 @@ def getDeliveryLevels(df, config):
     df["IM_F"] = (df["TQ"] > 1.2) & (df["DQ"] > 1.2)
 
     # see https://github.com/matplotlib/mplfinance/blob/master/examples/marketcolor_overrides.ipynb
-    df["MCOverrides"] = None
-    df["IM"] = float("nan")
+    # Bands are checked in order, the first matching band sets the color.
+    # NaN values of DQ match no band and get the default color.
+    dq = df["DQ"]
 
-    for idx in df.index:
-        dq, im = df.loc[idx, ["DQ", "IM_F"]]
+    df["MCOverrides"] = np.select(
+        [dq >= config.DLV_L3, dq >= config.DLV_L2, dq > config.DLV_L1],
+        [
+            config.PLOT_DLV_L1_COLOR,
+            config.PLOT_DLV_L2_COLOR,
+            config.PLOT_DLV_L3_COLOR,
+        ],
+        default=config.PLOT_DLV_DEFAULT_COLOR,
+    ).astype(object)
 
-        if im:
-            df.loc[idx, "IM"] = df.loc[idx, "Low"] * 0.99
-
-        if dq >= config.DLV_L3:
-            df.loc[idx, "MCOverrides"] = config.PLOT_DLV_L1_COLOR
-        elif dq >= config.DLV_L2:
-            df.loc[idx, "MCOverrides"] = config.PLOT_DLV_L2_COLOR
-        elif dq > config.DLV_L1:
-            df.loc[idx, "MCOverrides"] = config.PLOT_DLV_L3_COLOR
-        else:
-            df.loc[idx, "MCOverrides"] = config.PLOT_DLV_DEFAULT_COLOR
+    # Institutional money marker, plotted just below the Low
+    df["IM"] = df["Low"].where(df["IM_F"]) * 0.99
 
 
 def isFarFromLevel(
@@ -181,6 +251,37 @@ def isFarFromLevel(
     return sum([abs(level - x[1]) < mean_candle_size for x in levels]) == 0
 
 
+def _searchMargin(level: float, threshold: float) -> float:
+    """Widen a search window by a few ULPs so float rounding in `level - threshold`
+    cannot exclude a value that `abs(level - x) < threshold` would accept.
+    """
+    return 4 * np.spacing(max(abs(level), abs(threshold)))
+
+
+class LevelIndex:
+    """Sorted index of accepted support and resistance levels.
+
+    Gives the same answer as isFarFromLevel, but only compares the level
+    against its nearest neighbours found by binary search, instead of every
+    accepted level.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.levels: List[float] = []
+
+    def isFar(self, level: float) -> bool:
+        margin = _searchMargin(level, self.threshold)
+
+        lo = bisect.bisect_left(self.levels, level - self.threshold - margin)
+        hi = bisect.bisect_right(self.levels, level + self.threshold + margin)
+
+        return not any(abs(level - x) < self.threshold for x in self.levels[lo:hi])
+
+    def add(self, level: float) -> None:
+        bisect.insort(self.levels, level)
+
+
 def getLevels(
     df: pd.DataFrame, mean_candle_size: float
 ) -> List[Tuple[Tuple[pd.DatetimeIndex, float], Tuple[pd.DatetimeIndex, float]]]:
@@ -199,7 +300,8 @@ def getLevels(
     Algorithm:
     - The function uses local maxima and minima in the 'High' and 'Low' prices to identify potential reversal points.
     - It filters for rejection from the top (local maxima) and from the bottom (local minima).
-    - To avoid clustering of support and resistance lines, it utilizes the isFarFromLevel function.
+    - To avoid clustering of support and resistance lines, it skips levels close to
+      an accepted level. See isFarFromLevel and LevelIndex.
     - Identified levels are returned as horizontal line segments for visualization.
 
     Example Usage:
@@ -213,6 +315,7 @@ def getLevels(
     - The function is designed for use in financial technical analysis.
     """
     levels = []
+    accepted = LevelIndex(mean_candle_size)
 
     # filter for rejection from top
     # 2 succesive highs followed by 2 succesive lower highs
@@ -237,13 +340,15 @@ def getLevels(
 
         # Prevent clustering of support and resistance lines
         # Only add a level if it at a distance from any other price lines
-        if isFarFromLevel(level, levels, mean_candle_size):
+        if accepted.isFar(level):
+            accepted.add(level)
             levels.append((idx, level))
 
     for idx in local_min.index:
         level = local_min[idx]
 
-        if isFarFromLevel(level, levels, mean_candle_size):
+        if accepted.isFar(level):
+            accepted.add(level)
             levels.append((idx, level))
 
     alines = []
@@ -261,6 +366,7 @@ def getLevels(
 def getLevels_v2(df: pd.DataFrame, mean_candle_size: float):
 
     levels = []
+    accepted = LevelIndex(mean_candle_size)
 
     highs_mask = (
         (df.High.shift(1) < df.High)
@@ -289,10 +395,19 @@ def getLevels_v2(df: pd.DataFrame, mean_candle_size: float):
 
     max_min = max_min.loc[~max_min.index.duplicated()]
 
+    # Count touches within mean_candle_size of each level, using a binary search
+    # on the sorted pivots in place of a scan over all pivots.
+    pivots = np.sort(max_min.to_numpy())
+
     for i, lv in max_min.items():
-        touch_count = max_min.loc[(max_min - lv).abs() < mean_candle_size].count()
+        margin = _searchMargin(lv, mean_candle_size)
+        lo = pivots.searchsorted(lv - mean_candle_size - margin, side="left")
+        hi = pivots.searchsorted(lv + mean_candle_size + margin, side="right")
+
+        touch_count = np.count_nonzero(np.abs(pivots[lo:hi] - lv) < mean_candle_size)
 
-        if touch_count > 1 and isFarFromLevel(lv, levels, mean_candle_size):
+        if touch_count > 1 and accepted.isFar(lv):
+            accepted.add(lv)
             levels.append((i, lv))
 
     return [((i, lv), (df.index[-1], lv)) for i, lv in levels]
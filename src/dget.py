@@ -6,6 +6,7 @@ from sys import platform
 from pandas import read_csv
 
 from defs.config import config
+from defs.symbol_index import SymbolIndex
 from defs.utils import loadJson, writeJson
 
 
@@ -36,10 +37,10 @@ class c:
 
 
 def lookup(sym):
-    fpath = DIR / "eod2_data" / "daily" / f"{sym}.csv"
+    fpath = symbols.resolve(sym)
 
-    if not fpath.exists():
-        exit(f"{sym}: File not found.")
+    if fpath is None:
+        exit(symbols.not_found_message(sym))
 
     df = read_csv(fpath, index_col="Date", parse_dates=True)
 
@@ -168,6 +169,7 @@ if args.watch:
 else:
     symList = args.sym
 
+symbols = SymbolIndex.load(DAILY)
 
 if args.lookup:
     lookup(args.lookup)
@@ -184,10 +186,10 @@ else:
     txt = ""
 
     for sym in symList:
-        fpath = DAILY / f"{sym.lower()}.csv"
+        fpath = symbols.resolve(sym)
 
-        if not fpath.exists():
-            print(f"Error: File not found: {fpath.name}")
+        if fpath is None:
+            print(f"Error: {symbols.not_found_message(sym)}")
             continue
 
         # Create Dataframe of last 30 days
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import atexit
 import logging
 import sys
 from argparse import ArgumentParser
@@ -8,196 +9,321 @@ from httpx import ConnectError
 from nse import NSE
 
 from defs import defs
+from defs.rebuild import rebuild
+from defs.report_archive import ReportArchive
+from defs.run_stats import load_runs, summarise
+from defs.symbol_index import SymbolIndex
 from defs.utils import writeJson
 
 logger = logging.getLogger(__name__)
 
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
-if not defs.is_version_compatible(NSE.__version__, major=3, minor=1, patch=2):
-    logger.warning("Require NSE version 3.1.*. Run `pip install 'nse[server]==3.1.2'`")
-    exit(1)
 
-data_version = defs.meta.get("data-version", None)
+def main() -> int:
+    if not defs.is_version_compatible(NSE.__version__, major=3, minor=1, patch=2):
+        logger.warning(
+            "Require NSE version 3.1.*. Run `pip install 'nse[server]==3.1.2'`"
+        )
+        return 1
 
-if data_version != defs.config.EXPECTED_DATA_VERSION:
-    if (defs.DIR.parent / ".git").exists():
-        update_url = "https://github.com/BennyThadikaran/eod2/wiki/Installation#updating-the-git-repo\n"
+    data_version = defs.meta.get("data-version", None)
 
-        exit(
-            f"Warning: eod2_data folder needs an update.\n\nFollow instructions at below link to update\n{update_url}"
-        )
-    else:
-        exit("Warning: eod2_data folder needs an update. Run `setup_data.py` to update")
+    if data_version != defs.config.EXPECTED_DATA_VERSION:
+        if (defs.DIR.parent / ".git").exists():
+            update_url = "https://github.com/BennyThadikaran/eod2/wiki/Installation#updating-the-git-repo\n"
 
-# Set the sys.excepthook to the custom exception handler
-sys.excepthook = defs.log_unhandled_exception
+            exit(
+                f"Warning: eod2_data folder needs an update.\n\nFollow instructions at below link to update\n{update_url}"
+            )
+        else:
+            exit(
+                "Warning: eod2_data folder needs an update. Run `setup_data.py` to update"
+            )
 
-parser = ArgumentParser(prog="init.py")
+    # Set the sys.excepthook to the custom exception handler
+    sys.excepthook = defs.log_unhandled_exception
 
-group = parser.add_mutually_exclusive_group()
+    parser = ArgumentParser(prog="init.py")
 
-group.add_argument(
-    "-v", "--version", action="store_true", help="Print the current version."
-)
+    group = parser.add_mutually_exclusive_group()
 
-group.add_argument(
-    "-c", "--config", action="store_true", help="Print the current config."
-)
+    group.add_argument(
+        "-v", "--version", action="store_true", help="Print the current version."
+    )
 
-args = parser.parse_args()
+    group.add_argument(
+        "-c", "--config", action="store_true", help="Print the current config."
+    )
 
-if args.version:
-    print(
-        f"EOD2 init.py: v{defs.config.VERSION} | eod2_data: v{defs.meta.get('data-version', None)}"
+    group.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Rebuild daily data from archived NSE reports into eod2_data/daily_rebuild. No network access.",
     )
-    exit(0)
 
-if args.config:
-    print(str(defs.config))
-    exit(0)
+    group.add_argument(
+        "--pack-archives",
+        action="store_true",
+        help="Compress uncompressed reports in nseBhav, nseDelivery and nseIndices into monthly zip files.",
+    )
 
-try:
-    nse = NSE(defs.DIR, server=True)
-except (TimeoutError, ConnectionError, ConnectError) as e:
-    logger.warning(f"Network error connecting to NSE - Please try again later. - {e!r}")
-    exit(1)
+    group.add_argument(
+        "--stats",
+        nargs="?",
+        const=10,
+        type=int,
+        metavar="N",
+        help="Summarise stage timings and counters of the last N syncs. Default: 10",
+    )
 
-if defs.check_special_sessions(nse):
-    writeJson(defs.META_FILE, defs.meta)
+    args = parser.parse_args()
 
-if defs.config.AMIBROKER and not defs.isAmiBrokerFolderUpdated():
-    defs.updateAmiBrokerRecords(nse)
+    if args.version:
+        print(
+            f"EOD2 init.py: v{defs.config.VERSION} | eod2_data: v{defs.meta.get('data-version', None)}"
+        )
+        return 0
 
-if "DLV_PENDING_DATES" not in defs.meta:
-    defs.meta["DLV_PENDING_DATES"] = []
+    if args.config:
+        print(str(defs.config))
+        return 0
 
-if len(defs.meta["DLV_PENDING_DATES"]):
-    pendingList = defs.meta["DLV_PENDING_DATES"].copy()
+    if args.pack_archives:
+        for folder in ("nseBhav", "nseDelivery", "nseIndices"):
+            count = ReportArchive(defs.DIR / folder).pack()
+            logger.info(f"{folder}: Packed {count} reports")
 
-    logger.info("Updating pending delivery reports.")
+        return 0
 
-    for dateStr in pendingList:
-        if defs.updatePendingDeliveryData(nse, dateStr):
-            writeJson(defs.META_FILE, defs.meta)
+    if args.rebuild:
+        folder = defs.DIR / "eod2_data" / "daily_rebuild"
+
+        try:
+            stats = rebuild(defs.DIR, folder, defs.ADJUSTMENTS_FILE)
+        except FileExistsError as e:
+            logger.warning(f"{e}. Remove it and try again.")
+            return 1
+
+        logger.info(
+            f"Rebuilt {stats['files']} files from {stats['dates']} dates with {stats['adjustments']} adjustments.\n"
+            f"Replace eod2_data/daily with {folder} after review."
+        )
+        return 0
 
-while True:
-    if not defs.dates.nextDate():
-        nse.exit()
-        exit(0)
+    if args.stats is not None:
+        if args.stats < 1:
+            parser.error("--stats: N must be at least 1")
 
-    if defs.checkForHolidays(nse, defs.dates):
-        defs.meta["lastUpdate"] = defs.dates.lastUpdate = defs.dates.dt
+        print(summarise(load_runs(defs.RUN_LOG_FILE, args.stats)))
+        return 0
+
+    # Record the run, however it exits
+    atexit.register(defs.stats.save, defs.RUN_LOG_FILE)
+
+    if defs.migrateCalendarMeta():
         writeJson(defs.META_FILE, defs.meta)
-        continue
 
-    # Validate NSE actions file
-    defs.validateNseActionsFile(nse)
+    try:
+        nse = NSE(defs.DIR, server=True)
+    except (TimeoutError, ConnectionError, ConnectError) as e:
+        logger.warning(
+            f"Network error connecting to NSE - Please try again later. - {e!r}"
+        )
+        return 1
 
-    # Download all files and validate for errors
-    logger.info("Downloading Files")
+    with defs.stats.stage("special_sessions"):
+        if defs.check_special_sessions(nse):
+            writeJson(defs.META_FILE, defs.meta)
 
-    report_status = None
+    if defs.config.AMIBROKER and not defs.isAmiBrokerFolderUpdated():
+        with defs.stats.stage("amibroker_setup"):
+            defs.updateAmiBrokerRecords(nse)
 
-    if defs.dates.dt.date() == defs.dates.today.date():
-        report_status = defs.check_reports_update_status(nse)
+    if "DLV_PENDING_DATES" not in defs.meta:
+        defs.meta["DLV_PENDING_DATES"] = []
 
-        required_reports = {
-            "CM-UDIFF-BHAVCOPY-CSV": "Equity Bhavcopy not yet updated.",
-            "INDEX-SNAPSHOT": "Indices report not yet updated.",
-            "CM-BHAVDATA-FULL": "Delivery Report Unavailable. Will retry in subsequent sync",
-        }
+    if len(defs.meta["DLV_PENDING_DATES"]):
+        pendingList = defs.meta["DLV_PENDING_DATES"].copy()
 
-        for key, msg in required_reports.items():
-            if not report_status.get(key):
-                logger.warning(msg)
+        logger.info("Updating pending delivery reports.")
 
-                if key != "CM-BHAVDATA-FULL":
-                    nse.exit()
-                    exit(1)
+        with defs.stats.stage("pending_delivery"):
+            for dateStr in pendingList:
+                if defs.updatePendingDeliveryData(nse, dateStr):
+                    writeJson(defs.META_FILE, defs.meta)
 
-    try:
-        # NSE bhav copy
-        BHAV_FILE = nse.equityBhavcopy(defs.dates.dt)
-
-        # Index file
-        INDEX_FILE = nse.indicesBhavcopy(defs.dates.dt)
-    except (RuntimeError, Exception) as e:
-        if defs.dates.dt.weekday() == 5:
-            if defs.dates.dt != defs.dates.today:
-                logger.info(f"{defs.dates.dt:%a, %d %b %Y}: Market Closed\n{'-' * 52}")
-
-                # On Error, dont exit on Saturdays, if trying to sync past dates
-                continue
-
-            # If NSE is closed and report unavailable, inform user
-            logger.info(
-                "Market is closed on Saturdays. If open, check availability on NSE"
-            )
+            defs.manifest.update(defs.DAILY_FOLDER)
+            defs.manifest.save()
+
+    # Dates committed in this run
+    synced = 0
+
+    while True:
+        if not defs.dates.nextDate():
+            # Publish the symbol history in isin_symbol_map.json
+            defs.tracker.export()
 
-        # On daily sync exit on error
-        nse.exit()
-        logger.warning(e)
-        exit(1)
+            # Once per run, not per date. A stale index is also rebuilt on load.
+            if synced:
+                with defs.stats.stage("symbol_index"):
+                    SymbolIndex.refresh(defs.DAILY_FOLDER)
+
+            nse.exit()
+            defs.stats.status = "ok"
+            return 0
+
+        with defs.stats.stage("holidays", defs.dates.dt):
+            isHoliday = defs.checkForHolidays(nse, defs.dates)
+
+        if isHoliday:
+            defs.meta["lastUpdate"] = defs.dates.lastUpdate = defs.dates.dt
+            writeJson(defs.META_FILE, defs.meta)
+            continue
+
+        # Validate NSE actions file
+        with defs.stats.stage("validate_actions", defs.dates.dt):
+            defs.validateNseActionsFile(nse)
+
+        # Download all files and validate for errors
+        logger.info("Downloading Files")
+
+        report_status = None
+
+        # Reports cached by a failed sync of this date are reused
+        cached = all(
+            defs.downloads.get(kind, defs.dates.dt) for kind in ("equity", "indices")
+        )
+
+        if defs.dates.dt.date() == defs.dates.today.date() and not cached:
+            with defs.stats.stage("report_status", defs.dates.dt):
+                report_status = defs.check_reports_update_status(nse)
+
+            required_reports = {
+                "CM-UDIFF-BHAVCOPY-CSV": "Equity Bhavcopy not yet updated.",
+                "INDEX-SNAPSHOT": "Indices report not yet updated.",
+                "CM-BHAVDATA-FULL": "Delivery Report Unavailable. Will retry in subsequent sync",
+            }
+
+            for key, msg in required_reports.items():
+                if not report_status.get(key):
+                    logger.warning(msg)
+
+                    if key != "CM-BHAVDATA-FULL":
+                        nse.exit()
+                        return 1
 
-    if report_status is None or report_status["CM-BHAVDATA-FULL"]:
         try:
-            # NSE delivery
-            DELIVERY_FILE = nse.deliveryBhavcopy(defs.dates.dt)
-        except (RuntimeError, Exception):
-            defs.meta["DLV_PENDING_DATES"].append(defs.dates.dt.isoformat())
+            with defs.stats.stage("download", defs.dates.dt):
+                # NSE bhav copy
+                BHAV_FILE = defs.downloads.fetch(
+                    "equity", defs.dates.dt, lambda: nse.equityBhavcopy(defs.dates.dt)
+                )
+
+                # Index file
+                INDEX_FILE = defs.downloads.fetch(
+                    "indices", defs.dates.dt, lambda: nse.indicesBhavcopy(defs.dates.dt)
+                )
+        except (RuntimeError, Exception) as e:
+            if defs.dates.dt.weekday() == 5:
+                if defs.dates.dt != defs.dates.today:
+                    logger.info(
+                        f"{defs.dates.dt:%a, %d %b %Y}: Market Closed\n{'-' * 52}"
+                    )
+
+                    # On Error, dont exit on Saturdays, if trying to sync past dates
+                    continue
+
+                # If NSE is closed and report unavailable, inform user
+                logger.info(
+                    "Market is closed on Saturdays. If open, check availability on NSE"
+                )
+
+            # On daily sync exit on error
+            nse.exit()
+            logger.warning(e)
+            return 1
+
+        if report_status is None or report_status["CM-BHAVDATA-FULL"]:
+            try:
+                # NSE delivery
+                with defs.stats.stage("download", defs.dates.dt):
+                    DELIVERY_FILE = defs.downloads.fetch(
+                        "delivery",
+                        defs.dates.dt,
+                        lambda: nse.deliveryBhavcopy(defs.dates.dt),
+                    )
+            except (RuntimeError, Exception):
+                defs.meta["DLV_PENDING_DATES"].append(defs.dates.dt.isoformat())
+                DELIVERY_FILE = None
+                logger.warning(
+                    "Delivery Report Unavailable. Will retry in subsequent sync"
+                )
+
+        else:
             DELIVERY_FILE = None
-            logger.warning("Delivery Report Unavailable. Will retry in subsequent sync")
+            defs.meta["DLV_PENDING_DATES"].append(defs.dates.dt.isoformat())
 
-    else:
-        DELIVERY_FILE = None
-        defs.meta["DLV_PENDING_DATES"].append(defs.dates.dt.isoformat())
+        try:
+            with defs.stats.stage("update_eod", defs.dates.dt):
+                defs.updateNseEOD(BHAV_FILE, DELIVERY_FILE)
+
+            # INDEX sync
+            with defs.stats.stage("update_index", defs.dates.dt):
+                defs.updateIndexEOD(INDEX_FILE)
+        except Exception as e:
+            # rollback
+            logger.exception("Error during data sync.", exc_info=e)
+            defs.rollback(defs.DAILY_FOLDER)
+
+            defs.meta["lastUpdate"] = defs.dates.lastUpdate
+            writeJson(defs.META_FILE, defs.meta)
+            nse.exit()
+            return 1
 
-    try:
-        defs.updateNseEOD(BHAV_FILE, DELIVERY_FILE)
+        # No errors continue
 
-        # INDEX sync
-        defs.updateIndexEOD(INDEX_FILE)
-    except Exception as e:
-        # rollback
-        logger.exception("Error during data sync.", exc_info=e)
-        defs.rollback(defs.DAILY_FOLDER)
-        defs.cleanup((BHAV_FILE, DELIVERY_FILE, INDEX_FILE))
+        # Adjust Splits and bonus
+        try:
+            with defs.stats.stage("adjustments", defs.dates.dt):
+                defs.adjustNseStocks()
+        except Exception as e:
+            logger.exception(
+                "Error while making adjustments.\nAll adjustments have been discarded.",
+                exc_info=e,
+            )
 
-        defs.meta["lastUpdate"] = defs.dates.lastUpdate
-        writeJson(defs.META_FILE, defs.meta)
-        nse.exit()
-        exit(1)
+            defs.rollback(defs.DAILY_FOLDER)
 
-    # No errors continue
+            defs.meta["lastUpdate"] = defs.dates.lastUpdate
+            writeJson(defs.META_FILE, defs.meta)
+            nse.exit()
+            return 1
 
-    # Adjust Splits and bonus
-    try:
-        defs.adjustNseStocks()
-    except Exception as e:
-        logger.exception(
-            "Error while making adjustments.\nAll adjustments have been discarded.",
-            exc_info=e,
-        )
+        if defs.hook and hasattr(defs.hook, "on_complete"):
+            with defs.stats.stage("hook_complete", defs.dates.dt):
+                defs.hook.on_complete()
 
-        defs.rollback(defs.DAILY_FOLDER)
-        defs.cleanup((BHAV_FILE, DELIVERY_FILE, INDEX_FILE))
+        if defs.dates.today == defs.dates.dt:
+            with defs.stats.stage("clean_outdated", defs.dates.dt):
+                defs.cleanOutDated()
 
-        defs.meta["lastUpdate"] = defs.dates.lastUpdate
-        writeJson(defs.META_FILE, defs.meta)
-        nse.exit()
-        exit(1)
+        with defs.stats.stage("commit", defs.dates.dt):
+            defs.meta["lastUpdate"] = defs.dates.lastUpdate = defs.dates.dt
+            writeJson(defs.META_FILE, defs.meta)
+
+            # Reports are removed only after the sync is committed
+            for kind in ("equity", "indices", "delivery"):
+                defs.downloads.discard(kind, defs.dates.dt)
 
-    if defs.hook and hasattr(defs.hook, "on_complete"):
-        defs.hook.on_complete()
+            defs.tracker.save()
+            defs.manifest.update(defs.DAILY_FOLDER)
+            defs.manifest.save()
 
-    defs.cleanup((BHAV_FILE, DELIVERY_FILE, INDEX_FILE))
+        synced += 1
 
-    if defs.dates.today == defs.dates.dt:
-        defs.cleanOutDated()
+        logger.info(f"{defs.dates.dt:%d %b %Y}: Done\n{'-' * 52}")
 
-    defs.meta["lastUpdate"] = defs.dates.lastUpdate = defs.dates.dt
-    writeJson(defs.META_FILE, defs.meta)
-    defs.ISIN_SYMBOL_MAP_FILE.write_text(defs.tracker.to_json())
 
-    logger.info(f"{defs.dates.dt:%d %b %Y}: Done\n{'-' * 52}")
+if __name__ == "__main__":
+    exit(main())
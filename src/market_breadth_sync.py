@@ -11,6 +11,7 @@ from nse import NSE
 
 from defs.dates import Dates
 from defs.defs import checkForHolidays
+from defs.symbol_index import SymbolIndex
 from defs.utils import getDataFrame, writeJson
 
 
@@ -21,9 +22,9 @@ def ema(price, period, prev_ema):
 
 
 def load_symbol(sym) -> Optional[pd.DataFrame]:
-    file = DAILY / f"{sym.lower()}.csv"
+    file = symbols.resolve(sym)
 
-    if not file.exists():
+    if file is None:
         print(f"{sym} not found")
         return None
 
@@ -112,6 +113,8 @@ priority = dict(EQ=1, BE=2, BZ=3)
 slow_ema_len = 39
 fast_ema_len = 19
 
+symbols = SymbolIndex.load(DAILY)
+
 mb_df = pd.read_csv(MARKET_TRACKER_FILE, index_col="Date", parse_dates=["Date"])
 
 prev_net_new_high, prev_ad_line, prev_fast_ema, prev_slow_ema = mb_df.loc[
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass
-from typing import Any, Literal, cast
+from typing import Any, Callable, Literal, cast
 
 import numpy as np
 import pandas as pd
@@ -28,6 +28,37 @@ class Drawing:
     url: str
 
 
+class DrawingCollection(LineCollection):
+    """Several drawings of one kind and colour drawn as a single artist.
+
+    Each segment belongs to the drawing at the same position in `urls`.
+    """
+
+    def __init__(self, segments, urls: list[str], **kwargs) -> None:
+        super().__init__(segments, **kwargs)
+        self.urls: list[str] = list(urls)
+
+    def url_at(self, ind) -> str | None:
+        """Return the url of the first segment index in a pick event."""
+        if ind is None or len(ind) == 0:
+            return None
+
+        return self.urls[int(ind[0])]
+
+    def remove_url(self, url: str) -> None:
+        """Remove the segment of a drawing, or the artist if none remain."""
+        i = self.urls.index(url)
+        del self.urls[i]
+
+        if not self.urls:
+            self.remove()
+            return
+
+        segments = self.get_segments()
+        del segments[i]
+        self.set_segments(segments)
+
+
 class BlitPreview:
     """Fast preview renderer for interactive drawing."""
 
@@ -358,13 +389,27 @@ class DrawingTool:
 class DrawingManager:
     """Stores, retrieves, and persists user drawings."""
 
-    def __init__(self, timeframe: Timeframe) -> None:
+    def __init__(
+        self,
+        timeframe: Timeframe,
+        loader: Callable[[str], dict[str, Any]] | None = None,
+    ) -> None:
+        """
+        Args:
+            timeframe: Chart timeframe
+            loader: Returns stored drawings of a symbol, shaped as
+                url -> Drawing dict. Called once per symbol on first access.
+        """
         self._timeframe = timeframe
         self._magnet_mode: bool = config.MAGNET_MODE
         self._ax: Axes | None = None
+        self._loader = loader
         self._drawings: dict[str, dict[str, Drawing]] = {}
         self._artists: dict[str, dict[str, Artist]] = {}  # Track matplotlib artists
 
+        # Symbols with changes not yet persisted
+        self._dirty: set[str] = set()
+
         self.line_args = dict(
             linewidth=1,
             mouseover=True,
@@ -400,6 +445,11 @@ class DrawingManager:
         self._artists.setdefault(symbol, {})
 
         for artist in artists:
+            if isinstance(artist, DrawingCollection):
+                for url in artist.urls:
+                    self._artists[symbol][url] = artist
+                continue
+
             url = artist.get_url()
 
             if url:
@@ -408,8 +458,16 @@ class DrawingManager:
     def set_index(self, index: pd.DatetimeIndex):
         self._index = index
 
+    def _load(self, symbol: str) -> None:
+        """Deserialize stored drawings of a symbol on first access."""
+        if self._loader is None or symbol in self._drawings:
+            return
+
+        self._drawings[symbol] = self._from_url_map(self._loader(symbol))
+
     def get(self, symbol: str) -> dict[str, Drawing]:
         """Get all drawings for a symbol."""
+        self._load(symbol)
         return self._drawings.get(symbol, {})
 
     def add(self, symbol: str, drawing: Drawing) -> None:
@@ -419,11 +477,13 @@ class DrawingManager:
             symbol: Stock symbol or indicator name
             drawing: Drawing to add
         """
+        self._load(symbol)
         self._drawings.setdefault(symbol, {})
         self._artists.setdefault(symbol, {})
 
         url = drawing.url
         self._drawings[symbol][url] = drawing
+        self._dirty.add(symbol)
 
         # Immediately draw on the axes if available
         if self._ax is not None:
@@ -433,21 +493,34 @@ class DrawingManager:
                 self._artists[symbol][url] = artist
                 self._ax.figure.canvas.draw_idle()
 
-    def remove(self, symbol: str, artist: Artist) -> bool:
-        """Remove a specific drawing and its artist from the chart."""
+    def remove(self, symbol: str, artist: Artist, ind=None) -> bool:
+        """Remove a specific drawing and its artist from the chart.
+
+        Args:
+            symbol: Stock symbol or indicator name
+            artist: Picked artist
+            ind: Segment indices from the pick event, for grouped drawings
+        """
         if symbol not in self._drawings:
             return False
 
-        url = artist.get_url()
+        if isinstance(artist, DrawingCollection):
+            url = artist.url_at(ind)
+        else:
+            url = artist.get_url()
 
         if not url:
             raise ValueError("No url attached to artist")
 
-        artist.remove()
+        if isinstance(artist, DrawingCollection):
+            artist.remove_url(url)
+        else:
+            artist.remove()
 
         self._artists[symbol].pop(url)
 
         self._drawings[symbol].pop(url)
+        self._dirty.add(symbol)
 
         if self._ax is not None:
             self._ax.figure.canvas.draw_idle()
@@ -460,12 +533,17 @@ class DrawingManager:
         if symbol not in self._artists:
             return
 
-        for artist in self._artists[symbol].values():
+        # Grouped drawings share one artist
+        unique = {id(artist): artist for artist in self._artists[symbol].values()}
+
+        for artist in unique.values():
             artist.remove()
 
         del self._artists[symbol]
 
-        del self._drawings[symbol]
+        # Keep an empty entry so the stored drawings are not loaded again
+        self._drawings[symbol] = {}
+        self._dirty.add(symbol)
 
         if self._ax is not None:
             self._ax.figure.canvas.draw_idle()
@@ -562,6 +640,20 @@ class DrawingManager:
             for sym, url_map in self._drawings.items()
         }
 
+    def pop_dirty(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Serialize symbols changed since the last call and mark them saved.
+
+        Shape:
+            symbol -> url -> Drawing dict
+        """
+        data = {
+            sym: {url: asdict(d) for url, d in self._drawings.get(sym, {}).items()}
+            for sym in self._dirty
+        }
+
+        self._dirty.clear()
+        return data
+
     def from_dict(self, data: dict[str, dict[str, Any]]) -> None:
         """Restore drawings for the current timeframe.
 
@@ -570,17 +662,21 @@ class DrawingManager:
         """
         self._drawings.clear()
         self._artists.clear()
+        self._dirty.clear()
 
         for sym, url_map in data.items():
-            self._drawings[sym] = {}
+            self._drawings[sym] = self._from_url_map(url_map)
             self._artists[sym] = {}
 
-            for url, d in url_map.items():
-                if not d:
-                    continue
-                self._drawings[sym][url] = Drawing(
-                    kind=d["kind"],
-                    points=[tuple(p) for p in d["points"]],
-                    color=d["color"],
-                    url=d["url"],
-                )
+    @staticmethod
+    def _from_url_map(url_map: dict[str, Any]) -> dict[str, Drawing]:
+        return {
+            url: Drawing(
+                kind=d["kind"],
+                points=[tuple(p) for p in d["points"]],
+                color=d["color"],
+                url=d["url"],
+            )
+            for url, d in url_map.items()
+            if d
+        }
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from pathlib import Path
-from typing import cast
+from typing import TYPE_CHECKING, Iterator, cast
 
 import matplotlib as mpl
 import pandas as pd
@@ -11,6 +12,10 @@ from defs.config import config
 from .breadth_render import BREADTH_INDICATORS, BreadthRenderer
 from .candle_render import CandlestickRenderer
 from .dtypes import TF_MAP, BreadthOption, PlotCommand, RenderContext
+from .shared import SharedFrame, SharedSeries
+
+if TYPE_CHECKING:
+    from .plugins.profiler import PluginSample
 
 
 class NoDataError(RuntimeError):
@@ -24,7 +29,33 @@ def worker(
     is_stock_mode: bool,
     plot_args: dict,
     context: RenderContext,
-) -> bool:
+) -> list[PluginSample]:
+    """Render and save one chart.
+
+    Returns plugin profiler samples collected in this call, if profiling.
+    """
+    profiler = context.plugin_runner.profiler if context.plugin_runner else None
+
+    # The context is pickled with the samples already merged in the parent
+    first_sample = len(profiler.samples) if profiler else 0
+
+    try:
+        _render(symbol, cmd, save_dir, is_stock_mode, plot_args, context)
+    finally:
+        if profiler:
+            profiler.stop()
+
+    return profiler.samples[first_sample:] if profiler else []
+
+
+def _render(
+    symbol: str,
+    cmd: PlotCommand,
+    save_dir: Path,
+    is_stock_mode: bool,
+    plot_args: dict,
+    context: RenderContext,
+) -> None:
     file = save_dir / f"{symbol.replace(' ', '-')}.png"
 
     if is_stock_mode:
@@ -37,13 +68,13 @@ def worker(
             raise NoDataError(f"No data for {symbol}")
 
         # Enrich with indicators
-        df = context.indicator_pipeline.enrich(df)
+        df = context.indicator_pipeline.enrich(symbol, df, visited=True)
 
         data_len = len(df)
         period = min(data_len, cmd.period)
 
         if context.plugin_runner:
-            context.plugin_runner.apply(df, plot_args, period)
+            context.plugin_runner.apply(df, plot_args, period, symbol=symbol)
         df = df[-period:]
         df = cast(pd.DataFrame, df)
 
@@ -79,7 +110,6 @@ def worker(
         context.renderer.overlay_drawings(axs[0], drawings, df)
 
     fig.savefig(file, format="png")
-    return True
 
 
 class BatchRender:
@@ -114,6 +144,43 @@ class BatchRender:
 
         mpl.use("Agg")
 
+    @contextmanager
+    def _shared_reference_data(self) -> Iterator[None]:
+        """Move read-only data used by every task into shared memory.
+
+        Tasks then pickle a small handle instead of a copy of the data.
+        On exit, the context gets back the original objects and the memory
+        blocks are freed, so the context stays usable in this process.
+        """
+        shared: list[SharedFrame] = []
+        pipeline = self.context.indicator_pipeline
+        loader = self.context.loader
+
+        index_close = None if pipeline is None else pipeline.index_close
+        breadth_df = None
+
+        if pipeline is not None and index_close is not None:
+            shared_close = SharedSeries(index_close)
+            pipeline.set_index_close(shared_close)
+            shared.append(shared_close)
+
+        if self.cmd.source.mode == "breadth":
+            breadth_df = loader.load_breadth_indicators()
+            loader.breadth_df = SharedFrame(breadth_df)
+            shared.append(loader.breadth_df)
+
+        try:
+            yield
+        finally:
+            if pipeline is not None and index_close is not None:
+                pipeline.set_index_close(index_close)
+
+            if breadth_df is not None:
+                loader.breadth_df = breadth_df
+
+            for block in shared:
+                block.unlink()
+
     def save_all(self):
         import traceback
         from concurrent.futures import ProcessPoolExecutor, as_completed
@@ -121,7 +188,10 @@ class BatchRender:
         futures = {}
         plot_args = self.plot_args.copy()
 
-        with ProcessPoolExecutor() as executor:
+        runner = self.context.plugin_runner
+        profiler = runner.profiler if runner else None
+
+        with self._shared_reference_data(), ProcessPoolExecutor() as executor:
             for sym in self.sym_list:
                 symbol, _, meta = sym.partition(",")
 
@@ -155,8 +225,11 @@ class BatchRender:
                 print(f"{count} of {length}", end="\r", flush=True)
 
                 try:
-                    future.result()
+                    samples = future.result()
                 except NoDataError as e:
                     print(f"{sym}: {e}")
                 except Exception:
                     traceback.print_exc()
+                else:
+                    if profiler:
+                        profiler.extend(samples)
@@ -8,7 +8,7 @@ from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 
 from .dtypes import BreadthIndicator, BreadthOption
-from .util import debounce, setup_xaxis
+from .util import bar_labels, setup_xaxis
 
 BREADTH_INDICATORS = {
     "sma": BreadthIndicator(
@@ -135,14 +135,7 @@ class BreadthRenderer:
         return fig, [ax1, ax2]
 
     def _make_format_coords(self, df: pd.DataFrame, symbol):
-        """Create a debounced format_coords function."""
-        data = df.to_numpy()
-        index = df.index
-        n = len(df)
-        separator = " " * 5
-
-        close_idx = df.columns.get_loc("Close")
-
+        """Create a format_coords function from precomputed bar labels."""
         breadth_config = {
             "sma": (("PCT_50", "PCT_200"), (">50MA", ">200MA")),
             "50": (("PCT_50",), (">50MA",)),
@@ -152,30 +145,21 @@ class BreadthRenderer:
             "osc": (("MCCLELLAN_OSC",), ("MCCLELLAN_OSC",)),
         }
 
-        columns, labels = breadth_config[symbol]
+        columns, names = breadth_config[symbol]
 
-        column_indices = [df.columns.get_loc(col) for col in columns]
+        fields = [("Close", "Index", ".2f")]
+        fields.extend((col, name, ".2f") for col, name in zip(columns, names))
+
+        separator = " " * 5
+        labels = bar_labels(df, fields, separator)
+        n = len(labels)
 
-        @debounce(interval=0.025)
         def format_coords(x: float, y: float) -> str:
             i = round(x)
 
             if not 0 <= i < n:
                 return ""
 
-            row = data[i]
-
-            parts = [
-                f"{index[i]:%d %b %Y}".upper(),
-                f"Index: {row[close_idx]:.2f}",
-                f"{labels[0]}: {row[column_indices[0]]:.2f}",
-            ]
-
-            if len(column_indices) == 2:
-                parts.append(f"{labels[1]}: {row[column_indices[1]]:.2f}")
-
-            parts.append(f"Y: {y:.2f}")
-
-            return separator.join(parts)
+            return f"{labels[i]}{separator}Y: {y:.2f}"
 
         return format_coords
@@ -1,19 +1,19 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, cast
 
 import mplfinance as mpf
+import numpy as np
 import pandas as pd
 from matplotlib.artist import Artist
 from matplotlib.axes import Axes
-from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
 
 from defs.config import config
 from renderer.dtypes import PanelAssignment
 
-from .annotations import Drawing
-from .util import debounce, setup_xaxis
+from .annotations import Drawing, DrawingCollection
+from .util import bar_labels, iso_to_positions, setup_xaxis
 
 
 class CandlestickRenderer:
@@ -146,184 +146,154 @@ class CandlestickRenderer:
         drawings: dict[str, Drawing],
         df: pd.DataFrame,
     ) -> list[Artist]:
-        """Overlay all drawings on the chart."""
-        artists = []
+        """Overlay all drawings on the chart.
 
-        if df.empty:
-            return artists
+        Drawing dates are mapped to bar positions in one searchsorted call.
+        Horizontal lines, segments and polylines of the same colour are
+        drawn as one DrawingCollection. Trend lines extend infinitely and
+        are drawn individually.
+        """
+        artists: list[Artist] = []
 
-        index_start = df.index[0]
-        index_end = df.index[-1]
+        if df.empty or not drawings:
+            return artists
 
+        n = len(df)
         visible_low = df["Low"].min()
         visible_high = df["High"].max()
 
-        def x_to_index_if_visible(x) -> int | None:
-            x = pd.Timestamp(x)
+        # Flatten all points into arrays
+        counts = np.fromiter(
+            (len(d.points) for d in drawings.values()),
+            dtype=np.intp,
+            count=len(drawings),
+        )
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
 
-            if not index_start <= x <= index_end:
-                return None
+        dates = [x for d in drawings.values() for x, _ in d.points]
+        ys = np.fromiter(
+            (y for d in drawings.values() for _, y in d.points),
+            dtype=np.float64,
+            count=len(dates),
+        )
 
-            x = df.index.get_loc(x)
+        # axhline has no date and an hline end date of -1 extends the
+        # line to the last bar
+        is_iso = np.fromiter(
+            (isinstance(x, str) and x != "" for x in dates),
+            dtype=bool,
+            count=len(dates),
+        )
 
-            return x if isinstance(x, int) else None
+        positions = np.full(len(dates), -1, dtype=np.intp)
 
-        def price_in_visible_range(y) -> bool:
-            return visible_low <= y <= visible_high
+        if is_iso.any():
+            positions[is_iso] = iso_to_positions(
+                [x for x, iso in zip(dates, is_iso) if iso],
+                cast(pd.DatetimeIndex, df.index),
+            )
 
-        for url, drawing in drawings.items():
-            if drawing.kind == "axhline":
-                _, y = drawing.points[0]
+        y_visible = (ys >= visible_low) & (ys <= visible_high)
 
-                if not price_in_visible_range(y):
-                    continue
+        groups: dict[tuple[str, str], tuple[list, list[str]]] = {}
 
-                artists.append(
-                    ax.axhline(
-                        y,
-                        color=drawing.color,
-                        url=url,
-                        linewidth=1,
-                        pickradius=3,
-                        picker=True,
-                    )
-                )
-
-            elif drawing.kind == "hline":
-                (x1, y), (x2, _) = drawing.points
+        for i, (url, drawing) in enumerate(drawings.items()):
+            kind = drawing.kind
+            if counts[i] == 0:
+                continue
 
-                if not price_in_visible_range(y):
-                    continue
+            start = starts[i]
+            stop = start + counts[i]
+            pos = positions[start:stop]
 
-                x1 = x_to_index_if_visible(x1)
-                if x1 is None:
+            if kind == "axhline":
+                if not y_visible[start]:
                     continue
 
-                if x2 == -1:
-                    x2 = len(df) - 1
-                else:
-                    x2 = x_to_index_if_visible(x2)
-                    if x2 is None:
-                        continue
-
-                artists.append(
-                    ax.hlines(
-                        y,
-                        x1,
-                        x2,
-                        color=drawing.color,
-                        url=url,
-                        linewidth=1,
-                        pickradius=3,
-                        picker=True,
-                    )
-                )
+                segment = [(0, ys[start]), (1, ys[start])]
 
-            elif drawing.kind == "tline":
-                if len(drawing.points) < 2:
+            elif kind == "hline":
+                if counts[i] < 2 or not y_visible[start] or pos[0] < 0:
                     continue
 
-                (x1, y1), (x2, y2) = drawing.points
-
-                x1 = x_to_index_if_visible(x1)
-                x2 = x_to_index_if_visible(x2)
+                x2 = n - 1 if dates[start + 1] == -1 else pos[1]
 
-                if x1 is None or x2 is None:
+                if x2 < 0:
                     continue
 
-                artists.append(
-                    ax.axline(
-                        (x1, y1),
-                        (x2, y2),
-                        url=url,
-                        color=drawing.color,
-                        linewidth=1,
-                        pickradius=3,
-                        picker=True,
-                    )
-                )
+                segment = [(pos[0], ys[start]), (x2, ys[start])]
 
-            elif drawing.kind == "aline":
-                if len(drawing.points) < 2:
+            elif kind in ("tline", "aline"):
+                if counts[i] < 2 or pos.min() < 0:
                     continue
 
-                points = []
-
-                for x, y in drawing.points:
-                    x = x_to_index_if_visible(x)
-
-                    if x is None:
-                        points = None
-                        break
-
-                    points.append((x, y))
-
-                if points is None:
+                segment = list(zip(pos, ys[start:stop]))
+
+                if kind == "tline":
+                    artists.append(
+                        ax.axline(
+                            *segment[:2],
+                            url=url,
+                            color=drawing.color,
+                            linewidth=1,
+                            pickradius=3,
+                            picker=True,
+                        )
+                    )
                     continue
+            else:
+                continue
+
+            segments, group_urls = groups.setdefault((kind, drawing.color), ([], []))
+            segments.append(segment)
+            group_urls.append(url)
+
+        for (kind, color), (segments, group_urls) in groups.items():
+            collection = DrawingCollection(
+                segments,
+                urls=group_urls,
+                colors=[color],
+                linewidths=1,
+                pickradius=3,
+                picker=True,
+            )
 
-                line = LineCollection(
-                    [points],
-                    colors=[drawing.color],
-                    url=url,
-                    linewidths=1,
-                    pickradius=3,
-                    picker=True,
-                )
+            if kind == "axhline":
+                # Span the full axes width like axhline
+                collection.set_transform(ax.get_yaxis_transform())
+                ax.add_collection(collection, autolim=False)
+            else:
+                ax.add_collection(collection)
 
-                ax.add_collection(line)
-                artists.append(line)
+            artists.append(collection)
 
         return artists
 
     def _make_format_coords(self, df: pd.DataFrame):
-        """Create a debounced format_coords function."""
-        index = df.index
-        n = len(df)
-
-        # Avoid repeated column checks
-        has_mrs = "M_RS" in df.columns
-        has_rs = "RS" in df.columns
-
-        # Cache column indexes to use integer lookups (faster)
-        open_i = df.columns.get_loc("Open")
-        high_i = df.columns.get_loc("High")
-        low_i = df.columns.get_loc("Low")
-        close_i = df.columns.get_loc("Close")
-        vol_i = df.columns.get_loc("Volume")
+        """Create a format_coords function from precomputed bar labels."""
+        fields = [
+            ("Open", "O", ""),
+            ("High", "H", ""),
+            ("Low", "L", ""),
+            ("Close", "C", ""),
+            ("Volume", "V", ",.0f"),
+        ]
 
-        mrs_i = df.columns.get_loc("M_RS") if has_mrs else None
-        rs_i = df.columns.get_loc("RS") if has_rs else None
+        if "M_RS" in df.columns:
+            fields.append(("M_RS", "MRS", ""))
+        elif "RS" in df.columns:
+            fields.append(("RS", "RS", ""))
 
-        # Faster row access
-        rows = df.to_numpy(copy=False)
         separator = " " * 5
+        labels = bar_labels(df, fields, separator)
+        n = len(labels)
 
-        @debounce(0.025)
         def format_coords(x: float, y: float) -> str:
             i = round(x)
 
             if i < 0 or i >= n:
                 return ""
 
-            row = rows[i]
-            dt = index[i]
-            dt_str = f"{dt:%d %b %Y}".upper()
-
-            out = (
-                f"{dt_str}"
-                f"{separator}O: {row[open_i]}"
-                f"{separator}H: {row[high_i]}"
-                f"{separator}L: {row[low_i]}"
-                f"{separator}C: {row[close_i]}"
-                f"{separator}V: {row[vol_i]:,.0f}"
-            )
-
-            if mrs_i is not None:
-                out += f"{separator}MRS: {row[mrs_i]}"
-            elif rs_i is not None:
-                out += f"{separator}RS: {row[rs_i]}"
-
-            out += f"{separator}Y: {y:.2f}"
-            return out
+            return f"{labels[i]}{separator}Y: {y:.2f}"
 
         return format_coords
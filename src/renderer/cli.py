@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Any, Literal
 
 from defs.config import config
+from defs.symbol_index import INDEX_ALIAS
 
 from .dtypes import (
     BreadthCommand,
@@ -22,22 +23,6 @@ from .util import load_json, write_json
 BREADTH_CHOICES: list[BreadthOption] = ["50", "200", "sma", "nethighs", "adline", "osc"]
 DEFAULT_BREADTH: list[BreadthOption] = ["sma", "nethighs", "adline", "osc"]
 
-INDEX_ALIAS: dict[str, str] = dict(
-    n50="nifty 50",
-    n100="nifty 100",
-    n200="nifty 200",
-    n500="nifty 500",
-    next50="nifty next 50",
-    m50="nifty midcap 50",
-    m100="nifty midcap 100",
-    mselect="nifty midcap select",
-    s100="nifty smallcap 100",
-    s50="nifty smallcap 50",
-    nbank="nifty bank",
-    nfin="nifty financial services",
-    ttlmkt="nifty total market",
-)
-
 TF_PERIOD_MAP = dict(
     d=config.PLOT_DAYS,
     w=config.PLOT_WEEKS,
@@ -319,6 +304,12 @@ def build_parser(
         help="Save chart as png.",
     )
 
+    parser.add_argument(
+        "--profile-plugins",
+        action="store_true",
+        help="Print time, memory and output size of each chart plugin at exit. Also saved as data/plugin_profile.json.",
+    )
+
     parser.add_argument(
         "--tf",
         action="store",
@@ -530,6 +521,7 @@ def command_from_namespace(
         snr=args.snr,
         delivery=args.dlv,
         plugins=selected_plugins_from_args(args),
+        profile_plugins=args.profile_plugins,
     )
 
 
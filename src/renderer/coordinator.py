@@ -10,12 +10,14 @@ from matplotlib.axes import Axes
 from matplotlib.backend_bases import KeyEvent, MouseEvent, PickEvent
 from matplotlib.figure import Figure
 
+from defs.config import config
 from renderer.candle_render import CandlestickRenderer
 
 from .annotations import DrawingTool
 from .breadth_render import BREADTH_INDICATORS
 from .cli import PlotCommand
 from .dtypes import TF_MAP, Modifier, RenderContext
+from .memo import IndicatorMemo, plugin_changes
 from .navigation import NavigationList
 from .notify import Notify
 from .shortcuts import ShortcutHandler
@@ -77,6 +79,16 @@ class PlotCoordinator:
         # Keep track of symbols visited to suppress repeated warnings
         self.visited = set()
 
+        # Indicator and plugin results of visited charts
+        self.memo: IndicatorMemo | None = None
+
+        if self.is_stock_mode and self.indicator_pipeline:
+            self.memo = IndicatorMemo(
+                cmd,
+                max_bytes=config.PLOT_MEMO_MB * 1024 * 1024,
+                index_close=self.indicator_pipeline.index_close,
+            )
+
     def run(self) -> None:
         """Start the interactive chart."""
         plt.ion()
@@ -130,14 +142,36 @@ class PlotCoordinator:
                 for col in ["Open", "High", "Low"]:
                     df[col] = df[col].fillna(df["Close"])
 
-            # Enrich with indicators
-            df = self.indicator_pipeline.enrich(title, df, visited)
+            # Enrich with indicators and plugins, reusing the results of an
+            # earlier visit if the data and parameters are unchanged
+            assert self.memo is not None
+            memo_key = self.memo.key(symbol, df)
+            entry = self.memo.get(memo_key)
+
+            if entry is None:
+                df = self.indicator_pipeline.enrich(title, df, visited)
+
+                # Plugins see the chart's plot_args. Keys they set are
+                # memoized with their addplots and replayed on a hit.
+                plugin_args = plot_args.copy()
+
+                if "addplot" in plugin_args:
+                    plugin_args["addplot"] = list(plugin_args["addplot"])
+
+                if self.plugin_runner:
+                    period = min(len(df), self.cmd.period)
+                    self.plugin_runner.apply(df, plugin_args, period, symbol=symbol)
+
+                entry = self.memo.put(
+                    memo_key, df, plugin_changes(plot_args, plugin_args)
+                )
+
+            df = entry.df
 
             self._data_len = len(df)
             period = min(self._data_len, self.cmd.period)
 
-            if self.plugin_runner:
-                self.plugin_runner.apply(df, plot_args, period)
+            entry.apply(plot_args)
 
             df = df[-period:]
             df = cast(pd.DataFrame, df)
@@ -162,10 +196,9 @@ class PlotCoordinator:
             # + 15 on right to clear space for annotations
             plot_args["xlim"] = (-2, df.shape[0] + 15)
 
-            if self.drawing_manager and self.session_store:
+            if self.drawing_manager:
                 index = cast(pd.DatetimeIndex, df.index)
                 self.drawing_manager.set_index(index)
-                self.drawing_manager.from_dict(self.session_store.load_drawings())
         else:
             df = self.loader.load_breadth_indicators()
 
@@ -310,7 +343,9 @@ class PlotCoordinator:
             # Right click on a drawing
             artist = event.artist
 
-            self.drawing_manager.remove(self._current_symbol, artist)
+            self.drawing_manager.remove(
+                self._current_symbol, artist, ind=getattr(event, "ind", None)
+            )
 
     def _auto_advance(self) -> None:
         """Automatically advance to next symbol if current one fails."""
@@ -431,8 +466,7 @@ class PlotCoordinator:
 
             # Save drawings
             if self.drawing_manager:
-                drawings_data = self.drawing_manager.to_dict()
-                self.session_store.save_drawings(drawings_data)
+                self.session_store.save_drawings(self.drawing_manager.pop_dirty())
 
             # Save watch resume
             watch_name = ""
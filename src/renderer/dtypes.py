@@ -40,8 +40,10 @@ class AppPaths:
     rs_index_file: Path
     config_path: Path
     drawings: Path
+    drawings_db: Path
     selections: Path
     save_dir: Path
+    plugin_profile: Path
 
     @classmethod
     def from_root(cls, root: Path) -> AppPaths:
@@ -54,8 +56,10 @@ class AppPaths:
             rs_index_file=data_path / f"{config.PLOT_RS_INDEX}.csv",
             config_path=root / "defs" / "user.json",
             drawings=root / "data" / "drawings.json",
+            drawings_db=root / "data" / "drawings.db",
             selections=root / "selections.csv",
             save_dir=root / "SAVED_CHARTS",
+            plugin_profile=root / "data" / "plugin_profile.json",
         )
 
 
@@ -128,3 +132,4 @@ class PlotCommand:
     snr: SnrVersion | None = None
     delivery: bool = False
     plugins: dict[str, dict[str, Any]] = field(default_factory=dict)
+    profile_plugins: bool = False
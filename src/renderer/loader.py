@@ -8,7 +8,10 @@ from pathlib import Path
 import pandas as pd
 from fast_csv_loader import csv_loader
 
+from defs.symbol_index import SymbolIndex
+
 from .dtypes import Timeframe
+from .shared import SharedFrame
 
 logger = logging.getLogger("MarketDataLoader")
 
@@ -33,6 +36,7 @@ class EODFileLoader:
         end_date: datetime | None = None,
         period: int = 160,
         index_name: str = "nifty 500",
+        symbols: SymbolIndex | None = None,
     ) -> None:
         """Initialize for stock mode.
 
@@ -41,9 +45,11 @@ class EODFileLoader:
             data_path: Directory containing {symbol}.csv files
             end_date: Optional end date filter
             period: Number of candles to return (for daily) or multiplier for higher TFs
+            symbols: Index of the files in data_path. Built on first use if
+                not provided.
         """
         # Breadth mode specific
-        self.breadth_df: pd.DataFrame | None = None
+        self.breadth_df: pd.DataFrame | SharedFrame | None = None
         self.breadth_filepath = breadth_filepath
         self.index_file = data_path / f"{index_name.lower()}.csv"
 
@@ -55,6 +61,7 @@ class EODFileLoader:
         self.end_date: datetime | None = end_date
         self.date_format: str = "%Y-%m-%d"
         self.data_path: Path = data_path
+        self._symbols = symbols
 
         self.default_tf = "d"
 
@@ -79,10 +86,20 @@ class EODFileLoader:
         elif timeframe == "q":
             self.period = 90 * period
 
+    @property
+    def symbols(self) -> SymbolIndex:
+        if self._symbols is None:
+            self._symbols = SymbolIndex.load(self.data_path)
+
+        return self._symbols
+
     def load_breadth_indicators(self) -> pd.DataFrame:
         """
         Load all breadth indicators
         """
+        if isinstance(self.breadth_df, SharedFrame):
+            return self.breadth_df.get()
+
         if self.breadth_df is not None:
             return self.breadth_df
         # Load data
@@ -133,14 +150,11 @@ class EODFileLoader:
         Returns:
             DataFrame with OHLC data, or None if not found
         """
-        file = self.data_path / f"{symbol.lower()}.csv"
-
-        if not file.exists():
-            # Check for SME
-            file = self.data_path / f"{symbol.lower()}_sme.csv"
-            if not file.exists():
-                logger.warning(f"File not found: {symbol}")
-                return None
+        file = self.symbols.resolve(symbol)
+
+        if file is None:
+            logger.warning(self.symbols.not_found_message(symbol))
+            return None
 
         if self.tf in ("m", "q"):
             return self._process_monthly(file)
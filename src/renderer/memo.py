@@ -0,0 +1,168 @@
+"""Session memo of indicator and plugin results.
+
+Navigating back to a chart re-ran `IndicatorPipeline.enrich` and every chart
+plugin from scratch. `IndicatorMemo` stores the enriched DataFrame and the
+plot_args set by plugins, keyed by symbol, a fingerprint of the loaded data,
+the timeframe and the indicator/plugin parameters. Least recently used
+entries are evicted once the memo exceeds its memory budget.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+import pandas as pd
+
+from .dtypes import PlotCommand
+from .util import addplot_nbytes
+
+MemoKey = tuple[str, str, str, str]
+
+
+@dataclass(slots=True)
+class MemoEntry:
+    df: pd.DataFrame
+
+    # plot_args keys set by plugins. For addplot, only the added entries.
+    plot_args: dict[str, Any] = field(default_factory=dict)
+    nbytes: int = 0
+
+    def apply(self, plot_args: dict[str, Any]) -> None:
+        """Set the plugin output in plot_args, as running the plugins would."""
+        for key, value in self.plot_args.items():
+            if key == "addplot":
+                plot_args.setdefault("addplot", list()).extend(value)
+            else:
+                plot_args[key] = value
+
+
+def plugin_changes(before: dict[str, Any], after: dict[str, Any]) -> dict[str, Any]:
+    """Return the plot_args keys set by plugins.
+
+    Args:
+        before: plot_args passed to the plugins
+        after: A copy of before, after the plugins ran on it
+
+    Returns:
+        Keys added or replaced. For addplot, only the appended entries.
+    """
+    changes = {
+        key: value
+        for key, value in after.items()
+        if key != "addplot" and (key not in before or before[key] is not value)
+    }
+
+    addplot = after.get("addplot", [])[len(before.get("addplot", [])) :]
+
+    if addplot:
+        changes["addplot"] = list(addplot)
+
+    return changes
+
+
+def fingerprint(df: pd.DataFrame) -> str:
+    """Return a digest of the DataFrame index, columns and values."""
+    digest = hashlib.blake2b(digest_size=16)
+
+    digest.update(",".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+
+    return digest.hexdigest()
+
+
+def command_params(cmd: PlotCommand, index_close: pd.Series | None = None) -> str:
+    """Return a stable string of every option that affects indicator output."""
+    params = dict(
+        period=cmd.period,
+        rs=cmd.rs,
+        mansfield_rs=cmd.mansfield_rs,
+        sma=cmd.sma,
+        ema=cmd.ema,
+        vol_sma=cmd.vol_sma,
+        delivery=cmd.delivery,
+        plugins=cmd.plugins,
+    )
+
+    if index_close is not None and (cmd.rs or cmd.mansfield_rs):
+        params["index"] = fingerprint(index_close.to_frame())
+
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class IndicatorMemo:
+    """LRU memo of enriched DataFrames and plugin output.
+
+    Entries are bounded by `max_bytes`, estimated from the DataFrame and
+    addplot data sizes. Stored objects are treated as read-only.
+    """
+
+    def __init__(
+        self,
+        cmd: PlotCommand,
+        max_bytes: int,
+        index_close: pd.Series | None = None,
+    ) -> None:
+        self.timeframe = cmd.timeframe
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._params = command_params(cmd, index_close)
+        self._entries: OrderedDict[MemoKey, MemoEntry] = OrderedDict()
+
+    def key(self, symbol: str, df: pd.DataFrame) -> MemoKey:
+        return (symbol.lower(), fingerprint(df), self.timeframe, self._params)
+
+    def get(self, key: MemoKey) -> MemoEntry | None:
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(
+        self,
+        key: MemoKey,
+        df: pd.DataFrame,
+        plot_args: dict[str, Any] | None = None,
+    ) -> MemoEntry:
+        plot_args = dict(plot_args or {})
+
+        nbytes = int(df.memory_usage(deep=True).sum())
+        nbytes += sum(addplot_nbytes(ap) for ap in plot_args.get("addplot", []))
+
+        entry = MemoEntry(df=df, plot_args=plot_args, nbytes=nbytes)
+
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key).nbytes
+
+        if nbytes > self.max_bytes:
+            # Too large to keep, but still usable by the caller
+            return entry
+
+        self._entries[key] = entry
+        self.nbytes += nbytes
+
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: MemoKey) -> bool:
+        return key in self._entries
@@ -9,9 +9,8 @@ sys.path.insert(0, str(DIR))
 import pickle
 from typing import Any
 
-from util import load_json, write_json
-
 from defs.config import config
+from renderer.persistence import DrawingStore
 
 TIMEFRAME_MAP = dict(
     daily="d",
@@ -122,58 +121,51 @@ def migrate_symbol_file(path: Path) -> dict[str, dict[str, dict[str, Any]]]:
     return migrated
 
 
-def migrate_all(
-    lines_dir: Path,
-    drawings_path: Path,
-) -> dict[str, Any]:
-    """Migrate all pickle files into drawings.json.
+def migrate_all(lines_dir: Path, store: DrawingStore) -> int:
+    """Migrate all pickle files into the drawings database.
+
+    Drawings of each migrated symbol and timeframe replace any drawings
+    already stored for them.
 
     Args:
         lines_dir: Directory containing old '<symbol>.p' files.
-        drawings_json_path: Target drawings.json path.
-        overwrite_symbol_timeframe:
-            If False, merge old drawings into existing timeframe/symbol mappings.
-            If True, replace each migrated symbol for each migrated timeframe.
+        store: Drawing store, as used by chart.py
 
     Returns:
-        The full migrated drawings JSON data.
+        The number of drawings migrated.
     """
     if not lines_dir.is_dir():
         raise NotADirectoryError(f"Folder not found or not a folder: {lines_dir}")
 
-    if drawings_path.is_file():
-        drawings = load_json(drawings_path)
-    else:
-        drawings = {}
+    drawings: dict[str, dict[str, Any]] = {}
 
     for pickle_path in lines_dir.iterdir():
         symbol = pickle_path.stem.lower()
         old_dict = migrate_symbol_file(pickle_path)
 
         for timeframe, url_map in old_dict.items():
-            drawings.setdefault(timeframe, {})
-
-            drawings[timeframe][symbol] = url_map
+            drawings.setdefault(timeframe, {})[symbol] = url_map
 
-    write_json(drawings_path, drawings)
+    for timeframe, symbols in drawings.items():
+        store.save(timeframe, symbols)
 
-    return drawings
+    return sum(
+        len(url_map) for symbols in drawings.values() for url_map in symbols.values()
+    )
 
 
 if __name__ == "__main__":
     LINE_DIR = DIR / "data/lines"
-    DRAWING_PATH = DIR / "data/drawings.json"
+    DRAWING_DB_PATH = DIR / "data/drawings.db"
 
-    drawings = migrate_all(
-        lines_dir=LINE_DIR,
-        drawings_path=DRAWING_PATH,
-    )
+    if not LINE_DIR.is_dir():
+        exit(f"Folder not found or not a folder: {LINE_DIR}")
 
-    total = sum(
-        len(url_map)
-        for symbol_map in drawings.values()
-        for url_map in symbol_map.values()
-    )
+    # Drawings in the legacy drawings.json are imported first, if the
+    # database does not exist yet
+    store = DrawingStore(DRAWING_DB_PATH, legacy_path=DIR / "data/drawings.json")
+
+    total = migrate_all(lines_dir=LINE_DIR, store=store)
 
-    print(f"Migrated drawings written to: {DRAWING_PATH}")
-    print(f"Total drawings in file: {total}")
+    print(f"Migrated drawings written to: {DRAWING_DB_PATH}")
+    print(f"Total drawings migrated: {total}")
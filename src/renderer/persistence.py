@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+import sqlite3
+from contextlib import closing
 from pathlib import Path
 from typing import Any
 
@@ -7,19 +10,119 @@ from .dtypes import Timeframe
 from .util import load_json, write_json
 
 
+class DrawingStore:
+    """SQLite backed drawing storage with one row per timeframe and symbol.
+
+    Reads and writes touch only the requested symbol, so their cost does not
+    grow with the total number of drawings. Each write is an atomic commit.
+
+    On first use, drawings from the legacy whole-file drawings.json are
+    imported. The JSON file is left in place.
+
+    Only the database path is stored, so the store can be pickled and used
+    from batch worker processes.
+    """
+
+    def __init__(self, db_path: Path, legacy_path: Path | None = None) -> None:
+        """
+        Args:
+            db_path: Path to data/drawings.db
+            legacy_path: Path to data/drawings.json to import from
+        """
+        self.db_path = db_path
+
+        if not db_path.is_file():
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS drawings ("
+                    "timeframe TEXT NOT NULL, "
+                    "symbol TEXT NOT NULL, "
+                    "data TEXT NOT NULL, "
+                    "PRIMARY KEY (timeframe, symbol))"
+                )
+
+                conn.commit()
+
+                if legacy_path is not None and legacy_path.is_file():
+                    self._import_json(conn, load_json(legacy_path))
+
+    def _connect(self) -> closing[sqlite3.Connection]:
+        return closing(sqlite3.connect(self.db_path))
+
+    @staticmethod
+    def _import_json(conn: sqlite3.Connection, data: dict[str, Any]) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO drawings VALUES (?, ?, ?)",
+            (
+                (timeframe, symbol, json.dumps(url_map))
+                for timeframe, symbols in data.items()
+                for symbol, url_map in symbols.items()
+                if url_map
+            ),
+        )
+        conn.commit()
+
+    def load(self, timeframe: Timeframe, symbol: str) -> dict[str, Any]:
+        """Return drawings of one symbol, shaped as url -> Drawing dict."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT data FROM drawings WHERE timeframe = ? AND symbol = ?",
+                (timeframe, symbol),
+            ).fetchone()
+
+        return json.loads(row[0]) if row else {}
+
+    def load_all(self, timeframe: Timeframe) -> dict[str, dict[str, Any]]:
+        """Return drawings of all symbols, shaped as symbol -> url -> Drawing dict."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT symbol, data FROM drawings WHERE timeframe = ?",
+                (timeframe,),
+            ).fetchall()
+
+        return {symbol: json.loads(data) for symbol, data in rows}
+
+    def save(self, timeframe: Timeframe, drawings: dict[str, dict[str, Any]]) -> None:
+        """Replace drawings of the given symbols in a single transaction.
+
+        Args:
+            drawings: Dict shaped as symbol -> url -> Drawing dict. Symbols
+                with no drawings are deleted.
+        """
+        if not drawings:
+            return
+
+        with self._connect() as conn:
+            for symbol, url_map in drawings.items():
+                if url_map:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO drawings VALUES (?, ?, ?)",
+                        (timeframe, symbol, json.dumps(url_map)),
+                    )
+                else:
+                    conn.execute(
+                        "DELETE FROM drawings WHERE timeframe = ? AND symbol = ?",
+                        (timeframe, symbol),
+                    )
+
+            conn.commit()
+
+
 class SessionStore:
     """Reads/writes session state to JSON files.
 
     Manages:
     - Watch resume state (current symbol index)
-    - Drawing persistence (data/drawings.json)
+    - Drawing persistence (data/drawings.db)
     - Selections persistence (selections.csv)
     """
 
     def __init__(
         self,
         user_config_path: Path,
-        drawings_path: Path,
+        drawing_store: DrawingStore,
         selections_path: Path,
         timeframe: Timeframe,
     ) -> None:
@@ -27,11 +130,11 @@ class SessionStore:
 
         Args:
             user_config_path: Path to session JSON file for watch resume state
-            drawings_path: Path to data/drawings.json
+            drawing_store: Drawing storage
             selections_path: Path to selections.csv
         """
         self._user_config_path: Path = user_config_path
-        self._drawings_path: Path = drawings_path
+        self._drawing_store: DrawingStore = drawing_store
         self._selections_path: Path = selections_path
         self.selections: set[str] = set()
         self._timeframe: Timeframe = timeframe
@@ -51,38 +154,21 @@ class SessionStore:
         write_json(self._user_config_path, data)
 
     def save_drawings(self, drawings: dict[str, dict[str, Any]]) -> None:
-        """Save drawings for the current timeframe.
+        """Save drawings of the given symbols for the current timeframe.
 
         Args:
             drawings: Dict shaped as symbol -> url -> Drawing dict.
-
-        File shape:
-            timeframe -> symbol -> url -> Drawing dict
+                Usually only the symbols modified in this session.
         """
-        self._drawings_path.parent.mkdir(parents=True, exist_ok=True)
+        self._drawing_store.save(self._timeframe, drawings)
 
-        if self._drawings_path.is_file():
-            data = load_json(self._drawings_path)
-        else:
-            data = {}
-
-        data[self._timeframe] = drawings
-
-        write_json(self._drawings_path, data)
-
-    def load_drawings(self) -> dict[str, dict[str, Any]]:
-        """Load drawings for the current timeframe.
+    def load_drawings(self, symbol: str) -> dict[str, Any]:
+        """Load drawings of a symbol for the current timeframe.
 
         Returns:
-            Dict shaped as symbol -> url -> Drawing dict.
-            Returns an empty dict if the file or timeframe does not exist.
+            Dict shaped as url -> Drawing dict. Empty if there are none.
         """
-        if not self._drawings_path.is_file():
-            return {}
-
-        data = load_json(self._drawings_path)
-
-        return data.get(self._timeframe, {})
+        return self._drawing_store.load(self._timeframe, symbol)
 
     def save_selections(self, symbols: set[str]) -> None:
         """Save selected symbols to selections.csv.
@@ -4,7 +4,8 @@ from typing import Any
 
 from mplfinance import make_addplot
 
-from .utils import average_true_range
+from .compute import ComputeContext
+from .registry import positive_float, positive_int
 
 """
 Average True Range (ATR) plugin.
@@ -74,16 +75,24 @@ Example Configuration:
 """
 
 
+def normalize(options: dict[str, Any]) -> dict[str, Any]:
+    return dict(
+        options,
+        period=positive_int(options, "period", "length", default=14),
+        width=positive_float(options, "width", default=1.5),
+    )
+
+
 def apply(
     df,
     plot_args: dict[str, Any],
     options: dict[str, Any],
     display_period: int,
 ) -> None:
-    period = int(options.get("period", options.get("length", 14)))
+    period = options["period"]
 
     line_color = options.get("line_color", "firebrick")
-    width = float(options.get("width", 1.5))
+    width = options["width"]
 
     panel = options.get("plot_panel", "lower")
     secondary_y = bool(options.get("secondary_y", False))
@@ -91,12 +100,9 @@ def apply(
     label = options.get("label", f"ATR {period}")
     ylabel = options.get("ylabel", "ATR")
 
-    atr = average_true_range(
-        high=df.High,
-        low=df.Low,
-        close=df.Close,
-        length=period,
-    )
+    compute = options.get("compute") or ComputeContext(df)
+
+    atr = compute.atr(period)
 
     addplots = plot_args.setdefault("addplot", list())
     addplots.append(
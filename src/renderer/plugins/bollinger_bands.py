@@ -4,7 +4,8 @@ from typing import Any
 
 from mplfinance import make_addplot
 
-from .utils import bollinger_bands
+from .compute import ComputeContext
+from .registry import positive_float, positive_int
 
 """
 Bollinger Bands plugin.
@@ -87,6 +88,21 @@ Example Configuration:
 """
 
 
+def normalize(options: dict[str, Any]) -> dict[str, Any]:
+    return dict(
+        options,
+        length=positive_int(options, "length", "period", default=20),
+        mult=positive_float(options, "mult", "multiplier", default=2.0),
+        basis_width=positive_float(options, "basis_width", default=1.2),
+        band_width=positive_float(options, "band_width", default=1.0),
+    )
+
+
+def warmup(options: dict[str, Any]) -> int:
+    """Bars needed before the first displayed bar for exact values."""
+    return options["length"] - 1
+
+
 def apply(
     df,
     plot_args: dict[str, Any],
@@ -94,23 +110,25 @@ def apply(
     display_period: int,
 ) -> None:
     source_name = options.get("source", "Close")
-    length = int(options.get("length", options.get("period", 20)))
-    mult = float(options.get("mult", options.get("multiplier", 2.0)))
+    length = options["length"]
+    mult = options["mult"]
 
     basis_color = options.get("basis_color", "dodgerblue")
     upper_color = options.get("upper_color", "gray")
     lower_color = options.get("lower_color", "gray")
 
-    basis_width = float(options.get("basis_width", 1.2))
-    band_width = float(options.get("band_width", 1.0))
+    basis_width = options["basis_width"]
+    band_width = options["band_width"]
 
     panel = options.get("plot_panel", 0)
 
-    basis, upper, lower = bollinger_bands(
-        source=df[source_name],
-        length=length,
-        mult=mult,
-    )
+    compute = options.get("compute") or ComputeContext(df)
+
+    basis = compute.sma(length, source=source_name)
+    dev = mult * compute.stdev(length, source=source_name)
+
+    upper = basis + dev
+    lower = basis - dev
 
     addplots = plot_args.setdefault("addplot", list())
     addplots.extend(
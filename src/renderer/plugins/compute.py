@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+from .utils import (
+    exponential_moving_average,
+    simple_moving_average,
+    wilders_moving_average,
+)
+
+"""
+Per-chart computation context shared by chart plugins.
+
+``PluginRunner`` creates one ``ComputeContext`` per chart and injects it into
+each plugin's options as ``options["compute"]``. Building blocks such as true
+range, ATR and moving averages are computed once on first request and reused
+by every other plugin on the same chart.
+
+Returned Series are shared between plugins and must not be modified in place.
+
+Usage::
+
+    compute = options.get("compute") or ComputeContext(df)
+
+    atr = compute.atr(14)
+    basis = compute.sma(20, source="Close")
+
+    # Any other intermediate result can be shared by key
+    hl2 = compute.get(("hl2",), lambda: (df.High + df.Low) / 2)
+"""
+
+
+class ComputeContext:
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+        self._results: dict[Hashable, Any] = {}
+
+    def get(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Return the result stored under key, calling func on first request."""
+        if key not in self._results:
+            self._results[key] = func()
+
+        return self._results[key]
+
+    def true_range(self) -> pd.Series:
+        return self.get(("true_range",), self._true_range)
+
+    def atr(self, length: int = 14) -> pd.Series:
+        """Average True Range using Wilder's smoothing."""
+        return self.get(
+            ("atr", length),
+            lambda: wilders_moving_average(self.true_range(), length),
+        )
+
+    def sma(self, length: int, source: str = "Close") -> pd.Series:
+        return self.get(
+            ("sma", source, length),
+            lambda: simple_moving_average(self.df[source], length),
+        )
+
+    def ema(self, length: int, source: str = "Close") -> pd.Series:
+        return self.get(
+            ("ema", source, length),
+            lambda: exponential_moving_average(self.df[source], length),
+        )
+
+    def stdev(self, length: int, source: str = "Close") -> pd.Series:
+        """Rolling population standard deviation (ddof=0)."""
+        return self.get(
+            ("stdev", source, length),
+            lambda: self.df[source].rolling(length).std(ddof=0),
+        )
+
+    def _true_range(self) -> pd.Series:
+        high = self.df.High.to_numpy(dtype=np.float64)
+        low = self.df.Low.to_numpy(dtype=np.float64)
+        close = self.df.Close.to_numpy(dtype=np.float64)
+
+        prev_close = np.empty_like(close)
+        prev_close[:1] = np.nan
+        prev_close[1:] = close[:-1]
+
+        # fmax ignores the missing previous close on the first bar
+        tr = np.fmax.reduce(
+            (high - low, np.abs(high - prev_close), np.abs(low - prev_close))
+        )
+
+        return pd.Series(tr, index=self.df.index)
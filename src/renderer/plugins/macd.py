@@ -4,7 +4,9 @@ from typing import Any
 
 from mplfinance import make_addplot
 
-from .utils import macd
+from .compute import ComputeContext
+from .registry import positive_float, positive_int
+from .utils import exponential_moving_average
 
 """
 Moving Average Convergence Divergence (MACD) plugin.
@@ -102,13 +104,30 @@ Example Configuration:
 """
 
 
+def normalize(options: dict[str, Any]) -> dict[str, Any]:
+    fastlen = positive_int(options, "fastlen", "fast", default=12)
+    slowlen = positive_int(options, "slowlen", "slow", default=26)
+
+    if fastlen >= slowlen:
+        raise ValueError("fastlen must be less than slowlen")
+
+    return dict(
+        options,
+        fastlen=fastlen,
+        slowlen=slowlen,
+        siglen=positive_int(options, "siglen", "signal", default=9),
+        line_width=positive_float(options, "line_width", default=1.5),
+        signal_width=positive_float(options, "signal_width", default=1.2),
+    )
+
+
 def apply(
     df, plot_args: dict[str, Any], options: dict[str, Any], display_period: int
 ) -> None:
     source_name = options.get("source", "Close")
-    fastlen = int(options.get("fastlen", options.get("fast", 12)))
-    slowlen = int(options.get("slowlen", options.get("slow", 26)))
-    siglen = int(options.get("siglen", options.get("signal", 9)))
+    fastlen = options["fastlen"]
+    slowlen = options["slowlen"]
+    siglen = options["siglen"]
 
     line_color = options.get("line_color", "royalblue")
     signal_color = options.get("signal_color", "red")
@@ -116,18 +135,20 @@ def apply(
     hist_positive_color = options.get("hist_positive_color", "darkgray")
     hist_negative_color = options.get("hist_negative_color", "darkgray")
 
-    line_width = float(options.get("line_width", 1.5))
-    signal_width = float(options.get("signal_width", 1.2))
+    line_width = options["line_width"]
+    signal_width = options["signal_width"]
 
     panel = options.get("plot_panel", "lower")
     ylabel = options.get("ylabel", f"MACD {fastlen},{slowlen}")
 
-    macd_line, signal_line, histogram = macd(
-        source=df[source_name],
-        fastlen=fastlen,
-        slowlen=slowlen,
-        siglen=siglen,
-    )
+    compute = options.get("compute") or ComputeContext(df)
+
+    fast_ma = compute.ema(fastlen, source=source_name)
+    slow_ma = compute.ema(slowlen, source=source_name)
+
+    macd_line = fast_ma - slow_ma
+    signal_line = exponential_moving_average(macd_line, siglen)
+    histogram = macd_line - signal_line
 
     histogram_positive = histogram.where(histogram >= 0)
     histogram_negative = histogram.where(histogram < 0)
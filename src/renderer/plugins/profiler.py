@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from renderer.util import addplot_nbytes
+
+"""
+Plugin execution profiler.
+
+Enabled with ``chart.py --profile-plugins``. ``PluginRunner`` records the wall
+time, peak memory allocated and output size of every plugin call. A summary
+table is printed at exit and all samples are written to JSON.
+
+Memory is measured with ``tracemalloc``, which slows down plugin execution.
+Wall times are therefore only comparable between plugins of the same run.
+"""
+
+
+@dataclass(slots=True)
+class PluginSample:
+    plugin: str
+    symbol: str
+    seconds: float
+    peak_bytes: int
+    output_bytes: int
+
+
+@dataclass(slots=True)
+class PluginMeasure:
+    """Filled in by `PluginProfiler.measure` when the plugin call returns."""
+
+    seconds: float = 0.0
+    peak_bytes: int = 0
+    output_bytes: int = 0
+
+
+@dataclass
+class PluginProfiler:
+    samples: list[PluginSample] = field(default_factory=list)
+
+    # Whether tracemalloc was started by this profiler
+    _tracing: bool = field(default=False, init=False, repr=False, compare=False)
+
+    @contextmanager
+    def measure(
+        self,
+        plugin: str,
+        symbol: str,
+        plot_args: dict[str, Any],
+    ) -> Iterator[PluginMeasure]:
+        """Measure a single plugin call that appends addplots to plot_args."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+        result = PluginMeasure()
+        addplot_count = len(plot_args.get("addplot", ()))
+
+        tracemalloc.reset_peak()
+        mem_start = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+
+        yield result
+
+        result.seconds = time.perf_counter() - start
+        result.peak_bytes = max(tracemalloc.get_traced_memory()[1] - mem_start, 0)
+        result.output_bytes = sum(
+            addplot_nbytes(ap) for ap in plot_args.get("addplot", [])[addplot_count:]
+        )
+
+        self.samples.append(
+            PluginSample(
+                plugin=plugin,
+                symbol=symbol,
+                seconds=result.seconds,
+                peak_bytes=result.peak_bytes,
+                output_bytes=result.output_bytes,
+            )
+        )
+
+    def stop(self) -> None:
+        """Stop tracemalloc, if started by this profiler."""
+        if self._tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+        self._tracing = False
+
+    def extend(self, samples: list[PluginSample]) -> None:
+        """Add samples collected in another process."""
+        self.samples.extend(samples)
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Aggregate samples per plugin, slowest total time first."""
+        grouped: dict[str, list[PluginSample]] = {}
+
+        for sample in self.samples:
+            grouped.setdefault(sample.plugin, []).append(sample)
+
+        rows = []
+
+        for plugin, samples in grouped.items():
+            total = sum(s.seconds for s in samples)
+
+            rows.append(
+                dict(
+                    plugin=plugin,
+                    calls=len(samples),
+                    total_ms=round(total * 1000, 3),
+                    mean_ms=round(total * 1000 / len(samples), 3),
+                    max_ms=round(max(s.seconds for s in samples) * 1000, 3),
+                    peak_kb=round(max(s.peak_bytes for s in samples) / 1024, 1),
+                    output_kb=round(
+                        sum(s.output_bytes for s in samples) / len(samples) / 1024, 1
+                    ),
+                )
+            )
+
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def format_table(self) -> str:
+        rows = self.summary()
+
+        if not rows:
+            return "No plugin calls recorded"
+
+        headers = (
+            ("plugin", "Plugin"),
+            ("calls", "Calls"),
+            ("total_ms", "Total ms"),
+            ("mean_ms", "Mean ms"),
+            ("max_ms", "Max ms"),
+            ("peak_kb", "Peak KB"),
+            ("output_kb", "Output KB"),
+        )
+
+        widths = [
+            max(len(title), *(len(str(row[key])) for row in rows))
+            for key, title in headers
+        ]
+
+        lines = [
+            "  ".join(
+                title.ljust(w) if key == "plugin" else title.rjust(w)
+                for (key, title), w in zip(headers, widths)
+            )
+        ]
+
+        for row in rows:
+            lines.append(
+                "  ".join(
+                    (
+                        str(row[key]).ljust(w)
+                        if key == "plugin"
+                        else str(row[key]).rjust(w)
+                    )
+                    for (key, _), w in zip(headers, widths)
+                )
+            )
+
+        return "\n".join(lines)
+
+    def write_json(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        path.write_text(
+            json.dumps(
+                dict(
+                    summary=self.summary(),
+                    samples=[asdict(s) for s in self.samples],
+                ),
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
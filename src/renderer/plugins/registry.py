@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from importlib import import_module
+from types import ModuleType
+from typing import Any, Callable
+
+import pandas as pd
+
+from renderer.cli import CliError
+from renderer.dtypes import PanelAssignment
+from renderer.plugins.compute import ComputeContext
+
+"""
+Plugin registry.
+
+Chart plugins are imported, validated and prepared once, when the render
+context is built. The per-chart hot path in ``PluginRunner`` only calls
+``PluginSpec.apply``.
+
+A plugin module may define, besides ``apply``:
+
+``normalize(options) -> dict``
+    Validate options and return them with types coerced. Raise
+    ``ValueError`` or ``TypeError`` for invalid values.
+
+``warmup(options) -> int | None``
+    Bars needed before the first displayed bar for exact values.
+
+``warmup`` and ``apply`` receive the options returned by ``normalize``.
+"""
+
+# Options consumed by the registry and not passed to the plugin
+REGISTRY_KEYS = ("name", "option", "help", "lookback", "panel", "time_budget_ms")
+
+
+class PluginError(CliError):
+    """Raised when a chart plugin cannot be loaded or executed."""
+
+
+def import_plugin(package: str, plugin_key: str, module_name: str) -> ModuleType:
+    """Import a plugin module, raising PluginError if it does not exist."""
+    qualified = f"{package}.{module_name}"
+
+    try:
+        return import_module(qualified)
+    except ModuleNotFoundError as exc:
+        if exc.name in (module_name, qualified):
+            raise PluginError(
+                f"Could not load plugin '{plugin_key}' from module '{qualified}'"
+            ) from exc
+
+        raise
+
+
+def _hook(module: ModuleType, name: str) -> Callable | None:
+    hook = getattr(module, name, None)
+    return hook if callable(hook) else None
+
+
+@dataclass
+class PluginSpec:
+    """A loaded and validated chart plugin."""
+
+    key: str
+    module_name: str
+    options: dict[str, Any]
+    warmup: int | None = None
+    time_budget_ms: float | None = None
+    module: ModuleType | None = field(default=None, repr=False, compare=False)
+
+    def apply(
+        self,
+        df: pd.DataFrame,
+        plot_args: dict[str, Any],
+        display_period: int,
+        compute: ComputeContext,
+    ) -> None:
+        if self.module is None:
+            self.module = import_plugin("renderer.plugins", self.key, self.module_name)
+
+        # Options are normalized at load time and shared by every chart
+        self.options["compute"] = compute
+
+        try:
+            self.module.apply(df, plot_args, self.options, display_period)
+        finally:
+            del self.options["compute"]
+
+    def window(self, display_period: int, data_len: int) -> int:
+        """Return the number of trailing rows to pass to the plugin."""
+        if self.warmup is None:
+            return data_len
+
+        return min(data_len, display_period + self.warmup)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Modules cannot be pickled. Batch workers import them on first use.
+        state = self.__dict__.copy()
+        state["module"] = None
+        return state
+
+
+def load_plugin(
+    plugin_key: str,
+    plugin_config: dict[str, Any],
+    assignment: PanelAssignment | None = None,
+) -> PluginSpec:
+    """Import and validate a CHART_PLUGINS entry."""
+    if not isinstance(plugin_config, dict):
+        raise PluginError(f"Plugin config for '{plugin_key}' must be an object")
+
+    module_name = str(plugin_config.get("name", plugin_key.lower()))
+    module = import_plugin("renderer.plugins", plugin_key, module_name)
+
+    if _hook(module, "apply") is None:
+        raise PluginError(
+            f"Plugin '{plugin_key}': module 'renderer.plugins.{module_name}' has no apply function"
+        )
+
+    budget = plugin_config.get("time_budget_ms")
+
+    if budget is not None:
+        try:
+            budget = float(budget)
+        except (TypeError, ValueError):
+            budget = -1.0
+
+        if budget <= 0:
+            raise PluginError(
+                f"Plugin '{plugin_key}': time_budget_ms must be a positive number"
+            )
+
+    options = {k: v for k, v in plugin_config.items() if k not in REGISTRY_KEYS}
+
+    if assignment is not None:
+        options["plot_panel"] = assignment.panel
+
+        if assignment.secondary_y is not None:
+            options["secondary_y"] = assignment.secondary_y
+
+    normalize = _hook(module, "normalize")
+    warmup_hook = _hook(module, "warmup")
+    warmup = None
+
+    try:
+        if normalize:
+            options = normalize(options)
+
+        if warmup_hook:
+            warmup = warmup_hook(options)
+    except (TypeError, ValueError) as exc:
+        raise PluginError(f"Plugin '{plugin_key}': invalid option - {exc}") from exc
+
+    return PluginSpec(
+        key=plugin_key,
+        module_name=module_name,
+        options=options,
+        warmup=None if warmup is None else max(int(warmup), 0),
+        time_budget_ms=budget,
+        module=module,
+    )
+
+
+def load_plugins(
+    plugins: dict[str, dict[str, Any]],
+    panel_layout: dict[str, PanelAssignment],
+) -> list[PluginSpec]:
+    """Import and validate all selected CHART_PLUGINS entries."""
+    return [
+        load_plugin(key, plugin_config, panel_layout.get(f"plugin:{key}"))
+        for key, plugin_config in plugins.items()
+    ]
+
+
+def positive_int(options: dict[str, Any], *keys: str, default: int) -> int:
+    """Return the first option found in keys as a positive int."""
+    value = next((options[k] for k in keys if k in options), default)
+
+    if isinstance(value, bool) or int(value) != float(value) or int(value) <= 0:
+        raise ValueError(f"{keys[0]} must be a positive integer, got {value!r}")
+
+    return int(value)
+
+
+def positive_float(options: dict[str, Any], *keys: str, default: float) -> float:
+    """Return the first option found in keys as a positive float."""
+    value = next((options[k] for k in keys if k in options), default)
+
+    if isinstance(value, bool) or float(value) <= 0:
+        raise ValueError(f"{keys[0]} must be a positive number, got {value!r}")
+
+    return float(value)
@@ -5,6 +5,7 @@ from typing import Any
 import pandas as pd
 from mplfinance import make_addplot
 
+from .registry import positive_int
 from .utils import relative_strength_index
 
 """
@@ -81,10 +82,14 @@ Example Configuration:
 """
 
 
+def normalize(options: dict[str, Any]) -> dict[str, Any]:
+    return dict(options, period=positive_int(options, "period", default=14))
+
+
 def apply(
     df, plot_args: dict[str, Any], options: dict[str, Any], display_period: int
 ) -> None:
-    period = int(options.get("period", 14))
+    period = options["period"]
     line_color = options.get("line_color", "#0F766E")
     overbought_color = options.get("overbought_color", "#64748B")
     oversold_color = options.get("oversold_color", "#64748B")
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
-from importlib import import_module
+import time
 from typing import Any
 
 import pandas as pd
 
-from renderer.cli import CliError
 from renderer.dtypes import PanelAssignment
+from renderer.plugins.compute import ComputeContext
+from renderer.plugins.profiler import PluginProfiler
+from renderer.plugins.registry import PluginError, PluginSpec, load_plugins
 
+__all__ = ["PluginError", "PluginRunner"]
 
-class PluginError(CliError):
-    """Raised when a chart plugin cannot be loaded or executed."""
+# Plugins that exceeded their time budget in this process. Worker processes
+# are reused across batch tasks, so this outlives a single PluginRunner copy.
+_over_budget: set[str] = set()
 
 
 class PluginRunner:
@@ -18,37 +22,73 @@ class PluginRunner:
         self,
         plugins: dict[str, dict[str, Any]],
         panel_layout: dict[str, PanelAssignment],
+        profiler: PluginProfiler | None = None,
+        skip_over_budget: bool = False,
     ) -> None:
-        self.plugins = plugins
-        self.panel_layout = panel_layout
+        """
+        Plugins are imported and validated here, once per session.
+
+        Args:
+            plugins: Selected CHART_PLUGINS entries keyed by plugin key
+            panel_layout: Panel assignments from allocate_indicator_panels
+            profiler: Record time, memory and output size of each plugin call
+            skip_over_budget: Skip plugins on later charts once they exceed
+                their ``time_budget_ms``. Used in batch mode.
+
+        Raises:
+            PluginError: if a plugin cannot be loaded or has invalid options
+        """
+        self.specs: list[PluginSpec] = load_plugins(plugins, panel_layout)
+        self.profiler = profiler
+        self.skip_over_budget = skip_over_budget
 
     def apply(
         self,
         df: pd.DataFrame,
         plot_args: dict[str, Any],
         display_period: int,
+        symbol: str = "",
     ) -> None:
-        for plugin_key, plugin_config in self.plugins.items():
-            options = dict(plugin_config)
+        # Intermediate results shared by plugins on this chart,
+        # one context per input window length
+        contexts: dict[int, ComputeContext] = {}
+
+        for spec in self.specs:
+            if self.skip_over_budget and spec.key in _over_budget:
+                continue
+
+            window = spec.window(display_period, len(df))
 
-            module_name = str(options.pop("name", plugin_key.lower()))
+            compute = contexts.get(window)
 
-            assignment = self.panel_layout.get(f"plugin:{plugin_key}")
+            if compute is None:
+                compute = ComputeContext(df.iloc[-window:])
+                contexts[window] = compute
 
-            if assignment is not None:
-                options["plot_panel"] = assignment.panel
+            if self.profiler is None:
+                start = time.perf_counter()
+                spec.apply(compute.df, plot_args, display_period, compute)
+                elapsed = time.perf_counter() - start
+            else:
+                with self.profiler.measure(spec.key, symbol, plot_args) as result:
+                    spec.apply(compute.df, plot_args, display_period, compute)
+                elapsed = result.seconds
 
-                if assignment.secondary_y is not None:
-                    options["secondary_y"] = assignment.secondary_y
+            budget_ms = spec.time_budget_ms
+
+            if budget_ms is not None and elapsed * 1000 > budget_ms:
+                self._on_over_budget(spec.key, symbol, elapsed, budget_ms)
+
+    def _on_over_budget(
+        self, plugin_key: str, symbol: str, elapsed: float, budget_ms: float
+    ) -> None:
+        msg = f"WARN: {symbol} - Plugin {plugin_key} took {elapsed * 1000:.1f}ms, over budget of {budget_ms:g}ms"
 
-            try:
-                module = import_module(f"renderer.plugins.{module_name}")
-            except ModuleNotFoundError as exc:
-                if exc.name in (module_name, f"renderer.plugins.{module_name}"):
-                    raise PluginError(
-                        f"Could not load plugin '{plugin_key}' from module 'renderer.plugins.{module_name}'"
-                    ) from exc
+        if self.skip_over_budget:
+            if plugin_key in _over_budget:
+                return
 
-                raise
+            _over_budget.add(plugin_key)
+            msg += ". Skipping on remaining charts"
 
-            module.apply(df, plot_args, options, display_period)
+        print(msg)
@@ -4,6 +4,8 @@ from typing import Any
 
 from mplfinance import make_addplot
 
+from .compute import ComputeContext
+from .registry import positive_float, positive_int
 from .utils import supertrend
 
 """
@@ -65,18 +67,29 @@ Example Configuration:
 """
 
 
+def normalize(options: dict[str, Any]) -> dict[str, Any]:
+    return dict(
+        options,
+        factor=positive_float(options, "factor", default=3.0),
+        atr_length=positive_int(options, "atr_length", "period", default=10),
+        width=positive_float(options, "width", default=1.2),
+    )
+
+
 def apply(
     df,
     plot_args: dict[str, Any],
     options: dict[str, Any],
     display_period: int,
 ) -> None:
-    factor = int(options.get("factor", 3))
-    atr_length = int(options.get("atr_length", options.get("period", 10)))
+    factor = options["factor"]
+    atr_length = options["atr_length"]
 
     up_color = options.get("up_color", "mediumseagreen")
     down_color = options.get("down_color", "crimson")
-    width = float(options.get("width", 1.2))
+    width = options["width"]
+
+    compute = options.get("compute") or ComputeContext(df)
 
     trend, direction = supertrend(
         high=df.High,
@@ -84,6 +97,7 @@ def apply(
         close=df.Close,
         factor=factor,
         atr_length=atr_length,
+        true_range=compute.true_range(),
     )
 
     uptrend = trend.where(direction == 1)
@@ -94,7 +108,7 @@ def apply(
         [
             make_addplot(
                 uptrend.iloc[-display_period:],
-                label=f"Supertrend {factor}, {atr_length}",
+                label=f"Supertrend {factor:g}, {atr_length}",
                 color=up_color,
                 width=width,
                 secondary_y=False,
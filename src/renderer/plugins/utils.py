@@ -1,6 +1,18 @@
 import numpy as np
 import pandas as pd
 
+# Optional accelerators. Without them, the same results are computed
+# with pandas and a pure-Python loop.
+try:
+    from scipy.signal import lfilter
+except ModuleNotFoundError:
+    lfilter = None
+
+try:
+    from numba import njit
+except ModuleNotFoundError:
+    njit = None
+
 
 def simple_moving_average(source: pd.Series, length: int) -> pd.Series:
     return source.rolling(length).mean()
@@ -33,21 +45,37 @@ def wilders_moving_average(source: pd.Series, length: int) -> pd.Series:
         )
 
     # Wilder's initial seed is an SMA.
-    result[length - 1] = initial_window.mean()
+    seed = initial_window.mean()
+    result[length - 1] = seed
+
+    # Data gaps require a new seed; this implementation does not
+    # silently bridge them. All values from the first gap remain NaN.
+    tail = values[length:]
+    gaps = np.flatnonzero(np.isnan(tail))
+    stop = len(tail) if gaps.size == 0 else gaps[0]
+
+    if stop:
+        result[length : length + stop] = _wilders_recursion(
+            tail[:stop], seed, 1.0 / length
+        )
 
-    alpha = 1.0 / length
+    return pd.Series(result, index=source.index, name=source.name)
 
-    for i in range(length, len(values)):
-        if np.isnan(values[i]):
-            result[i] = np.nan
-        elif np.isnan(result[i - 1]):
-            # Data gaps require a new seed; this implementation does not
-            # silently bridge them.
-            result[i] = np.nan
-        else:
-            result[i] = result[i - 1] + alpha * (values[i] - result[i - 1])
 
-    return pd.Series(result, index=source.index, name=source.name)
+def _wilders_recursion(values: np.ndarray, seed: float, alpha: float) -> np.ndarray:
+    """
+    Apply result[i] = result[i - 1] + alpha * (values[i] - result[i - 1]),
+    starting from seed. values must not contain NaN.
+    """
+    if lfilter is not None:
+        # First order IIR filter: y[n] = alpha * x[n] + (1 - alpha) * y[n - 1]
+        decay = 1.0 - alpha
+        result, _ = lfilter([alpha], [1.0, -decay], values, zi=[decay * seed])
+        return result
+
+    seeded = np.concatenate(([seed], values))
+
+    return pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean().to_numpy()[1:]
 
 
 def average_true_range(
@@ -138,10 +166,13 @@ def supertrend(
     close: pd.Series,
     factor: float = 3.0,
     atr_length: int = 10,
+    true_range: pd.Series | None = None,
 ) -> tuple[pd.Series, pd.Series]:
     """
     Calculate the Supertrend indicator.
 
+    A precomputed true range may be passed to avoid recalculating it.
+
     Direction:
         1  = upward trend
         -1 = downward trend
@@ -169,21 +200,24 @@ def supertrend(
             pd.Series(direction_values, index=index, name="direction"),
         )
 
-    # Calculate true range without constructing a temporary DataFrame.
-    previous_close = np.empty(size, dtype=np.float64)
-    previous_close[0] = np.nan
-    previous_close[1:] = close_values[:-1]
-
-    true_range = np.fmax.reduce(
-        (
-            high_values - low_values,
-            np.abs(high_values - previous_close),
-            np.abs(low_values - previous_close),
+    if true_range is None:
+        # Calculate true range without constructing a temporary DataFrame.
+        previous_close = np.empty(size, dtype=np.float64)
+        previous_close[0] = np.nan
+        previous_close[1:] = close_values[:-1]
+
+        tr_values = np.fmax.reduce(
+            (
+                high_values - low_values,
+                np.abs(high_values - previous_close),
+                np.abs(low_values - previous_close),
+            )
         )
-    )
+    else:
+        tr_values = true_range.to_numpy(dtype=np.float64, copy=False)
 
     atr_values = (
-        pd.Series(true_range, index=index)
+        pd.Series(tr_values, index=index)
         .ewm(alpha=1.0 / atr_length, adjust=False)
         .mean()
         .to_numpy()
@@ -193,6 +227,33 @@ def supertrend(
     basic_upper = midpoint + factor * atr_values
     basic_lower = midpoint - factor * atr_values
 
+    supertrend_values, direction_values = _supertrend_kernel(
+        basic_upper, basic_lower, close_values, atr_values
+    )
+
+    return (
+        pd.Series(supertrend_values, index=index, name="supertrend"),
+        pd.Series(direction_values, index=index, name="direction"),
+    )
+
+
+def _supertrend_loop(
+    basic_upper: np.ndarray,
+    basic_lower: np.ndarray,
+    close_values: np.ndarray,
+    atr_values: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Recursive part of the Supertrend calculation.
+
+    Compiled with numba when it is installed. Keep this function to
+    plain loops and NumPy scalars, so it stays numba compatible.
+    """
+    size = close_values.shape[0]
+
+    supertrend_values = np.full(size, np.nan)
+    direction_values = np.full(size, np.nan)
+
     previous_final_upper = basic_upper[0]
     previous_final_lower = basic_lower[0]
 
@@ -238,7 +299,9 @@ def supertrend(
         previous_final_upper = final_upper
         previous_final_lower = final_lower
 
-    return (
-        pd.Series(supertrend_values, index=index, name="supertrend"),
-        pd.Series(direction_values, index=index, name="direction"),
-    )
+    return supertrend_values, direction_values
+
+
+_supertrend_kernel = (
+    _supertrend_loop if njit is None else njit(cache=True)(_supertrend_loop)
+)
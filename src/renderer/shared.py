@@ -0,0 +1,170 @@
+"""Read-only reference data shared with batch render workers.
+
+Pickling a pandas object into every ProcessPoolExecutor task copies it once
+per task. The classes below place the index and column values in a single
+``multiprocessing.shared_memory`` block. Only a small handle is pickled and
+workers attach to the block without copying the data.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Keep every array in the block 8 byte aligned
+_ALIGN = 8
+
+
+@dataclass(frozen=True, slots=True)
+class _ColumnSpec:
+    name: str
+    dtype: str
+    offset: int
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without registering it for cleanup.
+
+    Only the owning process may unlink the block. Python >= 3.13 supports
+    ``track=False``; older versions fall back to the default behaviour.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedFrame:
+    """A read-only DataFrame stored in shared memory.
+
+    The process that creates the SharedFrame owns the memory block and must
+    call `unlink` once all workers are done. Unpickled copies in worker
+    processes attach to the same block and return zero-copy views.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise TypeError("SharedFrame requires a DatetimeIndex")
+
+        index = df.index.as_unit("ns").asi8
+
+        arrays = [index]
+        specs: list[_ColumnSpec] = []
+        offset = _aligned(index.nbytes)
+
+        for col in df.columns:
+            values = np.ascontiguousarray(df[col].to_numpy())
+
+            if values.dtype == object:
+                raise TypeError(f"Column {col} must be numeric to be shared")
+
+            specs.append(_ColumnSpec(name=col, dtype=values.dtype.str, offset=offset))
+            arrays.append(values)
+            offset += _aligned(values.nbytes)
+
+        self._shm: shared_memory.SharedMemory | None = shared_memory.SharedMemory(
+            create=True, size=max(offset, 1)
+        )
+
+        self._owner = True
+        self._name = self._shm.name
+        self._length = len(index)
+        self._index_name = df.index.name
+        self._columns = specs
+        self._frame: pd.DataFrame | None = None
+
+        buf = self._shm.buf
+        position = 0
+
+        for arr in arrays:
+            buf[position : position + arr.nbytes] = arr.view(np.uint8).tobytes()
+            position += _aligned(arr.nbytes)
+
+    def __getstate__(self) -> dict:
+        return dict(
+            name=self._name,
+            length=self._length,
+            index_name=self._index_name,
+            columns=self._columns,
+        )
+
+    def __setstate__(self, state: dict) -> None:
+        self._name = state["name"]
+        self._length = state["length"]
+        self._index_name = state["index_name"]
+        self._columns = state["columns"]
+        self._owner = False
+        self._shm = None
+        self._frame = None
+
+    def get(self) -> pd.DataFrame:
+        """Return the DataFrame view, attaching to the block on first call."""
+        if self._frame is not None:
+            return self._frame
+
+        if self._shm is None:
+            self._shm = _attach(self._name)
+
+        buf = self._shm.buf
+        n = self._length
+
+        index = pd.DatetimeIndex(
+            np.ndarray(n, dtype="M8[ns]", buffer=buf),
+            name=self._index_name,
+        )
+
+        data = {}
+
+        for spec in self._columns:
+            arr = np.ndarray(
+                n, dtype=np.dtype(spec.dtype), buffer=buf, offset=spec.offset
+            )
+            arr.flags.writeable = False
+            data[spec.name] = arr
+
+        self._frame = pd.DataFrame(data, index=index, copy=False)
+        return self._frame
+
+    def close(self) -> None:
+        """Detach from the memory block in this process."""
+        self._frame = None
+
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def unlink(self) -> None:
+        """Close and free the memory block. Only valid in the owning process."""
+        if not self._owner:
+            raise RuntimeError("Only the owning process can unlink shared memory")
+
+        if self._shm is None:
+            self._shm = _attach(self._name)
+
+        shm = self._shm
+
+        try:
+            self.close()
+        except BufferError:
+            # Views are still alive in this process. The name is removed now
+            # and the memory is released once those views are collected.
+            self._shm = None
+
+        shm.unlink()
+
+
+class SharedSeries(SharedFrame):
+    """A read-only Series stored in shared memory."""
+
+    def __init__(self, series: pd.Series) -> None:
+        super().__init__(series.to_frame(name=series.name))
+
+    def get(self) -> pd.Series:  # type: ignore[override]
+        return super().get().iloc[:, 0]
+
+
+def _aligned(nbytes: int) -> int:
+    return (nbytes + _ALIGN - 1) // _ALIGN * _ALIGN
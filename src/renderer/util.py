@@ -1,13 +1,14 @@
-import functools
+from __future__ import annotations
+
 import json
 import random
 import string
-import time
 from datetime import datetime
 from pathlib import Path
 
 import matplotlib.dates as mdates
 import matplotlib.ticker as ticker
+import numpy as np
 import pandas as pd
 from matplotlib.axes import Axes
 
@@ -30,6 +31,22 @@ def write_json(fpath: Path, data):
     )
 
 
+def addplot_nbytes(addplot: dict) -> int:
+    """Return the size in bytes of the data in an mplfinance addplot dict."""
+    data = addplot.get("data")
+
+    if isinstance(data, pd.Series):
+        return int(data.memory_usage(deep=True))
+
+    if isinstance(data, pd.DataFrame):
+        return int(data.memory_usage(deep=True).sum())
+
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+
+    return 0
+
+
 def index_to_iso(x: float, index: pd.DatetimeIndex) -> str:
     return index[round(x)].date().isoformat()
 
@@ -46,36 +63,53 @@ def iso_to_index(date: str, index: pd.DatetimeIndex) -> float:
     return float(index.get_indexer([ts], method="nearest")[0])
 
 
-def randomChar(length):
-    return "".join(random.choice(string.ascii_lowercase) for _ in range(length))
+def iso_to_positions(dates: list[str], index: pd.DatetimeIndex) -> np.ndarray:
+    """Map ISO dates to bar positions in index with one searchsorted call.
 
+    Dates that are not a bar in index map to -1.
+    """
+    if not dates:
+        return np.empty(0, dtype=np.intp)
 
-def debounce(interval: float = 0.025):
-    """Decorator that skips calls made within `interval` seconds.
+    values = index.values.astype("datetime64[ns]")
+    targets = np.array(dates, dtype="datetime64[ns]")
+
+    pos = np.searchsorted(values, targets)
+    found = pos < len(values)
+    found[found] = values[pos[found]] == targets[found]
+
+    return np.where(found, pos, -1)
 
-    If a call is skipped, the most recent result is returned.
-    """
 
-    def decorator(func):
-        last_call = 0.0
-        last_result = None
+def bar_labels(
+    df: pd.DataFrame,
+    fields: list[tuple[str, str, str]],
+    separator: str = " " * 5,
+) -> list[str]:
+    """Format the status bar text of every bar once per chart.
 
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            nonlocal last_call, last_result
+    Args:
+        df: Displayed bars
+        fields: (column, label, format spec) in display order. Columns
+            missing from df are skipped.
+        separator: Placed between the date and each field
 
-            now = time.monotonic()
+    Returns:
+        One string per bar, so a format_coord callback is a list lookup.
+    """
+    parts = [np.char.upper(df.index.strftime("%d %b %Y").to_numpy(dtype=str))]
+
+    for column, label, spec in fields:
+        if column not in df.columns:
+            continue
 
-            if now - last_call < interval:
-                return last_result if last_result is not None else ""
+        parts.append([f"{label}: {value:{spec}}" for value in df[column].to_numpy()])
 
-            last_result = func(*args, **kwargs)
-            last_call = now
-            return last_result
+    return [separator.join(values) for values in zip(*parts)]
 
-        return wrapper
 
-    return decorator
+def randomChar(length):
+    return "".join(random.choice(string.ascii_lowercase) for _ in range(length))
 
 
 def setup_xaxis(ax: Axes, df: pd.DataFrame) -> None:
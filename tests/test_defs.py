@@ -1,5 +1,7 @@
+import tempfile
 import unittest
-from datetime import datetime
+import zipfile
+from datetime import date, datetime
 from pathlib import Path
 from unittest.mock import Mock, patch
 from zoneinfo import ZoneInfo
@@ -7,6 +9,8 @@ from zoneinfo import ZoneInfo
 import pandas as pd
 
 from context import defs
+from defs.symbol_tracker import SymbolTracker
+from defs.trading_calendar import TradingCalendar
 
 DIR = Path(__file__).parent / "test_data"
 tz_IN = ZoneInfo("Asia/Kolkata")
@@ -74,20 +78,29 @@ class TestGetHolidayList(unittest.TestCase):
 
 
 class TestCheckForHolidays(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+
+        self.calendar = TradingCalendar(Path(tmp.name) / "calendar")
+
+        patcher = patch.object(defs, "calendar", self.calendar)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     @patch.object(defs, "dates")
     @patch.object(defs, "getHolidayList")
     @patch.object(defs, "hasLatestHolidays", True)
     def test_is_muhurat(self, mock_get_holiday_list, _):
         defs.dates.dt = defs.dates.today = datetime(2023, 11, 12)
 
-        meta_obj = {"holidays": {"12-Nov-2023": "Laxmi Pujan"}, "year": 2023}
+        self.calendar.set_holidays(2023, {"12-Nov-2023": "Laxmi Pujan"})
 
         # Mock NSE class
         mock_nse = Mock()
 
         # Call the function
-        with patch.object(defs, "meta", meta_obj):
-            result = defs.checkForHolidays(mock_nse, defs.dates)
+        result = defs.checkForHolidays(mock_nse, defs.dates)
 
         self.assertFalse(result)
         mock_get_holiday_list.assert_not_called()
@@ -97,16 +110,29 @@ class TestCheckForHolidays(unittest.TestCase):
     def test_is_weekend(self, mock_get_holiday_list, _):
         defs.dates.dt = defs.dates.today = datetime(2023, 1, 1)
 
+        self.calendar.set_holidays(2023, {})
+
         # Mock NSE class
         mock_nse = Mock()
 
         # Call the function
-        with patch.object(defs, "meta", {"holidays": {}, "year": 2023}):
-            result = defs.checkForHolidays(mock_nse, defs.dates)
+        result = defs.checkForHolidays(mock_nse, defs.dates)
 
         self.assertTrue(result)
         mock_get_holiday_list.assert_not_called()
 
+    @patch.object(defs, "dates")
+    @patch.object(defs, "getHolidayList")
+    def test_saturday_without_holiday_list(self, mock_get_holiday_list, _):
+        """Saturdays are downloaded when the year has no holiday list"""
+        defs.dates.dt = datetime(2022, 1, 1)
+        defs.dates.today = datetime(2023, 1, 2)
+
+        result = defs.checkForHolidays(Mock(), defs.dates)
+
+        self.assertFalse(result)
+        mock_get_holiday_list.assert_not_called()
+
     @patch.object(defs, "dates")
     @patch.object(defs, "getHolidayList")
     @patch.object(defs, "hasLatestHolidays", False)
@@ -122,34 +148,35 @@ class TestCheckForHolidays(unittest.TestCase):
         mock_get_holiday_list.return_value = {}
 
         # Call the function
-        with patch.object(defs, "meta", {}):
-            result = defs.checkForHolidays(mock_nse, defs.dates)
+        result = defs.checkForHolidays(mock_nse, defs.dates)
 
         # Assertions
         self.assertFalse(result)
         mock_get_holiday_list.assert_called_once_with(mock_nse)
         mock_nse.holidays.assert_not_called()
 
+        # The holiday list is saved for the year
+        self.assertTrue(TradingCalendar(self.calendar.folder).has_year(2023))
+
     @patch.object(defs, "dates")
     @patch.object(defs, "getHolidayList")
     @patch.object(defs, "hasLatestHolidays", False)
     def test_holiday_not_today(self, mock_get_holiday_list, _):
         """Today's date and current date are different. Current date is a holiday."""
 
-        defs.dates.dt = datetime(2023, 1, 1)
-        defs.dates.today = datetime(2023, 1, 2)
+        defs.dates.dt = datetime(2023, 1, 26)
+        defs.dates.today = datetime(2023, 1, 27)
 
         # Mock NSE class
         mock_nse = Mock()
 
-        holiday_obj = {"01-Jan-2023": "New Year"}
-        meta_obj = {"holidays": holiday_obj, "year": 2023}
+        holiday_obj = {"26-Jan-2023": "Republic Day"}
+        self.calendar.set_holidays(2023, holiday_obj)
 
         # Set up mock for getHolidayList
         mock_get_holiday_list.return_value = holiday_obj
 
-        with patch.object(defs, "meta", meta_obj):
-            result = defs.checkForHolidays(mock_nse, defs.dates)
+        result = defs.checkForHolidays(mock_nse, defs.dates)
 
         self.assertTrue(result)
         mock_get_holiday_list.assert_called_once()
@@ -159,14 +186,36 @@ class TestCheckForHolidays(unittest.TestCase):
         dt = datetime(2024, 3, 16)
         defs.dates.dt = defs.dates.today = dt
 
+        self.calendar.set_holidays(2024, {})
+        self.calendar.add_special_session(dt.date())
+
         # Mock NSE class
         mock_nse = Mock()
 
-        with patch.object(defs, "meta", {"special_sessions": [dt.isoformat()]}):
-            result = defs.checkForHolidays(mock_nse, defs.dates)
+        result = defs.checkForHolidays(mock_nse, defs.dates)
 
         self.assertFalse(result)
 
+    def test_migrate_calendar_meta(self):
+        meta = dict(
+            lastUpdate="2023-01-25",
+            year=2023,
+            holidays={"26-Jan-2023": "Republic Day"},
+            special_sessions=["2023-03-18T00:00:00"],
+        )
+
+        with patch.object(defs, "meta", meta):
+            self.assertTrue(defs.migrateCalendarMeta())
+            self.assertFalse(defs.migrateCalendarMeta())
+
+        self.assertEqual(meta, dict(lastUpdate="2023-01-25"))
+
+        calendar = TradingCalendar(self.calendar.folder)
+
+        self.assertTrue(calendar.has_year(2023))
+        self.assertEqual(calendar.holiday(date(2023, 1, 26)), "Republic Day")
+        self.assertTrue(calendar.is_trading_day(date(2023, 3, 18)))
+
 
 class TestValidateNseActionsFile(unittest.TestCase):
     @patch.object(defs, "meta", {})
@@ -312,23 +361,27 @@ class TestUpdateNseEOD(unittest.TestCase):
         self.bhav_folder = DIR / f"nseBhav/{year}"
         self.dlv_folder = DIR / f"nseDelivery/{year}"
 
-    def tearDown(self) -> None:
-        bhav_file = self.bhav_folder / "bhav_copy.csv"
-        dlv_file = self.dlv_folder / "delivery_data.csv"
+        # In memory, so the symbol history in eod2_data is not touched
+        patcher = patch.object(defs, "tracker", SymbolTracker())
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
-        bhav_file.unlink()
-        dlv_file.unlink()
+    def tearDown(self) -> None:
+        # Reports are archived in monthly zip files
+        for folder in (self.bhav_folder, self.dlv_folder):
+            archive = next(folder.glob("*.zip"))
 
-        bhav_file.parents[0].rmdir()
-        bhav_file.parents[1].rmdir()
+            with zipfile.ZipFile(archive) as zf:
+                self.assertEqual(len(zf.namelist()), 1)
 
-        dlv_file.parents[0].rmdir()
-        dlv_file.parents[1].rmdir()
+            archive.unlink()
+            folder.rmdir()
+            folder.parent.rmdir()
 
     @patch.multiple(
         defs,
         DIR=DIR,
-        isin=pd.read_csv(DIR / "isin.csv", index_col="ISIN"),
+        isin=defs.loadIsinMap(DIR / "isin.csv"),
         ISIN_FILE=DIR / "isin.csv",
         DAILY_FOLDER=DIR,
     )
@@ -369,6 +422,207 @@ class TestUpdateNseEOD(unittest.TestCase):
             self.assertTrue(args[1] in ("EQ", "BE", "BZ", "SM", "ST"))
             self.assertEqual(args[2:], expected_args)
 
+    @patch.multiple(defs, DIR=DIR, ISIN_FILE=DIR / "isin.csv", DAILY_FOLDER=DIR)
+    @patch.object(defs, "config")
+    @patch.object(defs, "writeIsinMap")
+    @patch.object(defs, "updateNseSymbol")
+    def test_updateNseEOD_isin_unchanged(
+        self, mock_update_nse_symbol, mock_write_isin, mock_config
+    ):
+        mock_config.AMIBROKER = False
+
+        with patch.object(defs, "isin", defs.loadIsinMap(DIR / "isin.csv")):
+            defs.updateNseEOD(self.bhav_file_path, self.delivery_file_path)
+
+        mock_write_isin.assert_not_called()
+
+    @patch.multiple(defs, DIR=DIR, ISIN_FILE=DIR / "isin.csv", DAILY_FOLDER=DIR)
+    @patch.object(defs, "config")
+    @patch.object(defs, "writeIsinMap")
+    @patch.object(defs, "updateNseSymbol")
+    def test_updateNseEOD_isin_rename_and_listing(
+        self, mock_update_nse_symbol, mock_write_isin, mock_config
+    ):
+        mock_config.AMIBROKER = False
+
+        isin_map = defs.loadIsinMap(DIR / "isin.csv")
+        isin_map["ISIN1"] = "OLDBOB"
+        del isin_map["ISIN2"]
+
+        with patch.object(defs, "isin", isin_map), patch.object(
+            defs.logger, "warning"
+        ) as mock_warning:
+            defs.updateNseEOD(self.bhav_file_path, self.delivery_file_path)
+
+        self.assertEqual(isin_map["ISIN1"], "BOB")
+        self.assertEqual(isin_map["ISIN2"], "JAM")
+
+        mock_warning.assert_any_call("Name Changed: oldbob to bob")
+        mock_write_isin.assert_called_once_with(DIR / "isin.csv", isin_map)
+
+        # Daily file is written under the new name
+        self.assertEqual(
+            mock_update_nse_symbol.call_args_list[0].args[0].name, "bob.csv"
+        )
+
+    @patch.multiple(defs, DIR=DIR, ISIN_FILE=DIR / "isin.csv", DAILY_FOLDER=DIR)
+    @patch.object(defs, "config")
+    @patch.object(defs, "writeIsinMap")
+    @patch.object(defs, "updateNseSymbol")
+    def test_updateNseEOD_batch_hook(
+        self, mock_update_nse_symbol, mock_write_isin, mock_config
+    ):
+        mock_config.AMIBROKER = False
+
+        hook = Mock(spec=["on_eod_batch"])
+
+        with patch.multiple(defs, isin=defs.loadIsinMap(DIR / "isin.csv"), hook=hook):
+            defs.updateNseEOD(self.bhav_file_path, self.delivery_file_path)
+
+        hook.on_eod_batch.assert_called_once()
+
+        dt, df = hook.on_eod_batch.call_args.args
+
+        self.assertEqual(dt, defs.dates.dt)
+        self.assertEqual(list(df.index), ["bob", "jam", "jax", "fax_sme", "kax_sme"])
+        self.assertEqual(list(df.columns), defs.STOCK_COLUMNS)
+        self.assertEqual(list(df["Close"]), [100, 200, 300, 400, 500])
+
+        # One call per symbol, as before
+        self.assertEqual(mock_update_nse_symbol.call_count, 5)
+
+
+class TestUpdateIndexEOD(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.dir = Path(self.tmp.name)
+        self.file = self.dir / "ind_close_all_02012024.csv"
+
+        self.file.write_text(
+            "Index Name,Index Date,Open Index Value,High Index Value,"
+            "Low Index Value,Closing Index Value,Points Change,Change(%),Volume,"
+            "Turnover (Rs. Cr.),P/E,P/B,Div Yield\n"
+            "Nifty 50,02-01-2024,100,110,90,105,1,1,1000,10,22.5,3,1\n"
+            "Nifty50 USD,02-01-2024,-,-,-,105,1,1,-,-,-,-,-\n"
+            "NIFTY50 Div Point,02-01-2024,5,5,5,5,1,1,-,-,-,-,-\n"
+        )
+
+    def test_batch_hook(self):
+        hook = Mock(spec=["updateIndice", "on_index_batch"])
+
+        with patch.multiple(
+            defs,
+            DIR=self.dir,
+            DAILY_FOLDER=self.dir,
+            hook=hook,
+            dates=Mock(dt=datetime(2024, 1, 2), pandasDt="2024-01-02"),
+        ):
+            defs.updateIndexEOD(self.file)
+
+        # Per-symbol hook remains
+        self.assertEqual(hook.updateIndice.call_count, 3)
+
+        hook.on_index_batch.assert_called_once()
+
+        dt, df = hook.on_index_batch.call_args.args
+
+        self.assertEqual(dt, datetime(2024, 1, 2))
+        self.assertEqual(
+            list(df.index), ["Nifty 50", "Nifty50 USD", "NIFTY50 Div Point"]
+        )
+        self.assertEqual(
+            list(df.columns), ["Open", "High", "Low", "Close", "Volume", "P/E"]
+        )
+        self.assertEqual(df.at["Nifty 50", "P/E"], 22.5)
+        self.assertTrue(pd.isna(df.at["Nifty50 USD", "Open"]))
+
+
+class TestUpdateAmiBrokerRecords(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.dir = Path(self.tmp.name)
+        self.ami_folder = self.dir / "amibroker"
+        self.ami_folder.mkdir()
+
+        self.bhav = (
+            b"TradDt,ISIN,TckrSymb,SctySrs,OpnPric,HghPric,LwPric,ClsPric,TtlTradgVol\n"
+            b"2024-01-02,ISIN1,BOB,EQ,100,100,100,100,1000\n"
+            b"2024-01-02,ISIN2,JAM,SM,200,200,200,200,2000\n"
+            b"2024-01-02,ISIN3,GOI,GS,300,300,300,300,3000\n"
+        )
+
+    def download(self, dt: datetime) -> Path:
+        file = self.dir / f"BhavCopy_NSE_CM_0_0_0_{dt:%Y%m%d}_F_0000.csv"
+        file.write_bytes(self.bhav)
+        return file
+
+    @patch.object(defs, "config")
+    def test_archived_reports_are_reused(self, mock_config):
+        mock_config.AMI_UPDATE_DAYS = 7
+        mock_config.AMI_DOWNLOAD_WORKERS = 4
+
+        # Mon 1 Jan 2024 to Sun 7 Jan 2024, one report archived
+        archive = defs.ReportArchive(self.dir / "nseBhav")
+        archive.add(datetime(2024, 1, 2), "archived.csv", self.bhav)
+
+        nse = Mock()
+        nse.equityBhavcopy.side_effect = self.download
+
+        with patch.multiple(
+            defs,
+            DIR=self.dir,
+            AMIBROKER_FOLDER=self.ami_folder,
+            meta=dict(lastUpdate="2024-01-06"),
+        ):
+            defs.updateAmiBrokerRecords(nse)
+
+        self.assertEqual(
+            sorted(call.args[0].day for call in nse.equityBhavcopy.call_args_list),
+            [1, 3, 4, 5],
+        )
+
+        files = sorted(p.name for p in self.ami_folder.iterdir())
+
+        self.assertEqual(len(files), 5)
+        self.assertIn("archived.csv", files)
+
+        # Downloads are archived and removed
+        self.assertEqual(len(archive.dates()), 5)
+        self.assertFalse(any(self.dir.glob("*.csv")))
+
+        df = pd.read_csv(self.ami_folder / "archived.csv")
+
+        self.assertEqual(
+            list(df.columns),
+            ["SYMBOL", "DATE", "OPEN", "HIGH", "LOW", "CLOSE", "VOLUME", "ISIN"],
+        )
+
+        # Only EQ, BE, BZ, SM and ST series are allowed
+        self.assertEqual(list(df["SYMBOL"]), ["BOB", "JAM"])
+
+    @patch.object(defs, "config")
+    def test_missing_reports_are_skipped(self, mock_config):
+        mock_config.AMI_UPDATE_DAYS = 3
+        mock_config.AMI_DOWNLOAD_WORKERS = 2
+
+        nse = Mock()
+        nse.equityBhavcopy.side_effect = RuntimeError("Holiday")
+
+        with patch.multiple(
+            defs,
+            DIR=self.dir,
+            AMIBROKER_FOLDER=self.ami_folder,
+            meta=dict(lastUpdate="2024-01-03"),
+        ):
+            defs.updateAmiBrokerRecords(nse)
+
+        self.assertEqual(nse.equityBhavcopy.call_count, 3)
+        self.assertFalse(any(self.ami_folder.iterdir()))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import context  # noqa: F401
+from defs import diagnostic
+
+HEADER = "Date,Open,High,Low,Close,Volume,Series,TOTAL_TRADES,QTY_PER_TRADE,DLV_QTY\n"
+
+
+def row(date: str, o=100, h=110, lo=90, c=105) -> str:
+    return f"{date},{o},{h},{lo},{c},1000,EQ,10,100.0,500\n"
+
+
+GOOD = HEADER + row("2024-01-01") + row("2024-01-02") + row("2024-01-03")
+
+
+class TestCheckFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+
+    def check(self, text: str, name: str = "abc.csv") -> dict:
+        file = self.dir / name
+        file.write_text(text)
+
+        result = diagnostic.check_file(file, jump=0.5)
+        return {item["check"]: item for item in result["issues"]}
+
+    def test_valid_file(self):
+        self.assertEqual(self.check(GOOD), {})
+
+    def test_ohlc_inconsistency(self):
+        issues = self.check(
+            HEADER
+            + row("2024-01-01")
+            + row("2024-01-02", h=101, c=105)
+            + row("2024-01-03", lo=104, o=103)
+        )
+
+        self.assertEqual(issues["ohlc"]["dates"], ["2024-01-02", "2024-01-03"])
+
+    def test_unsorted_and_duplicates(self):
+        issues = self.check(
+            HEADER + row("2024-01-02") + row("2024-01-01") + row("2024-01-01")
+        )
+
+        self.assertEqual(issues["unsorted"]["dates"], ["2024-01-01"])
+        self.assertEqual(issues["duplicates"]["dates"], ["2024-01-01"])
+
+    def test_jump(self):
+        issues = self.check(
+            HEADER
+            + row("2024-01-01", o=1000, h=1100, lo=900, c=1000)
+            + row("2024-01-02", o=200, h=220, lo=180, c=200)
+        )
+
+        self.assertEqual(issues["jump"]["dates"], ["2024-01-02"])
+
+    def test_nan_and_read_errors(self):
+        issues = self.check(HEADER + row("2024-01-01") + row("2024-01-02", c=""))
+
+        self.assertEqual(issues["nan"]["dates"], ["2024-01-02"])
+        self.assertIn("read_error", self.check("not,a\ncsv"))
+
+    def test_empty(self):
+        self.assertIn("empty", self.check(HEADER))
+
+
+class TestRun(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.daily = Path(self.tmp.name) / "daily"
+        self.daily.mkdir()
+        self.cache = Path(self.tmp.name) / "integrity_cache.json"
+
+        (self.daily / "good.csv").write_text(GOOD)
+        (self.daily / "bad.csv").write_text(GOOD + row("2024-01-03"))
+
+    def run_check(self, **kwargs):
+        return diagnostic.run(self.daily, self.cache, jump=0.5, jobs=1, **kwargs)
+
+    def test_reports_all_errors(self):
+        report = self.run_check()
+
+        self.assertEqual(report["files"], 2)
+        self.assertEqual(report["checked"], 2)
+        self.assertEqual(list(report["errors"]), ["bad.csv"])
+
+    def test_unchanged_files_are_skipped(self):
+        self.run_check()
+
+        # Touched but identical content is not checked again
+        stat = (self.daily / "good.csv").stat()
+        os.utime(
+            self.daily / "good.csv", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9)
+        )
+
+        report = self.run_check()
+
+        self.assertEqual(report["checked"], 0)
+        self.assertEqual(list(report["errors"]), ["bad.csv"])
+
+        (self.daily / "bad.csv").write_text(GOOD)
+        report = self.run_check()
+
+        self.assertEqual(report["checked"], 1)
+        self.assertEqual(report["errors"], {})
+
+    def test_full_checks_all_files(self):
+        self.run_check()
+
+        self.assertEqual(self.run_check(full=True)["checked"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock
+
+import context  # noqa: F401
+from defs.download_cache import DownloadCache
+
+DT = datetime(2024, 1, 2)
+
+
+class TestDownloadCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.dir = Path(self.tmp.name)
+        self.folder = self.dir / "downloads"
+        self.cache = DownloadCache(self.folder)
+
+    def download(self, name="report.csv", text="SYMBOL,CLOSE\nTCS,100\n") -> Mock:
+        def func():
+            file = self.dir / name
+            file.write_text(text)
+            return file
+
+        return Mock(side_effect=func)
+
+    def test_fetch_downloads_once(self):
+        download = self.download()
+
+        file = self.cache.fetch("equity", DT, download)
+
+        self.assertEqual(file.name, "report.csv")
+        self.assertFalse((self.dir / "report.csv").exists())
+
+        # A new instance, as after a failed sync
+        cache = DownloadCache(self.folder)
+
+        self.assertEqual(cache.fetch("equity", DT, download), file)
+        self.assertEqual(download.call_count, 1)
+        self.assertIsNone(cache.get("indices", DT))
+        self.assertIsNone(cache.get("equity", datetime(2024, 1, 3)))
+
+    def test_download_error_is_raised(self):
+        download = Mock(side_effect=RuntimeError("Not yet updated"))
+
+        with self.assertRaises(RuntimeError):
+            self.cache.fetch("equity", DT, download)
+
+        self.assertEqual(self.cache.index, {})
+
+    def test_corrupt_report_is_downloaded_again(self):
+        download = self.download()
+        file = self.cache.fetch("equity", DT, download)
+
+        file.write_text("SYMBOL,CLOSE\nTCS,999\n")
+
+        self.assertIsNone(self.cache.get("equity", DT))
+        self.cache.fetch("equity", DT, download)
+
+        self.assertEqual(download.call_count, 2)
+
+    def test_discard(self):
+        file = self.cache.fetch("equity", DT, self.download())
+
+        # Same content cached under another key
+        other = self.cache.fetch("delivery", DT, self.download())
+
+        self.cache.discard("equity", DT)
+
+        self.assertTrue(other.is_file())
+        self.assertIsNone(DownloadCache(self.folder).get("equity", DT))
+
+        self.cache.discard("delivery", DT)
+        self.cache.discard("delivery", DT)
+
+        self.assertFalse(file.parent.exists())
+        self.assertEqual(DownloadCache(self.folder).index, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
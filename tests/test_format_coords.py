@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import context  # noqa: F401
+from renderer.candle_render import CandlestickRenderer
+from renderer.util import bar_labels
+
+
+def make_df(days: int = 20) -> pd.DataFrame:
+    index = pd.bdate_range("2024-01-01", periods=days)
+    close = np.round(np.linspace(100, 120, days), 2)
+
+    return pd.DataFrame(
+        dict(
+            Open=close - 1,
+            High=close + 2,
+            Low=close - 2,
+            Close=close,
+            Volume=np.arange(days) * 12345.0,
+            RS=np.round(np.linspace(0.5, 1.5, days), 2),
+        ),
+        index=index,
+    )
+
+
+def expected_text(df: pd.DataFrame, i: int, y: float) -> str:
+    s = " " * 5
+    dt = df.index[i]
+    o, h, lo, c, v, rs = df.iloc[i][["Open", "High", "Low", "Close", "Volume", "RS"]]
+
+    return (
+        f"{dt:%d %b %Y}".upper()
+        + f"{s}O: {o}{s}H: {h}{s}L: {lo}{s}C: {c}{s}V: {v:,.0f}{s}RS: {rs}{s}Y: {y:.2f}"
+    )
+
+
+class TestFormatCoords(unittest.TestCase):
+    def test_matches_row_formatting(self):
+        df = make_df()
+        format_coords = CandlestickRenderer()._make_format_coords(df)
+
+        for i in (0, 7, len(df) - 1):
+            self.assertEqual(
+                format_coords(i + 0.3, 101.456), expected_text(df, i, 101.456)
+            )
+
+    def test_out_of_range(self):
+        df = make_df()
+        format_coords = CandlestickRenderer()._make_format_coords(df)
+
+        self.assertEqual(format_coords(-1, 100), "")
+        self.assertEqual(format_coords(len(df), 100), "")
+
+    def test_prefers_mrs(self):
+        df = make_df().assign(M_RS=0.25)
+        format_coords = CandlestickRenderer()._make_format_coords(df)
+
+        text = format_coords(0, 100)
+
+        self.assertIn("MRS: 0.25", text)
+        self.assertNotIn(" RS: ", text)
+
+    def test_bar_labels_skips_missing_columns(self):
+        df = make_df(2)
+
+        labels = bar_labels(df, [("Close", "C", ".1f"), ("PCT_50", "X", "")], "|")
+
+        self.assertEqual(labels, ["01 JAN 2024|C: 100.0", "02 JAN 2024|C: 120.0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
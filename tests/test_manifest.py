@@ -0,0 +1,117 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import context  # noqa: F401
+from defs.manifest import Manifest, rolling_checksum
+
+HEADER = "Date,Open,High,Low,Close\n"
+
+
+def row(date: str, close=105) -> str:
+    return f"{date},100,110,90,{close}\n"
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.dir = Path(self.tmp.name)
+        self.daily = self.dir / "daily"
+        self.daily.mkdir()
+
+        (self.daily / "abc.csv").write_text(HEADER + row("2024-01-01"))
+        (self.daily / "xyz.csv").write_text(HEADER + row("2024-01-01"))
+
+        self.manifest = Manifest(self.dir / "manifest.json")
+        self.manifest.update(self.daily)
+
+    def checksum(self, name: str) -> str:
+        return self.manifest.files[name]["checksum"]
+
+    def test_rolling_matches_full_hash(self):
+        data = (HEADER + row("2024-01-01") + row("2024-01-02")).encode()
+        head = (HEADER + row("2024-01-01")).encode()
+
+        self.assertEqual(
+            rolling_checksum(data),
+            rolling_checksum(row("2024-01-02").encode(), rolling_checksum(head)),
+        )
+
+    def test_append_is_rolled(self):
+        with (self.daily / "abc.csv").open("a") as f:
+            f.write(row("2024-01-02"))
+
+        self.assertEqual(self.manifest.update(self.daily), 0)
+
+        self.assertEqual(
+            self.checksum("abc.csv"),
+            rolling_checksum((self.daily / "abc.csv").read_bytes()),
+        )
+
+    def test_rewrite_is_hashed_in_full(self):
+        file = self.daily / "abc.csv"
+        file.write_text(HEADER + row("2024-01-01", close=52) + row("2024-01-02"))
+
+        self.assertEqual(self.manifest.update(self.daily), 1)
+        self.assertEqual(self.checksum("abc.csv"), rolling_checksum(file.read_bytes()))
+
+    def test_invalidate(self):
+        file = self.daily / "abc.csv"
+        stat = file.stat()
+
+        # Same size and modification time after an in-place rewrite
+        file.write_text(HEADER + row("2024-01-01", close=106))
+        os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.manifest.invalidate("abc.csv")
+
+        self.assertEqual(self.manifest.update(self.daily), 1)
+        self.assertEqual(self.checksum("abc.csv"), rolling_checksum(file.read_bytes()))
+
+    def test_rename_and_remove(self):
+        checksum = self.checksum("abc.csv")
+
+        (self.daily / "abc.csv").rename(self.daily / "abc_sme.csv")
+        (self.daily / "xyz.csv").unlink()
+
+        self.manifest.update(self.daily)
+
+        self.assertEqual(list(self.manifest.files), ["abc_sme.csv"])
+        self.assertEqual(self.checksum("abc_sme.csv"), checksum)
+
+    def test_save_and_verify(self):
+        self.manifest.save()
+        loaded = Manifest(self.dir / "manifest.json")
+
+        self.assertEqual(loaded.files, self.manifest.files)
+        self.assertFalse(any(loaded.verify(self.daily).values()))
+
+        (self.daily / "xyz.csv").write_text(HEADER + row("2024-01-01", close=106))
+        (self.daily / "abc.csv").unlink()
+        (self.daily / "new.csv").write_text(HEADER)
+
+        self.assertEqual(
+            loaded.verify(self.daily),
+            dict(changed=["xyz.csv"], missing=["abc.csv"], extra=["new.csv"]),
+        )
+
+    def test_diff(self):
+        other_dir = self.dir / "other"
+        other_dir.mkdir()
+
+        (other_dir / "abc.csv").write_text(HEADER + row("2024-01-01"))
+        (other_dir / "xyz.csv").write_text(HEADER)
+
+        other = Manifest(other_dir / "manifest.json")
+        other.update(other_dir)
+
+        self.assertEqual(
+            self.manifest.diff(other), dict(changed=["xyz.csv"], missing=[], extra=[])
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
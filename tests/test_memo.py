@@ -0,0 +1,112 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import context  # noqa: F401
+from renderer.dtypes import PlotCommand, PlotSource
+from renderer.memo import IndicatorMemo, plugin_changes
+
+
+def make_cmd(**kwargs) -> PlotCommand:
+    return PlotCommand(
+        source=PlotSource(kind="symbols", symbols=["tcs"]),
+        user_set_timeframe=False,
+        timeframe="d",
+        period=100,
+        **kwargs,
+    )
+
+
+def make_df(size: int = 200) -> pd.DataFrame:
+    close = np.linspace(100, 200, size)
+
+    return pd.DataFrame(
+        dict(Open=close, High=close + 1, Low=close - 1, Close=close),
+        index=pd.date_range("2024-01-01", periods=size, name="Date"),
+    )
+
+
+class TestIndicatorMemo(unittest.TestCase):
+    def setUp(self):
+        self.df = make_df()
+        self.memo = IndicatorMemo(make_cmd(sma=[20]), max_bytes=1024 * 1024)
+
+    def test_hit_on_revisit(self):
+        key = self.memo.key("TCS", self.df)
+        self.assertIsNone(self.memo.get(key))
+
+        self.memo.put(key, self.df, dict(addplot=[dict(data=self.df.Close)]))
+
+        entry = self.memo.get(self.memo.key("tcs", self.df.copy()))
+
+        self.assertIsNotNone(entry)
+        self.assertIs(entry.df, self.df)
+        self.assertEqual(len(entry.plot_args["addplot"]), 1)
+        self.assertEqual((self.memo.hits, self.memo.misses), (1, 1))
+
+    def test_miss_on_changed_data(self):
+        self.memo.put(self.memo.key("tcs", self.df), self.df)
+
+        changed = self.df.copy()
+        changed.iloc[-1, 3] += 1
+
+        self.assertNotIn(self.memo.key("tcs", changed), self.memo)
+        self.assertNotIn(self.memo.key("tcs", self.df.iloc[1:]), self.memo)
+
+    def test_miss_on_changed_params(self):
+        key = self.memo.key("tcs", self.df)
+
+        for cmd in (
+            make_cmd(sma=[50]),
+            make_cmd(sma=[20], plugins={"ATR": {"period": 14}}),
+        ):
+            other = IndicatorMemo(cmd, max_bytes=1024 * 1024)
+            self.assertNotEqual(other.key("tcs", self.df), key)
+
+    def test_evict_least_recently_used(self):
+        size = int(self.df.memory_usage(deep=True).sum())
+        memo = IndicatorMemo(make_cmd(), max_bytes=size * 2)
+
+        keys = [memo.key(sym, self.df) for sym in ("a", "b", "c")]
+
+        memo.put(keys[0], self.df)
+        memo.put(keys[1], self.df)
+        memo.get(keys[0])
+        memo.put(keys[2], self.df)
+
+        self.assertIn(keys[0], memo)
+        self.assertNotIn(keys[1], memo)
+        self.assertIn(keys[2], memo)
+        self.assertLessEqual(memo.nbytes, memo.max_bytes)
+
+    def test_oversized_entry_not_stored(self):
+        memo = IndicatorMemo(make_cmd(), max_bytes=16)
+        key = memo.key("tcs", self.df)
+
+        entry = memo.put(key, self.df)
+
+        self.assertIs(entry.df, self.df)
+        self.assertEqual(len(memo), 0)
+        self.assertEqual(memo.nbytes, 0)
+
+    def test_replays_all_plugin_keys(self):
+        before = dict(type="candle", panel_ratios=(4, 1))
+
+        after = before.copy()
+        after["addplot"] = [dict(data=self.df.Close)]
+        after["panel_ratios"] = (4, 1, 1)
+        after["hlines"] = dict(hlines=[150])
+
+        key = self.memo.key("tcs", self.df)
+        self.memo.put(key, self.df, plugin_changes(before, after))
+
+        plot_args = before.copy()
+        self.memo.get(key).apply(plot_args)
+
+        self.assertEqual(plot_args, after)
+        self.assertNotIn("type", self.memo.get(key).plot_args)
+
+
+if __name__ == "__main__":
+    unittest.main()
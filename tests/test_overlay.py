@@ -0,0 +1,153 @@
+import unittest
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+import context  # noqa: F401
+from renderer.annotations import Drawing, DrawingCollection, DrawingManager
+from renderer.candle_render import CandlestickRenderer
+from renderer.util import iso_to_positions
+
+
+def make_df(days: int = 30) -> pd.DataFrame:
+    index = pd.bdate_range("2024-01-01", periods=days)
+    close = np.linspace(100, 130, days)
+
+    return pd.DataFrame(
+        dict(Open=close, High=close + 2, Low=close - 2, Close=close),
+        index=index,
+    )
+
+
+def drawing(kind, points, color="royalblue", url=None):
+    return Drawing(kind=kind, points=points, color=color, url=url or kind)
+
+
+class TestIsoToPositions(unittest.TestCase):
+    def test_matches_get_loc(self):
+        df = make_df()
+        dates = [d.strftime("%Y-%m-%d") for d in df.index[::3]]
+
+        expected = [df.index.get_loc(pd.Timestamp(d)) for d in dates]
+
+        self.assertEqual(iso_to_positions(dates, df.index).tolist(), expected)
+
+    def test_missing_dates(self):
+        df = make_df()
+
+        # Weekend, before the first bar and after the last bar
+        pos = iso_to_positions(["2024-01-06", "2023-12-01", "2025-01-01"], df.index)
+
+        self.assertEqual(pos.tolist(), [-1, -1, -1])
+
+
+class TestOverlayDrawings(unittest.TestCase):
+    def setUp(self):
+        self.df = make_df()
+        self.fig, self.ax = plt.subplots()
+        self.addCleanup(plt.close, self.fig)
+
+        self.renderer = CandlestickRenderer()
+
+    def overlay(self, drawings: list[Drawing]):
+        return self.renderer.overlay_drawings(
+            self.ax, {d.url: d for d in drawings}, self.df
+        )
+
+    def test_groups_by_kind_and_color(self):
+        artists = self.overlay(
+            [
+                drawing("hline", [("2024-01-02", 105), ("2024-01-10", 105)], url="h1"),
+                drawing("hline", [("2024-01-03", 110), (-1, 110)], url="h2"),
+                drawing("hline", [("2024-01-03", 110), (-1, 110)], "red", url="h3"),
+                drawing("axhline", [("", 120)], url="a1"),
+                drawing("axhline", [("", 125)], url="a2"),
+            ]
+        )
+
+        self.assertEqual(len(artists), 3)
+        self.assertTrue(all(isinstance(a, DrawingCollection) for a in artists))
+
+        hlines = next(a for a in artists if a.urls == ["h1", "h2"])
+        segments = hlines.get_segments()
+
+        self.assertEqual(segments[0].tolist(), [[1, 105], [7, 105]])
+        self.assertEqual(segments[1].tolist(), [[2, 110], [len(self.df) - 1, 110]])
+
+    def test_skips_invisible_drawings(self):
+        artists = self.overlay(
+            [
+                drawing("axhline", [("", 500)], url="a1"),
+                drawing("hline", [("2024-01-06", 110), (-1, 110)], url="h1"),
+                drawing("aline", [("2024-01-02", 101), ("2023-01-02", 120)], url="s1"),
+                drawing("tline", [("2024-01-02", 101)], url="t1"),
+            ]
+        )
+
+        self.assertEqual(artists, [])
+
+    def test_tline_and_aline(self):
+        artists = self.overlay(
+            [
+                drawing("tline", [("2024-01-02", 101), ("2024-01-05", 104)], url="t1"),
+                drawing(
+                    "aline",
+                    [("2024-01-02", 101), ("2024-01-05", 104), ("2024-01-09", 102)],
+                    url="s1",
+                ),
+            ]
+        )
+
+        self.assertEqual(len(artists), 2)
+        self.assertEqual(artists[0].get_url(), "t1")
+        self.assertEqual(artists[1].get_segments()[0][:, 0].tolist(), [1, 4, 6])
+
+
+class TestRemoveGrouped(unittest.TestCase):
+    def setUp(self):
+        self.df = make_df()
+        self.fig, self.ax = plt.subplots()
+        self.addCleanup(plt.close, self.fig)
+
+        drawings = {
+            url: drawing("axhline", [("", y)], url=url)
+            for url, y in (("a1", 110), ("a2", 115), ("a3", 120))
+        }
+
+        self.manager = DrawingManager("d", loader=lambda symbol: {})
+        self.manager.set_axes(self.ax)
+        self.manager._drawings["tcs"] = dict(drawings)
+
+        artists = CandlestickRenderer().overlay_drawings(self.ax, drawings, self.df)
+        self.manager.set_artists("tcs", artists)
+        self.collection = artists[0]
+
+    def test_remove_picked_segment(self):
+        self.assertTrue(self.manager.remove("tcs", self.collection, ind=[1]))
+
+        self.assertEqual(self.collection.urls, ["a1", "a3"])
+        self.assertEqual(len(self.collection.get_segments()), 2)
+        self.assertEqual(list(self.manager.get("tcs")), ["a1", "a3"])
+        self.assertIn(self.collection, self.ax.collections)
+
+    def test_remove_last_segment_removes_artist(self):
+        for _ in range(3):
+            self.manager.remove("tcs", self.collection, ind=[0])
+
+        self.assertNotIn(self.collection, self.ax.collections)
+        self.assertEqual(self.manager.get("tcs"), {})
+
+    def test_remove_all(self):
+        self.manager.remove_all("tcs")
+
+        self.assertNotIn(self.collection, self.ax.collections)
+        self.assertEqual(self.manager.get("tcs"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import json
+import pickle
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+import context  # noqa: F401
+from renderer import migrate_drawings
+from renderer.annotations import Drawing, DrawingManager
+from renderer.persistence import DrawingStore
+
+
+def drawing_dict(url: str, y: float = 100.0) -> dict:
+    return dict(
+        kind="hline",
+        points=[["2024-01-01", y], ["2024-02-01", y]],
+        color="royalblue",
+        url=url,
+    )
+
+
+class TestDrawingStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.dir = Path(self.tmp.name)
+        self.db = self.dir / "data" / "drawings.db"
+
+    def test_roundtrip(self):
+        store = DrawingStore(self.db)
+
+        store.save("d", {"tcs": {"hline:a": drawing_dict("hline:a")}})
+        store.save("w", {"tcs": {"hline:b": drawing_dict("hline:b")}})
+
+        self.assertEqual(store.load("d", "tcs"), {"hline:a": drawing_dict("hline:a")})
+        self.assertEqual(list(store.load("w", "tcs")), ["hline:b"])
+        self.assertEqual(store.load("d", "infy"), {})
+
+    def test_symbol_writes_are_independent(self):
+        store = DrawingStore(self.db)
+
+        store.save(
+            "d",
+            {
+                "tcs": {"hline:a": drawing_dict("hline:a")},
+                "infy": {"hline:b": drawing_dict("hline:b")},
+            },
+        )
+
+        store.save("d", {"tcs": {}})
+
+        self.assertEqual(
+            store.load_all("d"), {"infy": {"hline:b": drawing_dict("hline:b")}}
+        )
+
+    def test_import_legacy_json(self):
+        legacy = self.dir / "drawings.json"
+        legacy.write_text(
+            json.dumps(
+                {
+                    "d": {"tcs": {"hline:a": drawing_dict("hline:a")}, "sbin": {}},
+                    "w": {"infy": {"hline:b": drawing_dict("hline:b")}},
+                }
+            )
+        )
+
+        store = DrawingStore(self.db, legacy_path=legacy)
+
+        self.assertEqual(list(store.load_all("d")), ["tcs"])
+        self.assertEqual(list(store.load("w", "infy")), ["hline:b"])
+
+        # Import runs only when the database is created
+        store.save("d", {"tcs": {}})
+        store = DrawingStore(self.db, legacy_path=legacy)
+
+        self.assertEqual(store.load("d", "tcs"), {})
+
+    def test_pickle(self):
+        store = DrawingStore(self.db)
+        store.save("d", {"tcs": {"hline:a": drawing_dict("hline:a")}})
+
+        restored = pickle.loads(pickle.dumps(store))
+
+        self.assertEqual(list(restored.load("d", "tcs")), ["hline:a"])
+
+
+class TestDrawingManagerLazyLoad(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.stored = {"tcs": {"hline:a": drawing_dict("hline:a")}}
+
+        def loader(symbol):
+            self.calls.append(symbol)
+            return self.stored.get(symbol, {})
+
+        self.manager = DrawingManager("d", loader=loader)
+
+    def test_load_once_per_symbol(self):
+        drawings = self.manager.get("tcs")
+
+        self.assertIsInstance(drawings["hline:a"], Drawing)
+        self.assertEqual(drawings["hline:a"].points[0], ("2024-01-01", 100.0))
+
+        self.manager.get("tcs")
+        self.manager.get("infy")
+
+        self.assertEqual(self.calls, ["tcs", "infy"])
+
+    def test_dirty_symbols(self):
+        self.manager.get("infy")
+        self.assertEqual(self.manager.pop_dirty(), {})
+
+        new = Drawing(
+            kind="axhline", points=[("2024-01-03", 50.0)], color="red", url="axhline:x"
+        )
+
+        self.manager.add("tcs", new)
+
+        dirty = self.manager.pop_dirty()
+
+        # Existing drawings are kept alongside the new one
+        self.assertEqual(list(dirty), ["tcs"])
+        self.assertEqual(sorted(dirty["tcs"]), ["axhline:x", "hline:a"])
+        self.assertEqual(self.manager.pop_dirty(), {})
+
+    def test_remove_all_not_reloaded(self):
+        self.manager.get("tcs")
+        self.manager.set_artists("tcs", [])
+        self.manager.remove_all("tcs")
+
+        self.assertEqual(self.manager.get("tcs"), {})
+        self.assertEqual(self.manager.pop_dirty(), {"tcs": {}})
+        self.assertEqual(self.calls, ["tcs"])
+
+
+class TestMigrateDrawings(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.dir = Path(self.tmp.name)
+        self.lines = self.dir / "lines"
+        self.lines.mkdir()
+
+        with (self.lines / "TCS.p").open("wb") as f:
+            pickle.dump(
+                dict(
+                    daily=dict(
+                        lines={
+                            "hline:abc": (
+                                100,
+                                datetime(2024, 1, 1),
+                                datetime(2024, 2, 1),
+                            )
+                        }
+                    )
+                ),
+                f,
+            )
+
+    def test_migrate_into_existing_store(self):
+        # Database created by an earlier run of chart.py
+        store = DrawingStore(self.dir / "drawings.db")
+        store.save("d", {"infy": {"hline:xyz": drawing_dict("hline:xyz")}})
+
+        self.assertEqual(migrate_drawings.migrate_all(self.lines, store), 1)
+
+        store = DrawingStore(self.dir / "drawings.db")
+        tcs = store.load("d", "tcs")
+
+        self.assertEqual(
+            tcs["hline:abc"]["points"], [["2024-01-01", 100.0], ["2024-02-01", 100.0]]
+        )
+        self.assertIn("hline:xyz", store.load("d", "infy"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import context  # noqa: F401
+from renderer.plugins import utils
+from renderer.plugins.compute import ComputeContext
+
+
+def make_ohlc(size: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    close = 500 + rng.normal(0, 5, size).cumsum()
+
+    return pd.DataFrame(
+        dict(
+            High=close + rng.uniform(0, 8, size),
+            Low=close - rng.uniform(0, 8, size),
+            Close=close,
+        ),
+        index=pd.date_range("2020-01-01", periods=size, name="Date"),
+    )
+
+
+class TestComputeContext(unittest.TestCase):
+    def setUp(self):
+        self.df = make_ohlc(500)
+        self.compute = ComputeContext(self.df)
+
+    def test_parity(self):
+        df = self.df
+
+        pd.testing.assert_series_equal(
+            self.compute.atr(14),
+            utils.average_true_range(df.High, df.Low, df.Close, 14),
+            check_names=False,
+        )
+
+        pd.testing.assert_series_equal(
+            self.compute.sma(20), utils.simple_moving_average(df.Close, 20)
+        )
+
+        pd.testing.assert_series_equal(
+            self.compute.ema(12, source="High"),
+            utils.exponential_moving_average(df.High, 12),
+        )
+
+        _, upper, _ = utils.bollinger_bands(df.Close, 20, 2.0)
+
+        pd.testing.assert_series_equal(
+            self.compute.sma(20) + 2.0 * self.compute.stdev(20), upper
+        )
+
+    def test_supertrend_true_range(self):
+        df = self.df
+
+        expected = utils.supertrend(df.High, df.Low, df.Close, 3, 10)
+        result = utils.supertrend(
+            df.High, df.Low, df.Close, 3, 10, true_range=self.compute.true_range()
+        )
+
+        pd.testing.assert_series_equal(result[0], expected[0])
+        pd.testing.assert_series_equal(result[1], expected[1])
+
+    def test_memoized(self):
+        with patch.object(
+            ComputeContext, "_true_range", wraps=self.compute._true_range
+        ) as true_range:
+            compute = ComputeContext(self.df)
+
+            compute.atr(14)
+            compute.atr(20)
+            compute.true_range()
+
+            self.assertEqual(true_range.call_count, 1)
+
+        self.assertIs(self.compute.sma(20), self.compute.sma(20))
+        self.assertIsNot(self.compute.sma(20), self.compute.sma(50))
+        self.assertIsNot(self.compute.sma(20), self.compute.sma(20, "High"))
+
+        calls = []
+
+        def func():
+            calls.append(1)
+            return 42
+
+        self.assertEqual(self.compute.get(("custom", 1), func), 42)
+        self.assertEqual(self.compute.get(("custom", 1), func), 42)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
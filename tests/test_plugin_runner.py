@@ -0,0 +1,265 @@
+import io
+import json
+import pickle
+import tempfile
+import tracemalloc
+import unittest
+from contextlib import redirect_stdout
+from importlib import import_module
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import context  # noqa: F401
+from renderer import batch
+from renderer.dtypes import PanelAssignment
+from renderer.plugins import bollinger_bands, runner
+from renderer.plugins.profiler import PluginProfiler
+from renderer.plugins.registry import PluginError, load_plugin
+from renderer.plugins.runner import PluginRunner
+
+
+def make_ohlcv(size: int, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    close = 500 + rng.normal(0, 5, size).cumsum()
+
+    return pd.DataFrame(
+        dict(
+            Open=close,
+            High=close + rng.uniform(0, 8, size),
+            Low=close - rng.uniform(0, 8, size),
+            Close=close,
+            Volume=rng.integers(1000, 5000, size),
+        ),
+        index=pd.date_range("2020-01-01", periods=size, name="Date"),
+    )
+
+
+def addplot_data(plot_args: dict) -> list[pd.Series]:
+    return [ap["data"] for ap in plot_args["addplot"]]
+
+
+class TestLookbackWindow(unittest.TestCase):
+    def setUp(self):
+        self.df = make_ohlcv(600)
+
+    def test_window(self):
+        spec = load_plugin("BB", dict(name="bollinger_bands", length=20))
+        self.assertEqual(spec.warmup, 19)
+
+        self.assertEqual(spec.window(100, 600), 119)
+        self.assertEqual(spec.window(590, 600), 600)
+
+        # No warmup hook
+        self.assertEqual(load_plugin("ATR", dict(name="atr")).window(100, 600), 600)
+
+    def test_bollinger_equivalence(self):
+        """Windowed input gives the same displayed values as the full frame"""
+        for length, period in ((20, 100), (50, 30), (5, 599)):
+            options = dict(name="bollinger_bands", length=length)
+
+            expected = {}
+            bollinger_bands.apply(
+                self.df, expected, bollinger_bands.normalize(options), period
+            )
+
+            plot_args = {}
+            PluginRunner(dict(BB=options), {}).apply(self.df, plot_args, period)
+
+            for result, full in zip(
+                addplot_data(plot_args), addplot_data(expected), strict=True
+            ):
+                self.assertEqual(len(result), period)
+                pd.testing.assert_series_equal(result, full)
+
+    def test_unbounded_plugins_get_full_frame(self):
+        plugins = dict(
+            ATR=dict(name="atr", period=14),
+            MACD=dict(name="macd"),
+            SUPERTREND=dict(name="supertrend"),
+        )
+
+        for key, options in plugins.items():
+            expected = {}
+            module = import_module(f"renderer.plugins.{options['name']}")
+            module.apply(self.df, expected, module.normalize(options), 100)
+
+            plot_args = {}
+            PluginRunner({key: options}, {}).apply(self.df, plot_args, 100)
+
+            for result, full in zip(
+                addplot_data(plot_args), addplot_data(expected), strict=True
+            ):
+                pd.testing.assert_series_equal(result, full)
+
+
+class TestPluginRegistry(unittest.TestCase):
+    def test_normalize(self):
+        spec = load_plugin(
+            "MACD",
+            dict(name="macd", fast="8", slow=21.0, help="MACD", lookback=100),
+        )
+
+        self.assertEqual(spec.options["fastlen"], 8)
+        self.assertEqual(spec.options["slowlen"], 21)
+        self.assertEqual(spec.options["siglen"], 9)
+        self.assertNotIn("help", spec.options)
+        self.assertNotIn("name", spec.options)
+
+    def test_fractional_supertrend_factor(self):
+        spec = load_plugin("SUPERTREND", dict(name="supertrend", factor=2.5))
+
+        self.assertEqual(spec.options["factor"], 2.5)
+
+        plot_args = {}
+        PluginRunner(dict(SUPERTREND=dict(name="supertrend", factor=2.5)), {}).apply(
+            make_ohlcv(300), plot_args, 100
+        )
+
+        self.assertEqual(plot_args["addplot"][0]["label"], "Supertrend 2.5, 10")
+
+    def test_panel_assignment(self):
+        spec = load_plugin(
+            "RSI", dict(name="rsi"), PanelAssignment(panel=2, secondary_y=True)
+        )
+
+        self.assertEqual(spec.options["plot_panel"], 2)
+        self.assertTrue(spec.options["secondary_y"])
+
+    def test_invalid_config(self):
+        invalid = (
+            dict(name="missing_plugin"),
+            dict(name="atr", period=0),
+            dict(name="atr", period="abc"),
+            dict(name="bollinger_bands", length=2.5),
+            dict(name="macd", fastlen=30, slowlen=26),
+            dict(name="atr", time_budget_ms="fast"),
+            dict(name="compute"),
+        )
+
+        for plugin_config in invalid:
+            with self.assertRaises(PluginError, msg=plugin_config):
+                load_plugin("TEST", plugin_config)
+
+    def test_pickle(self):
+        plugin_runner = PluginRunner(dict(ATR=dict(name="atr")), {})
+        restored = pickle.loads(pickle.dumps(plugin_runner))
+
+        self.assertIsNone(restored.specs[0].module)
+
+        plot_args = {}
+        restored.apply(make_ohlcv(300), plot_args, 100)
+        self.assertEqual(len(plot_args["addplot"]), 1)
+
+    def test_options_are_reused(self):
+        plugin_runner = PluginRunner(dict(ATR=dict(name="atr", length="7")), {})
+        options = plugin_runner.specs[0].options
+
+        plot_args = {}
+        plugin_runner.apply(make_ohlcv(300), plot_args, 100)
+
+        self.assertIs(plugin_runner.specs[0].options, options)
+        self.assertEqual(options["period"], 7)
+        self.assertNotIn("compute", options)
+        self.assertEqual(plot_args["addplot"][0]["label"], "ATR 7")
+
+
+class TestPluginProfiler(unittest.TestCase):
+    def setUp(self):
+        self.df = make_ohlcv(300)
+        self.plugins = dict(
+            ATR=dict(name="atr"),
+            BB=dict(name="bollinger_bands"),
+        )
+
+    def test_samples(self):
+        profiler = PluginProfiler()
+        plugin_runner = PluginRunner(self.plugins, {}, profiler=profiler)
+
+        for symbol in ("tcs", "infy"):
+            plugin_runner.apply(self.df, {}, 100, symbol=symbol)
+
+        self.assertEqual(
+            [(s.plugin, s.symbol) for s in profiler.samples],
+            [("ATR", "tcs"), ("BB", "tcs"), ("ATR", "infy"), ("BB", "infy")],
+        )
+
+        for sample in profiler.samples:
+            self.assertGreater(sample.seconds, 0)
+            self.assertGreater(sample.peak_bytes, 0)
+
+        # ATR adds one series, Bollinger Bands three, each of 100 float64 values
+        self.assertGreaterEqual(profiler.samples[0].output_bytes, 800)
+        self.assertGreaterEqual(profiler.samples[1].output_bytes, 2400)
+
+        summary = {row["plugin"]: row for row in profiler.summary()}
+        self.assertEqual(summary["ATR"]["calls"], 2)
+
+        table = profiler.format_table()
+        self.assertIn("ATR", table)
+        self.assertIn("Total ms", table)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "data" / "profile.json"
+            profiler.write_json(path)
+            data = json.loads(path.read_text())
+
+        self.assertEqual(len(data["samples"]), 4)
+        self.assertEqual(len(data["summary"]), 2)
+
+        self.assertTrue(tracemalloc.is_tracing())
+        profiler.stop()
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_batch_worker_returns_new_samples_only(self):
+        profiler = PluginProfiler()
+        plugin_runner = PluginRunner(self.plugins, {}, profiler=profiler)
+
+        # Samples merged in the parent before the task was pickled
+        plugin_runner.apply(self.df, {}, 100, symbol="tcs")
+        render_context = pickle.loads(
+            pickle.dumps(SimpleNamespace(plugin_runner=plugin_runner))
+        )
+
+        def render(symbol, *args):
+            render_context.plugin_runner.apply(self.df, {}, 100, symbol=symbol)
+
+        with patch.object(batch, "_render", render):
+            samples = batch.worker("infy", None, None, True, {}, render_context)
+
+        self.assertEqual(
+            [(s.plugin, s.symbol) for s in samples], [("ATR", "infy"), ("BB", "infy")]
+        )
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_time_budget(self):
+        plugins = dict(ATR=dict(name="atr", time_budget_ms=1e-6))
+
+        # Warn only in interactive mode
+        plot_args = {}
+        out = io.StringIO()
+
+        with redirect_stdout(out):
+            PluginRunner(plugins, {}).apply(self.df, plot_args, 100, symbol="tcs")
+
+        self.assertIn("over budget", out.getvalue())
+        self.assertEqual(len(plot_args["addplot"]), 1)
+
+        # Skip on later charts in batch mode
+        plugin_runner = PluginRunner(plugins, {}, skip_over_budget=True)
+        self.addCleanup(runner._over_budget.clear)
+
+        with redirect_stdout(io.StringIO()):
+            for _ in range(2):
+                plot_args = {}
+                plugin_runner.apply(self.df, plot_args, 100)
+
+        self.assertNotIn("addplot", plot_args)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import context  # noqa: F401
+from renderer.plugins import utils
+
+
+def wilders_moving_average_loop(source: pd.Series, length: int) -> pd.Series:
+    """Reference loop implementation of utils.wilders_moving_average"""
+    values = source.to_numpy(dtype=np.float64)
+    result = np.full(len(values), np.nan)
+
+    if len(values) < length:
+        return pd.Series(result, index=source.index, name=source.name)
+
+    result[length - 1] = values[:length].mean()
+    alpha = 1.0 / length
+
+    for i in range(length, len(values)):
+        if np.isnan(values[i]) or np.isnan(result[i - 1]):
+            result[i] = np.nan
+        else:
+            result[i] = result[i - 1] + alpha * (values[i] - result[i - 1])
+
+    return pd.Series(result, index=source.index, name=source.name)
+
+
+def make_ohlc(size: int, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    close = 500 + rng.normal(0, 5, size).cumsum()
+    high = close + rng.uniform(0, 8, size)
+    low = close - rng.uniform(0, 8, size)
+
+    return pd.DataFrame(
+        dict(High=high, Low=low, Close=close),
+        index=pd.date_range("2015-01-01", periods=size, name="Date"),
+    )
+
+
+class TestWildersMovingAverage(unittest.TestCase):
+    def setUp(self):
+        self.df = make_ohlc(2000)
+
+    def assertParity(self, source, length):
+        expected = wilders_moving_average_loop(source, length)
+
+        pd.testing.assert_series_equal(
+            utils.wilders_moving_average(source, length),
+            expected,
+            rtol=1e-10,
+        )
+
+        # Fallback without scipy
+        with patch.object(utils, "lfilter", None):
+            pd.testing.assert_series_equal(
+                utils.wilders_moving_average(source, length),
+                expected,
+                rtol=1e-10,
+            )
+
+    def test_parity(self):
+        for length in (1, 2, 14, 50):
+            self.assertParity(self.df.Close, length)
+
+    def test_data_gap(self):
+        """All values from the first NaN after the seed remain NaN"""
+        source = self.df.Close.copy()
+        source.iloc[100] = np.nan
+
+        self.assertParity(source, 14)
+        self.assertTrue(
+            utils.wilders_moving_average(source, 14).iloc[100:].isna().all()
+        )
+
+    def test_short_source(self):
+        self.assertParity(self.df.Close.iloc[:5], 14)
+        self.assertParity(self.df.Close.iloc[:14], 14)
+
+    def test_nan_in_seed(self):
+        source = self.df.Close.copy()
+        source.iloc[3] = np.nan
+
+        with self.assertRaises(ValueError):
+            utils.wilders_moving_average(source, 14)
+
+    def test_atr(self):
+        df = self.df
+
+        expected = wilders_moving_average_loop(
+            pd.concat(
+                [
+                    df.High - df.Low,
+                    (df.High - df.Close.shift(1)).abs(),
+                    (df.Low - df.Close.shift(1)).abs(),
+                ],
+                axis=1,
+            ).max(axis=1),
+            14,
+        )
+
+        pd.testing.assert_series_equal(
+            utils.average_true_range(df.High, df.Low, df.Close, 14),
+            expected,
+            rtol=1e-10,
+        )
+
+
+class TestSupertrend(unittest.TestCase):
+    def test_kernel_parity(self):
+        """Compiled kernel, if numba is installed, matches the Python loop"""
+        df = make_ohlc(3000, seed=5)
+
+        with patch.object(utils, "_supertrend_kernel", utils._supertrend_loop):
+            expected = utils.supertrend(df.High, df.Low, df.Close, 3, 10)
+
+        result = utils.supertrend(df.High, df.Low, df.Close, 3, 10)
+
+        pd.testing.assert_series_equal(result[0], expected[0])
+        pd.testing.assert_series_equal(result[1], expected[1])
+
+    def test_direction(self):
+        df = make_ohlc(500, seed=9)
+
+        trend, direction = utils.supertrend(df.High, df.Low, df.Close)
+
+        self.assertTrue(direction.iloc[1:].isin((1, -1)).all())
+
+        up = direction == 1
+
+        # Supertrend is below the close in an uptrend and above it in a downtrend
+        self.assertTrue((trend[up] <= df.Close[up]).all())
+        self.assertTrue((trend[~up].iloc[1:] >= df.Close[~up].iloc[1:]).all())
+
+    def test_empty(self):
+        df = make_ohlc(0)
+
+        trend, direction = utils.supertrend(df.High, df.Low, df.Close)
+
+        self.assertTrue(trend.empty and direction.empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
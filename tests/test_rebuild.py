@@ -0,0 +1,199 @@
+import tempfile
+import unittest
+from datetime import datetime
+from math import nan
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+from context import defs
+from defs import rebuild
+from defs.report_archive import ReportArchive
+
+BHAV_HEADER = "ISIN,TckrSymb,SctySrs,OpnPric,HghPric,LwPric,ClsPric,TtlTradgVol\n"
+
+DLV_HEADER = "SYMBOL, SERIES, NO_OF_TRADES, DELIV_QTY\n"
+
+INDEX_HEADER = (
+    "Index Name,Index Date,Open Index Value,High Index Value,Low Index Value,"
+    "Closing Index Value,Points Change,Change(%),Volume,Turnover (Rs. Cr.),P/E,"
+    "P/B,Div Yield\n"
+)
+
+
+class TestRebuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.dir = Path(self.tmp.name)
+        self.out = self.dir / "eod2_data" / "daily_rebuild"
+        self.adjustments = self.dir / "eod2_data" / "adjustments.csv"
+
+        for folder in ("eod2_data", "nseBhav", "nseDelivery", "nseIndices"):
+            (self.dir / folder / "2024").mkdir(parents=True)
+
+        self.add_day(
+            "20240102",
+            [
+                "INE1,OLDNAME,EQ,100,110,90,100,1000",
+                "INE2,SMALL,SM,50,50,50,50,500",
+                "INE3,BEE,BE,20,20,20,20,300",
+                "INE4,RIGHTS-RE,EQ,1,1,1,1,1",
+                "INE5,BOND,N1,1,1,1,1,1",
+            ],
+            ["OLDNAME, EQ,10,400", "BEE, BE,3,100"],
+        )
+
+        self.add_day(
+            "20240103",
+            [
+                "INE1,NEWNAME,EQ,52,54,50,51,2000",
+                "INE2,SMALL,EQ,55,55,55,55,600",
+                "INE3,BEE,BE,21,21,21,21,300",
+            ],
+        )
+
+        self.adjustments.write_text("Date,Symbol,Factor\n2024-01-03,newname,2.0\n")
+
+    def add_day(self, date: str, bhav, dlv=None):
+        dt = datetime.strptime(date, "%Y%m%d")
+
+        (self.dir / f"nseBhav/2024/BhavCopy_NSE_CM_0_0_0_{date}_F_0000.csv").write_text(
+            BHAV_HEADER + "\n".join(bhav) + "\n"
+        )
+
+        if dlv is not None:
+            (
+                self.dir / f"nseDelivery/2024/sec_bhavdata_full_{dt:%d%m%Y}.csv"
+            ).write_text(DLV_HEADER + "\n".join(dlv) + "\n")
+
+        (self.dir / f"nseIndices/2024/ind_close_all_{dt:%d%m%Y}.csv").write_text(
+            INDEX_HEADER
+            + f"Nifty 50,{dt:%d-%m-%Y},100,110,90,105,1,1,1000,10,22.5,3,1\n"
+            + f"Nifty50 USD,{dt:%d-%m-%Y},-,-,-,105,1,1,-,-,-,-,-\n"
+        )
+
+    def read(self, name: str) -> pd.DataFrame:
+        return pd.read_csv(self.out / f"{name}.csv", index_col="Date")
+
+    def test_rebuild(self):
+        stats = rebuild.rebuild(self.dir, self.out, self.adjustments, jobs=1)
+
+        self.assertEqual(stats, dict(dates=2, files=5, adjustments=1))
+
+        self.assertEqual(
+            sorted(p.name for p in self.out.iterdir()),
+            ["bee.csv", "newname.csv", "nifty 50.csv", "nifty50 usd.csv", "small.csv"],
+        )
+
+        # Renamed and adjusted before the ex-date
+        df = self.read("newname")
+
+        self.assertEqual(list(df.index), ["2024-01-02", "2024-01-03"])
+        self.assertEqual(list(df["Close"]), [50, 51])
+        self.assertEqual(list(df["High"]), [55, 54])
+        self.assertEqual(df.at["2024-01-02", "DLV_QTY"], 400)
+        self.assertEqual(df.at["2024-01-02", "QTY_PER_TRADE"], 100)
+        self.assertTrue(pd.isna(df.at["2024-01-03", "DLV_QTY"]))
+
+        # Switched from SME to EQ
+        df = self.read("small")
+
+        self.assertEqual(list(df["Series"]), ["SM", "EQ"])
+
+        # BE series delivery is the volume
+        self.assertEqual(self.read("bee").at["2024-01-02", "DLV_QTY"], 300)
+
+        df = self.read("nifty 50")
+
+        self.assertEqual(
+            list(df.columns),
+            [
+                "Open",
+                "High",
+                "Low",
+                "Close",
+                "Volume",
+                "P/E",
+                "Series",
+                "TOTAL_TRADES",
+                "QTY_PER_TRADE",
+                "DLV_QTY",
+            ],
+        )
+        self.assertEqual(list(df["P/E"]), [22.5, 22.5])
+
+    def test_rebuild_from_packed_archives(self):
+        for folder in ("nseBhav", "nseDelivery", "nseIndices"):
+            ReportArchive(self.dir / folder).pack()
+
+        stats = rebuild.rebuild(self.dir, self.out, self.adjustments, jobs=1)
+
+        self.assertEqual(stats, dict(dates=2, files=5, adjustments=1))
+        self.assertEqual(list(self.read("newname")["Close"]), [50, 51])
+
+    def test_rebuild_recorded_adjustments(self):
+        self.adjustments.unlink()
+
+        # NSE symbols as passed by adjustNseStocks
+        with patch.multiple(
+            defs,
+            ADJUSTMENTS_FILE=self.adjustments,
+            dates=Mock(pandasDt="2024-01-03"),
+        ):
+            defs.recordAdjustments([("NEWNAME", 2.0)])
+
+        stats = rebuild.rebuild(self.dir, self.out, self.adjustments, jobs=1)
+
+        self.assertEqual(stats, dict(dates=2, files=5, adjustments=1))
+        self.assertEqual(list(self.read("newname")["Close"]), [50, 51])
+
+    def test_uppercase_symbols_are_matched(self):
+        self.adjustments.write_text("Date,Symbol,Factor\n2024-01-03,NEWNAME,2.0\n")
+
+        stats = rebuild.rebuild(self.dir, self.out, self.adjustments, jobs=1)
+
+        self.assertEqual(stats["adjustments"], 1)
+
+    def test_rows_match_live_append(self):
+        rebuild.rebuild(self.dir, self.out, self.adjustments, jobs=1)
+
+        live = self.dir / "daily"
+        live.mkdir()
+
+        with patch.multiple(defs, DAILY_FOLDER=live, hook=None):
+            with patch.object(defs, "dates", Mock(pandasDt="2024-01-02")):
+                # Missing from the delivery report
+                defs.updateNseSymbol(
+                    live / "small_sme.csv", "SM", 50, 50, 50, 50, 500, nan, nan
+                )
+                defs.updateIndice("Nifty50 USD", nan, nan, nan, 105.0, nan, nan)
+
+            with patch.object(defs, "dates", Mock(pandasDt="2024-01-03")):
+                # No delivery report
+                defs.updateNseSymbol(
+                    live / "small_sme.csv", "EQ", 55, 55, 55, 55, 600, "", ""
+                )
+                defs.updateIndice("Nifty50 USD", nan, nan, nan, 105.0, nan, nan)
+
+        self.assertEqual(
+            (self.out / "small.csv").read_bytes(),
+            (live / "small_sme.csv").read_bytes(),
+        )
+        self.assertEqual(
+            (self.out / "nifty50 usd.csv").read_bytes(),
+            (live / "nifty50 usd.csv").read_bytes(),
+        )
+
+    def test_output_folder_must_be_empty(self):
+        self.out.mkdir(parents=True)
+        (self.out / "tcs.csv").write_text("")
+
+        with self.assertRaises(FileExistsError):
+            rebuild.rebuild(self.dir, self.out, self.adjustments, jobs=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
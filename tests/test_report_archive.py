@@ -0,0 +1,113 @@
+import tempfile
+import unittest
+import zipfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import context  # noqa: F401
+from defs.report_archive import ReportArchive, report_date
+
+DT = datetime(2024, 1, 2)
+
+NAME = "BhavCopy_NSE_CM_0_0_0_20240102_F_0000.csv"
+
+
+class TestReportArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.folder = Path(self.tmp.name) / "nseBhav"
+        self.archive = ReportArchive(self.folder)
+
+    def test_report_date(self):
+        self.assertEqual(report_date(NAME), DT)
+        self.assertEqual(report_date("cm02JAN2023bhav.csv"), datetime(2023, 1, 2))
+        self.assertEqual(
+            report_date("sec_bhavdata_full_02012025.csv"), datetime(2025, 1, 2)
+        )
+        self.assertEqual(
+            report_date("ind_close_all_02012025.csv"), datetime(2025, 1, 2)
+        )
+        self.assertIsNone(report_date("other.csv"))
+
+    def test_add_and_read(self):
+        self.archive.add(DT, NAME, b"SYMBOL,CLOSE\nTCS,100\n")
+        self.archive.add(datetime(2024, 1, 3), "other.csv", b"SYMBOL,CLOSE\nTCS,101\n")
+
+        zip_path = self.folder / "2024" / "2024-01.zip"
+
+        with zipfile.ZipFile(zip_path) as zf:
+            self.assertEqual(
+                zf.namelist(), [f"2024-01-02/{NAME}", "2024-01-03/other.csv"]
+            )
+
+        self.assertEqual(self.archive.find(DT), NAME)
+        self.assertEqual(self.archive.read(DT), b"SYMBOL,CLOSE\nTCS,100\n")
+        self.assertEqual(self.archive.read_csv(DT).at[0, "CLOSE"], 100)
+        self.assertIsNone(self.archive.read(datetime(2024, 1, 4)))
+        self.assertIsNone(self.archive.find(datetime(2023, 1, 4)))
+
+    def test_add_replaces_report(self):
+        self.archive.add(DT, NAME, b"old")
+        self.archive.add(datetime(2024, 1, 3), "other.csv", b"other")
+        self.archive.add(DT, NAME, b"new")
+
+        self.assertEqual(self.archive.read(DT), b"new")
+        self.assertEqual(self.archive.read(datetime(2024, 1, 3)), b"other")
+        self.assertEqual(len(self.archive.dates()), 2)
+        self.assertFalse(any(self.folder.glob("*/*.tmp")))
+
+    def test_rewrite_keeps_compression_level(self):
+        data = "".join(f"SYM{i % 997},{i * 13 % 100003}\n" for i in range(20000))
+        data = data.encode()
+
+        self.archive.add(DT, NAME, data)
+        self.archive.add(datetime(2024, 1, 3), "other.csv", b"old")
+        self.archive.add(datetime(2024, 1, 3), "other.csv", b"new")
+
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+        expected = len(compressor.compress(data) + compressor.flush())
+
+        with zipfile.ZipFile(self.folder / "2024" / "2024-01.zip") as zf:
+            self.assertEqual(zf.getinfo(f"2024-01-02/{NAME}").compress_size, expected)
+
+    def test_add_appends_in_place(self):
+        self.archive.add(DT, NAME, b"first")
+        zip_path = self.folder / "2024" / "2024-01.zip"
+        inode = zip_path.stat().st_ino
+
+        self.archive.add(datetime(2024, 1, 3), "other.csv", b"other")
+
+        self.assertEqual(zip_path.stat().st_ino, inode)
+        self.assertEqual(self.archive.read(DT), b"first")
+
+    def test_uncompressed_files_and_pack(self):
+        year_folder = self.folder / "2024"
+        year_folder.mkdir(parents=True)
+        (year_folder / NAME).write_bytes(b"loose")
+        (year_folder / "sec_bhavdata_full_03012024.csv").write_bytes(b"loose 2")
+
+        self.archive.add(datetime(2024, 2, 1), "feb.csv", b"feb")
+
+        self.assertEqual(self.archive.read(DT), b"loose")
+        self.assertEqual(
+            self.archive.dates(),
+            {
+                DT: (None, NAME),
+                datetime(2024, 1, 3): (None, "sec_bhavdata_full_03012024.csv"),
+                datetime(2024, 2, 1): (year_folder / "2024-02.zip", "feb.csv"),
+            },
+        )
+
+        self.assertEqual(self.archive.pack(), 2)
+
+        self.assertFalse((year_folder / NAME).exists())
+        self.assertEqual(self.archive.read(DT), b"loose")
+        self.assertEqual(self.archive.dates()[DT], (year_folder / "2024-01.zip", NAME))
+        self.assertEqual(self.archive.read(datetime(2024, 1, 3)), b"loose 2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+import context  # noqa: F401
+from defs.run_stats import RunStats, load_runs, summarise
+
+DT = datetime(2024, 1, 2)
+
+
+class TestRunStats(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.file = Path(self.tmp.name) / "run_log.jsonl"
+
+    def test_stages_and_counters(self):
+        stats = RunStats()
+
+        with stats.stage("special_sessions"):
+            pass
+
+        with self.assertRaises(RuntimeError):
+            with stats.stage("download", DT):
+                raise RuntimeError("Not yet updated")
+
+        stats.count("symbols_appended")
+        stats.count("bytes_written", 100)
+        stats.count("bytes_written", 50)
+
+        record = stats.record()
+
+        self.assertEqual(record["status"], "error")
+        self.assertEqual(record["dates"], ["2024-01-02"])
+
+        # A stage is recorded even when it raises
+        self.assertEqual(
+            [(s["stage"], s["date"]) for s in record["stages"]],
+            [("special_sessions", None), ("download", "2024-01-02")],
+        )
+        self.assertEqual(
+            record["counters"], dict(symbols_appended=1, bytes_written=150)
+        )
+
+        peak = record["peak_rss_mb"]
+        self.assertTrue(peak is None or peak > 0)
+
+    def test_save_and_summarise(self):
+        for _ in range(3):
+            stats = RunStats()
+            stats.status = "ok"
+
+            with stats.stage("update_eod", DT):
+                pass
+
+            stats.count("symbols_appended", 10)
+            stats.save(self.file)
+
+        # Interrupted write
+        with self.file.open("a") as f:
+            f.write('{"started": ')
+
+        runs = load_runs(self.file, 2)
+
+        self.assertEqual(len(runs), 2)
+        self.assertEqual(len(self.file.read_text().splitlines()), 4)
+        self.assertEqual(
+            json.loads(self.file.read_text().splitlines()[0])["status"], "ok"
+        )
+
+        text = summarise(runs)
+
+        self.assertIn("Last 2 runs", text)
+        self.assertIn("update_eod", text)
+        self.assertRegex(text, r"symbols_appended\s+10\.0")
+
+    def test_save_after_partial_line(self):
+        self.file.write_text('{"started": ')
+
+        stats = RunStats()
+        stats.save(self.file)
+
+        runs = load_runs(self.file, 10)
+
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(runs[0]["status"], "error")
+
+    def test_no_runs(self):
+        self.assertEqual(load_runs(self.file, 10), [])
+        self.assertEqual(summarise([]), "No runs recorded")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+import context  # noqa: F401
+from renderer.batch import BatchRender
+from renderer.indicators import IndicatorPipeline
+from renderer.shared import SharedFrame, SharedSeries
+
+
+def _sum_close(shared: SharedSeries) -> float:
+    return float(shared.get().sum())
+
+
+class TestSharedFrame(unittest.TestCase):
+    def setUp(self):
+        index = pd.date_range("2024-01-01", periods=10, name="Date")
+
+        self.df = pd.DataFrame(
+            {
+                "Close": np.linspace(100, 110, 10),
+                "NET_NEW_HIGHS": np.arange(10, dtype=np.int64),
+            },
+            index=index,
+        )
+
+    def test_pickle_roundtrip(self):
+        shared = SharedFrame(self.df)
+
+        try:
+            clone = pickle.loads(pickle.dumps(shared))
+
+            pd.testing.assert_frame_equal(clone.get(), self.df, check_freq=False)
+            clone.close()
+        finally:
+            shared.unlink()
+
+    def test_handle_is_small(self):
+        """Only the handle is pickled, not the data"""
+        df = pd.DataFrame(
+            {"Close": np.arange(50_000, dtype=np.float64)},
+            index=pd.date_range("1990-01-01", periods=50_000, name="Date"),
+        )
+        shared = SharedSeries(df.Close)
+
+        try:
+            self.assertLess(len(pickle.dumps(shared)), 1024)
+        finally:
+            shared.unlink()
+
+    def test_view_is_read_only(self):
+        shared = SharedFrame(self.df)
+
+        try:
+            clone = pickle.loads(pickle.dumps(shared))
+
+            with self.assertRaises(ValueError):
+                clone.get()["Close"].to_numpy()[0] = 0
+            clone.close()
+        finally:
+            shared.unlink()
+
+    def test_worker_process(self):
+        shared = SharedSeries(self.df.Close)
+
+        try:
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                results = list(executor.map(_sum_close, [shared] * 4))
+        finally:
+            shared.unlink()
+
+        self.assertEqual(results, [float(self.df.Close.sum())] * 4)
+
+    def test_unlink_requires_owner(self):
+        shared = SharedFrame(self.df)
+
+        try:
+            clone = pickle.loads(pickle.dumps(shared))
+
+            with self.assertRaises(RuntimeError):
+                clone.unlink()
+        finally:
+            shared.unlink()
+
+
+class TestBatchSharedData(unittest.TestCase):
+    def test_originals_restored(self):
+        index = pd.date_range("2024-01-01", periods=10, name="Date")
+        close = pd.Series(np.linspace(100, 110, 10), index=index, name="Close")
+        breadth = pd.DataFrame({"NET_NEW_HIGHS": np.arange(10)}, index=index)
+
+        pipeline = IndicatorPipeline(Mock())
+        pipeline.set_index_close(close)
+
+        loader = SimpleNamespace(breadth_df=None)
+        loader.load_breadth_indicators = lambda: breadth
+
+        batch = BatchRender.__new__(BatchRender)
+        batch.cmd = SimpleNamespace(source=SimpleNamespace(mode="breadth"))
+        batch.context = SimpleNamespace(indicator_pipeline=pipeline, loader=loader)
+
+        with batch._shared_reference_data():
+            self.assertIsInstance(loader.breadth_df, SharedFrame)
+            pd.testing.assert_series_equal(
+                pipeline.index_close, close, check_freq=False
+            )
+
+        # Usable after the memory blocks are freed
+        self.assertIs(pipeline.index_close, close)
+        self.assertIs(loader.breadth_df, breadth)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+import context  # noqa: F401
+from defs.symbol_index import SymbolIndex
+from defs.symbol_store import SymbolStore
+from defs.symbol_tracker import SymbolTracker
+
+
+class TestSymbolIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.data_dir = Path(self.tmp.name)
+        self.daily = self.data_dir / "daily"
+        self.daily.mkdir()
+
+        for name in ("tcs", "infy", "infra_sme", "abc", "abc_sme", "nifty 50"):
+            (self.daily / f"{name}.csv").write_text("Date,Close\n")
+
+        (self.data_dir / "isin.csv").write_text(
+            "ISIN,SYMBOL\nINE467B01029,TCS\nINE009A01021,INFY\nINE000X01011,GONE\n"
+        )
+
+        tracker = SymbolTracker()
+        tracker.update("TCS", "INE467B01029", date(2024, 1, 1))
+        tracker.update("INFOSYS", "INE009A01021", date(2024, 1, 1))
+        tracker.update("INFY", "INE009A01021", date(2024, 1, 2))
+
+        (self.data_dir / "isin_symbol_map.json").write_text(tracker.to_json())
+
+    def test_resolve(self):
+        index = SymbolIndex.load(self.daily)
+
+        self.assertEqual(index.resolve("TCS"), self.daily / "tcs.csv")
+        self.assertEqual(index.resolve(" Nifty 50 "), self.daily / "nifty 50.csv")
+        self.assertEqual(index.resolve("n50"), self.daily / "nifty 50.csv")
+        self.assertEqual(index.resolve("infra"), self.daily / "infra_sme.csv")
+        self.assertEqual(index.resolve("infra_sme"), self.daily / "infra_sme.csv")
+        self.assertIsNone(index.resolve("missing"))
+
+    def test_main_board_preferred_over_sme(self):
+        index = SymbolIndex.load(self.daily)
+
+        self.assertEqual(index.resolve("abc"), self.daily / "abc.csv")
+
+    def test_isin_and_former_symbol(self):
+        index = SymbolIndex.load(self.daily)
+
+        self.assertEqual(index.resolve("ine467b01029"), self.daily / "tcs.csv")
+        self.assertEqual(index.resolve("INFOSYS"), self.daily / "infy.csv")
+        self.assertIsNone(index.resolve("INE000X01011"))
+
+    def test_former_symbol_from_db(self):
+        json_file = self.data_dir / "isin_symbol_map.json"
+        SymbolStore(self.data_dir / "isin_symbol_map.db", legacy_path=json_file).load()
+        json_file.unlink()
+
+        index = SymbolIndex.load(self.daily)
+
+        self.assertEqual(index.resolve("INFOSYS"), self.daily / "infy.csv")
+
+    def test_search_and_suggest(self):
+        index = SymbolIndex.load(self.daily)
+
+        self.assertEqual(index.search("inf"), ["infra", "infra_sme", "infy"])
+        self.assertEqual(index.search("inf", limit=1), ["infra"])
+        self.assertEqual(index.search("zzz"), [])
+
+        self.assertEqual(index.suggest("infz"), ["infra", "infra_sme", "infy"])
+        self.assertEqual(index.suggest("zz"), [])
+        self.assertIn("Did you mean: TCS", index.not_found_message("tcz"))
+
+    def test_cache_is_rebuilt_when_stale(self):
+        SymbolIndex.load(self.daily)
+        cache = self.data_dir / "symbol_index.json"
+
+        self.assertTrue(cache.is_file())
+
+        # A new listing changes the daily folder mtime
+        (self.daily / "wipro.csv").write_text("Date,Close\n")
+        mtime = cache.stat().st_mtime + 10
+        os.utime(self.daily, (mtime, mtime))
+
+        self.assertIsNotNone(SymbolIndex.load(self.daily).resolve("wipro"))
+
+    def test_fresh_cache_is_used(self):
+        SymbolIndex.load(self.daily)
+        cache = self.data_dir / "symbol_index.json"
+
+        data = json.loads(cache.read_text())
+        data["files"]["cached"] = "tcs.csv"
+        cache.write_text(json.dumps(data))
+
+        self.assertEqual(
+            SymbolIndex.load(self.daily).resolve("cached"), self.daily / "tcs.csv"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
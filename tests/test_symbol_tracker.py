@@ -0,0 +1,201 @@
+import json
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+
+import context  # noqa: F401
+from defs.symbol_store import SymbolStore
+from defs.symbol_tracker import SymbolTracker
+
+
+def track(tracker: SymbolTracker, symbol: str, isin: str, start: date, days: int):
+    for i in range(days):
+        tracker.update(symbol, isin, start + timedelta(i))
+
+
+class TestPointInTime(unittest.TestCase):
+    def setUp(self):
+        self.tracker = SymbolTracker()
+
+        # Renamed from OLDNAME to NEWNAME on 2024-01-11
+        track(self.tracker, "OLDNAME", "INE001", date(2024, 1, 1), 10)
+        track(self.tracker, "NEWNAME", "INE001", date(2024, 1, 11), 10)
+
+        # Listed on 2024-01-05, delisted after 2024-01-14
+        track(self.tracker, "SHORT", "INE002", date(2024, 1, 5), 10)
+
+        track(self.tracker, "LATE", "INE003", date(2024, 1, 15), 5)
+
+    def test_symbol_on(self):
+        self.assertEqual(self.tracker.symbol_on("INE001", date(2024, 1, 1)), "OLDNAME")
+        self.assertEqual(self.tracker.symbol_on("INE001", date(2024, 1, 10)), "OLDNAME")
+        self.assertEqual(self.tracker.symbol_on("INE001", date(2024, 1, 11)), "NEWNAME")
+
+        self.assertIsNone(self.tracker.symbol_on("INE001", date(2023, 12, 31)))
+        self.assertIsNone(self.tracker.symbol_on("INE002", date(2024, 1, 20)))
+        self.assertIsNone(self.tracker.symbol_on("INE999", date(2024, 1, 5)))
+
+    def test_isin_on(self):
+        self.assertEqual(self.tracker.isin_on("OLDNAME", date(2024, 1, 5)), "INE001")
+        self.assertIsNone(self.tracker.isin_on("OLDNAME", date(2024, 1, 12)))
+        self.assertIsNone(self.tracker.isin_on("MISSING", date(2024, 1, 12)))
+
+    def test_active_on(self):
+        self.assertEqual(self.tracker.active_on(date(2024, 1, 1)), ["INE001"])
+        self.assertEqual(
+            sorted(self.tracker.active_on(date(2024, 1, 14))), ["INE001", "INE002"]
+        )
+        self.assertEqual(
+            sorted(self.tracker.active_on(date(2024, 1, 15))), ["INE001", "INE003"]
+        )
+        self.assertEqual(self.tracker.active_on(date(2023, 1, 1)), [])
+
+    def test_symbols_on(self):
+        self.assertEqual(
+            self.tracker.symbols_on(date(2024, 1, 6)),
+            dict(INE001="OLDNAME", INE002="SHORT"),
+        )
+
+    def test_current_names(self):
+        names = self.tracker.current_names()
+
+        self.assertEqual(names["OLDNAME"], "NEWNAME")
+        self.assertEqual(names["NEWNAME"], "NEWNAME")
+        self.assertEqual(names["SHORT"], "SHORT")
+
+    def test_update_invalidates_index(self):
+        self.assertIsNone(self.tracker.symbol_on("INE003", date(2024, 1, 25)))
+
+        self.tracker.update("LATE", "INE003", date(2024, 1, 25))
+
+        self.assertEqual(self.tracker.symbol_on("INE003", date(2024, 1, 25)), "LATE")
+        self.assertIn("INE003", self.tracker.active_on(date(2024, 1, 25)))
+
+
+class TestSymbolStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.dir = Path(self.tmp.name)
+        self.db = self.dir / "isin_symbol_map.db"
+
+    def test_save_and_load(self):
+        tracker = SymbolTracker(store=SymbolStore(self.db))
+
+        track(tracker, "OLDNAME", "INE001", date(2024, 1, 1), 3)
+        track(tracker, "NEWNAME", "INE001", date(2024, 1, 4), 2)
+        track(tracker, "OTHER", "INE002", date(2024, 1, 1), 5)
+        tracker.save()
+
+        loaded = SymbolTracker(store=SymbolStore(self.db))
+
+        self.assertEqual(loaded.data, tracker.data)
+        self.assertEqual(loaded.symbol_on("INE001", date(2024, 1, 2)), "OLDNAME")
+
+    def test_save_writes_changed_isins_only(self):
+        store = SymbolStore(self.db)
+        tracker = SymbolTracker(store=store)
+
+        track(tracker, "AAA", "INE001", date(2024, 1, 1), 1)
+        track(tracker, "BBB", "INE002", date(2024, 1, 1), 1)
+        tracker.save()
+
+        saved = []
+        store_save = store.save
+
+        def save(isin2hist, extended):
+            saved.append((list(isin2hist), list(extended)))
+            store_save(isin2hist, extended)
+
+        store.save = save
+
+        # Traded again under the same symbol
+        tracker.update("BBB", "INE002", date(2024, 1, 2))
+        tracker.save()
+        tracker.save()
+
+        # Renamed
+        tracker.update("CCC", "INE001", date(2024, 1, 3))
+        tracker.update("BBB", "INE002", date(2024, 1, 3))
+        tracker.save()
+
+        self.assertEqual(saved, [([], ["INE002"]), (["INE001"], ["INE002"])])
+
+        loaded = SymbolStore(self.db).load()
+        self.assertEqual(loaded, tracker.data)
+        self.assertEqual(loaded["isin2hist"]["INE002"][0]["to_date"], date(2024, 1, 3))
+        self.assertEqual(loaded["isin2hist"]["INE001"][0]["to_date"], date(2024, 1, 1))
+        self.assertEqual(loaded["isin2hist"]["INE001"][1]["symbol"], "CCC")
+
+    def test_imports_legacy_json(self):
+        legacy = SymbolTracker()
+        track(legacy, "OLDNAME", "INE001", date(2024, 1, 1), 3)
+        track(legacy, "NEWNAME", "INE001", date(2024, 1, 4), 2)
+
+        json_file = self.dir / "isin_symbol_map.json"
+        json_file.write_text(legacy.to_json())
+
+        store = SymbolStore(self.db, legacy_path=json_file)
+
+        self.assertEqual(store.load(), legacy.data)
+        self.assertEqual(store.sym2isin(), dict(OLDNAME="INE001", NEWNAME="INE001"))
+
+    def test_database_is_created_on_first_use(self):
+        store = SymbolStore(self.db)
+        SymbolTracker(store=store)
+
+        self.assertFalse(self.db.exists())
+
+        store.load()
+        self.assertTrue(self.db.exists())
+
+    def test_reimports_changed_json(self):
+        json_file = self.dir / "isin_symbol_map.json"
+
+        legacy = SymbolTracker()
+        track(legacy, "OLDNAME", "INE001", date(2024, 1, 1), 3)
+        json_file.write_text(legacy.to_json())
+
+        self.assertEqual(
+            SymbolStore(self.db, legacy_path=json_file).load(), legacy.data
+        )
+
+        # Newer JSON from a git pull
+        track(legacy, "NEWNAME", "INE001", date(2024, 1, 4), 2)
+        json_file.write_text(legacy.to_json() + "\n")
+
+        self.assertEqual(
+            SymbolStore(self.db, legacy_path=json_file).load(), legacy.data
+        )
+
+    def test_export(self):
+        json_file = self.dir / "isin_symbol_map.json"
+        store = SymbolStore(self.db, legacy_path=json_file)
+        tracker = SymbolTracker(store=store)
+
+        tracker.export()
+        self.assertFalse(json_file.exists())
+
+        track(tracker, "AAA", "INE001", date(2024, 1, 1), 2)
+        tracker.save()
+        tracker.export()
+
+        self.assertEqual(SymbolTracker.from_json(json_file), tracker.data)
+
+        # The exported file is not imported again
+        store = SymbolStore(self.db, legacy_path=json_file)
+        store._import_legacy = lambda conn: self.fail("imported exported JSON")
+
+        self.assertEqual(store.load(), tracker.data)
+
+    def test_load_is_lazy(self):
+        store = SymbolStore(self.db)
+        store.load = lambda: self.fail("loaded on creation")
+
+        SymbolTracker(store=store)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+import context  # noqa: F401
+from defs import dates as dates_module
+from defs.dates import Dates
+from defs.trading_calendar import TradingCalendar
+
+HOLIDAYS_2023 = {
+    "26-Jan-2023": "Republic Day",
+    "12-Nov-2023": "Diwali Laxmi Pujan",
+    "25-Dec-2023": "Christmas",
+}
+
+
+class TestTradingCalendar(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.folder = Path(self.tmp.name) / "calendar"
+        self.calendar = TradingCalendar(self.folder)
+        self.calendar.set_holidays(2023, HOLIDAYS_2023)
+        self.calendar.add_special_session(date(2023, 3, 4))
+
+    def test_is_trading_day(self):
+        days = [
+            "2023-01-25",  # Wednesday
+            "2023-01-26",  # Holiday
+            "2023-01-28",  # Saturday
+            "2023-03-04",  # Saturday special session
+            "2023-11-12",  # Sunday Muhurat session
+        ]
+
+        np.testing.assert_array_equal(
+            self.calendar.is_trading_day(days), [True, False, False, True, True]
+        )
+
+        self.assertTrue(self.calendar.is_trading_day(date(2023, 1, 27)))
+
+    def test_next_trading_day(self):
+        result = self.calendar.next_trading_day(
+            ["2023-01-25", "2023-01-26", "2023-03-03", "2023-03-05", "2023-11-11"]
+        )
+
+        np.testing.assert_array_equal(
+            result,
+            np.array(
+                ["2023-01-25", "2023-01-27", "2023-03-03", "2023-03-06", "2023-11-12"],
+                dtype="datetime64[D]",
+            ),
+        )
+
+    def test_next_trading_day_stops_at_unknown_year(self):
+        result = self.calendar.next_trading_day(["2023-12-30", "2022-12-31"])
+
+        np.testing.assert_array_equal(
+            result, np.array(["2024-01-01", "2022-12-31"], dtype="datetime64[D]")
+        )
+
+    def test_save_and_load(self):
+        self.calendar.save()
+        self.calendar.add_holiday(date(2024, 1, 22), "Special holiday")
+        self.calendar.save()
+
+        self.assertEqual(
+            sorted(p.name for p in self.folder.iterdir()), ["2023.json", "2024.json"]
+        )
+
+        loaded = TradingCalendar(self.folder)
+
+        self.assertTrue(loaded.has_year(2023))
+        self.assertFalse(loaded.has_year(2024))
+        self.assertEqual(loaded.holiday(date(2023, 12, 25)), "Christmas")
+        self.assertEqual(loaded.holiday(date(2024, 1, 22)), "Special holiday")
+        self.assertIsNone(loaded.holiday(date(2023, 11, 12)))
+        self.assertFalse(loaded.add_special_session(date(2023, 11, 12)))
+
+
+class TestNextDate(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+
+        self.calendar = TradingCalendar(Path(tmp.name))
+        self.calendar.set_holidays(2023, HOLIDAYS_2023)
+
+    def next_dates(self, dates: Dates, count: int):
+        result = []
+
+        with patch.object(dates_module, "datetime", wraps=datetime) as mock_dt:
+            mock_dt.now.return_value = datetime(
+                2024, 6, 1, 20, tzinfo=dates_module.tz_IN
+            )
+
+            for _ in range(count):
+                dates.nextDate()
+                result.append(dates.dt.date())
+
+        return result
+
+    def test_skips_non_trading_days(self):
+        dates = Dates("2023-01-24T19:00:00+05:30", calendar=self.calendar)
+
+        self.assertEqual(
+            self.next_dates(dates, 3),
+            [date(2023, 1, 25), date(2023, 1, 27), date(2023, 1, 30)],
+        )
+        self.assertEqual(dates.pandasDt, "2023-01-30")
+        self.assertEqual(dates.dt.hour, 19)
+
+    def test_without_calendar(self):
+        dates = Dates("2023-01-24T19:00:00+05:30")
+
+        self.assertEqual(
+            self.next_dates(dates, 3),
+            [date(2023, 1, 24) + timedelta(i) for i in (1, 2, 3)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,16 @@
 import json
+import threading
+import time
 import unittest
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from context import utils
 
+from defs.config import Config
+
 
 class TestJsonFunctions(unittest.TestCase):
     def test_date_encoder(self):
@@ -190,6 +195,96 @@ class TestGetLevels(unittest.TestCase):
         self.assertEqual(result[1][0][1], 30)
 
 
+def getLevelsScan(df, mean_candle_size, v2=False):
+    """Reference implementation of getLevels and getLevels_v2, checking each
+    candidate against every accepted level with isFarFromLevel."""
+    levels = []
+
+    if v2:
+        highs = [df.High.shift(i) < df.High for i in (1, 2, 3, -1, -2, -3)]
+        lows = [df.Low.shift(i) > df.Low for i in (1, 2, 3, -1, -2, -3)]
+
+        max_min = pd.concat(
+            [
+                df.High.loc[np.logical_and.reduce(highs)].dropna(),
+                df.Low.loc[np.logical_and.reduce(lows)].dropna(),
+            ]
+        )
+        max_min = max_min.loc[~max_min.index.duplicated()]
+
+        for i, lv in max_min.items():
+            touch_count = max_min.loc[(max_min - lv).abs() < mean_candle_size].count()
+
+            if touch_count > 1 and utils.isFarFromLevel(lv, levels, mean_candle_size):
+                levels.append((i, lv))
+    else:
+        local_max = df.High[
+            (df.High.shift(1) < df.High)
+            & (df.High.shift(2) < df.High.shift(1))
+            & (df.High.shift(-1) < df.High)
+            & (df.High.shift(-2) < df.High.shift(-1))
+        ].dropna()
+
+        local_min = df.Low[
+            (df.Low.shift(1) > df.Low)
+            & (df.Low.shift(2) > df.Low.shift(1))
+            & (df.Low.shift(-1) > df.Low)
+            & (df.Low.shift(-2) > df.Low.shift(-1))
+        ].dropna()
+
+        for series in (local_max, local_min):
+            for idx in series.index:
+                if utils.isFarFromLevel(series[idx], levels, mean_candle_size):
+                    levels.append((idx, series[idx]))
+
+    return [((i, lv), (df.index[-1], lv)) for i, lv in levels]
+
+
+class TestGetLevelsParity(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        size = 3000
+
+        close = 100 + rng.normal(0, 1.5, size).cumsum()
+        spread = rng.uniform(0.5, 3, size)
+
+        # Round to tick size, so many pivots sit exactly on a level boundary
+        self.df = pd.DataFrame(
+            {
+                "High": ((close + spread) / 0.05).round() * 0.05,
+                "Low": ((close - spread) / 0.05).round() * 0.05,
+            },
+            index=pd.date_range("2010-01-01", periods=size),
+        )
+
+    def test_v1(self):
+        for threshold in (0.5, 1.0, (self.df.High - self.df.Low).median()):
+            self.assertEqual(
+                utils.getLevels(self.df, threshold),
+                getLevelsScan(self.df, threshold),
+            )
+
+    def test_v2(self):
+        for threshold in (0.5, 1.0, (self.df.High - self.df.Low).median()):
+            self.assertEqual(
+                utils.getLevels_v2(self.df, threshold),
+                getLevelsScan(self.df, threshold, v2=True),
+            )
+
+    def test_level_index(self):
+        index = utils.LevelIndex(5.0)
+        levels = []
+
+        for i, level in enumerate((45.0, 55.0, 60.0, 50.0, 49.0, 40.0, 65.0)):
+            expected = utils.isFarFromLevel(level, levels, 5.0)
+
+            self.assertEqual(index.isFar(level), expected)
+
+            if expected:
+                index.add(level)
+                levels.append((i, level))
+
+
 class TestIsFarFromLevel(unittest.TestCase):
     level = 50.0
     mean_size = 5.0
@@ -249,6 +344,78 @@ class TestManfieldRelativeStrength(unittest.TestCase):
         pd.testing.assert_series_equal(result, expected)
 
 
+def getDeliveryLevelsLoop(df, config):
+    """Row by row reference implementation of utils.getDeliveryLevels"""
+    avgTrdQty = df["QTY_PER_TRADE"].rolling(config.DLV_AVG_LEN).mean().round(2)
+    avgDlvQty = df["DLV_QTY"].rolling(config.DLV_AVG_LEN).mean().round(2)
+    df["DQ"] = df["DLV_QTY"] / avgDlvQty
+    df["TQ"] = df["QTY_PER_TRADE"] / avgTrdQty
+    df["IM_F"] = (df["TQ"] > 1.2) & (df["DQ"] > 1.2)
+    df["MCOverrides"] = None
+    df["IM"] = float("nan")
+
+    for idx in df.index:
+        dq, im = df.loc[idx, ["DQ", "IM_F"]]
+
+        if im:
+            df.loc[idx, "IM"] = df.loc[idx, "Low"] * 0.99
+
+        if dq >= config.DLV_L3:
+            df.loc[idx, "MCOverrides"] = config.PLOT_DLV_L1_COLOR
+        elif dq >= config.DLV_L2:
+            df.loc[idx, "MCOverrides"] = config.PLOT_DLV_L2_COLOR
+        elif dq > config.DLV_L1:
+            df.loc[idx, "MCOverrides"] = config.PLOT_DLV_L3_COLOR
+        else:
+            df.loc[idx, "MCOverrides"] = config.PLOT_DLV_DEFAULT_COLOR
+
+
+class TestGetDeliveryLevels(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        size = 600
+
+        low = rng.uniform(90, 110, size).round(2)
+
+        self.df = pd.DataFrame(
+            {
+                "Low": low,
+                "QTY_PER_TRADE": rng.lognormal(5, 0.6, size).round(2),
+                "DLV_QTY": rng.lognormal(10, 0.7, size).round(0),
+            },
+            index=pd.date_range("2022-01-01", periods=size, name="Date"),
+        )
+
+        # Missing delivery data on some days
+        self.df.iloc[100:110, self.df.columns.get_loc("DLV_QTY")] = np.nan
+
+        self.config = Config()
+
+    def test_parity_with_loop(self):
+        expected = self.df.copy()
+        result = self.df.copy()
+
+        getDeliveryLevelsLoop(expected, self.config)
+        utils.getDeliveryLevels(result, self.config)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_all_bands_present(self):
+        utils.getDeliveryLevels(self.df, self.config)
+
+        colors = set(self.df["MCOverrides"])
+
+        self.assertEqual(
+            colors,
+            {
+                self.config.PLOT_DLV_DEFAULT_COLOR,
+                self.config.PLOT_DLV_L1_COLOR,
+                self.config.PLOT_DLV_L2_COLOR,
+                self.config.PLOT_DLV_L3_COLOR,
+            },
+        )
+
+
 class TestRandomChar(unittest.TestCase):
     def test_random_char(self):
         for length in (5, 10, 15):
@@ -257,5 +424,28 @@ class TestRandomChar(unittest.TestCase):
             self.assertEqual(len(result), length)
 
 
+class TestRateLimiter(unittest.TestCase):
+    def test_calls_are_spaced(self):
+        limiter = utils.RateLimiter(20)
+        calls = []
+
+        def call():
+            limiter.wait()
+            calls.append(time.monotonic())
+
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        start = time.monotonic()
+
+        for t in threads:
+            t.start()
+
+        for t in threads:
+            t.join()
+
+        # The first call is immediate and each other waits its turn
+        self.assertEqual(len(calls), 5)
+        self.assertGreaterEqual(max(calls) - start, 0.2)
+
+
 if __name__ == "__main__":
     unittest.main()